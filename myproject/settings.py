@@ -51,8 +51,19 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Yazma kilidi transaction başında alınır (kilit yükseltme çıkmazı olmaz)
+            'transaction_mode': 'IMMEDIATE',
+            # Kilit için beklenecek süre (sn)
+            'timeout': 20,
+        },
+        # Kalıcı bağlantılar: PRAGMA'lar ve sayfa önbelleği istekler arasında korunur
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+# SQLite PRAGMA'ları papers/db.py DEFAULT_PRAGMAS'tan gelir; farklı bir profil
+# gerekirse SQLITE_PRAGMAS ile tamamı değiştirilebilir
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
@@ -65,3 +76,65 @@ USE_I18N = True
 USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Anahtar kelime satırı bulunamadığında: 'nlp' (spaCy isim öbekleri) veya
+# 'fast' (ayrıştırıcısız RAKE puanlaması)
+KEYWORD_EXTRACTION_MODE = 'nlp'
+
+# Editör panelindeki makale satırları şablon parçası olarak önbelleklenir
+# (admin_panel.html); anahtar (makale id, version) olduğundan değişen satırın
+# eski girdisi bir daha okunmaz ve MAX_ENTRIES aşılınca düşer. Süreç başına
+# bellek içi önbellek: her worker kendi satırlarını ısıtır.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'papers-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+DASHBOARD_ROW_CACHE_SECONDS = 24 * 3600
+
+# Yükleme sonrası arka plan işleri (anahtar kelime çıkarma, benzer makale imzası)
+BACKGROUND_WORKERS = 2
+# True ise işler istek içinde, senkron çalıştırılır (test/hata ayıklama için)
+BACKGROUND_TASKS_EAGER = False
+
+# Tamponlu Log yazıcısı (bkz. papers/audit.py): autocommit'te bu kadar satır
+# birikince ya da en eski satır bu kadar saniye bekleyince bulk_create yapılır
+AUDIT_LOG_BUFFER_SIZE = 500
+AUDIT_LOG_MAX_AGE = 2.0
+
+# Log saklama: bu günden eski kayıtlar archive_logs ile aylık gzip JSONL
+# segmentlerine taşınır (bkz. papers/retention.py)
+LOG_RETENTION_DAYS = 180
+LOG_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archive', 'logs')
+
+# Aşama bazlı süre ölçümü ve /metrics (bkz. papers/metrics.py)
+METRICS_ENABLED = True
+# True ise her run için tracemalloc tepe değeri de tutulur (Python ayırmalarını yavaşlatır)
+METRICS_TRACEMALLOC = False
+
+# Bellek sınırlı anonimleştirme (bkz. anonymization._anonymize_streaming):
+# bu sayfa sayısı ve üzerindeki PDF'ler sayfa sayfa işlenip diske boşaltılır
+ANONYMIZE_STREAMING_PAGES = 200
+ANONYMIZE_FLUSH_PAGES = 25
+# Süreç RSS'i bu değeri aşarsa parti dolmadan ara kayıt yapılır
+ANONYMIZE_RSS_CEILING_MB = 1024
+# Belge başına anonimleştirme süre bütçesi (sn, analiz dahil); None ise sınırsız.
+# Bütçe azaldıkça ORG NER -> spaCy -> bulanıklaştırma çözünürlüğü sırasıyla düşürülür (bkz. papers/budget.py)
+ANONYMIZE_TIME_BUDGET = 120
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # Sayfa ön-sınıflandırma kararları (NER / regex / görsel)
+        'papers.prefilter': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
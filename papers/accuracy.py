@@ -0,0 +1,111 @@
+"""
+Anonimleştirme doğruluğu: etiketli tanımlayıcılara (ground truth) göre
+kategori bazında kesinlik (precision) ve duyarlılık (recall).
+
+Etiketler iki kaynaktan gelir: synthetic.generate_paper() çıktısındaki truth
+listesi ve örnek makaleler için elle hazırlanmış ground_truth.json. Her kayıt
+{"category", "text", "page"} biçimindedir; metin orijinal PDF'te
+page.search_for ile aranır ve sayfadaki tüm geçişleri kapsar.
+
+- Duyarlılık: bir etiket, sayfadaki her geçişi anonimleştirme bölgeleriyle
+  (kategorisinden bağımsız) en az COVER_RATIO oranında örtülüyse bulunmuş sayılır.
+  Gizlilik açısından önemli olan metnin karartılmasıdır.
+- Kesinlik: bir kategoride üretilen bölge, alanının en az HIT_RATIO kadarı
+  herhangi bir etiketle örtüşüyorsa doğrudur.
+Görsel bölgeleri (blur) değerlendirmeye girmez.
+"""
+import json
+import os
+
+import fitz  # PyMuPDF
+
+CATEGORIES = ("name", "contact", "institution")
+COVER_RATIO = 0.6
+HIT_RATIO = 0.3
+GROUND_TRUTH_PATH = os.path.join(os.path.dirname(__file__), "ground_truth.json")
+
+
+def load_ground_truth(path=GROUND_TRUTH_PATH):
+    """{dosya_adı: [{"category", "text", "page"}, ...]}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["papers"]
+
+
+def _area(r):
+    return max(r[2] - r[0], 0) * max(r[3] - r[1], 0)
+
+
+def _intersection(a, b):
+    return _area((max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])))
+
+
+def _coverage(rect, predicted):
+    area = _area(rect)
+    if not area:
+        return 0.0
+    return min(sum(_intersection(rect, p) for p in predicted) / area, 1.0)
+
+
+def empty_counts():
+    return {cat: {"truth": 0, "found": 0, "predicted": 0, "correct": 0} for cat in CATEGORIES}
+
+
+def score_document(doc, truth, regions, counts=None):
+    """
+    doc: orijinal (anonimleştirilmemiş) belge; regions: anonymize_pdf çıktısı.
+    counts verilirse üzerine eklenir. (counts, kaçırılan etiketler) döndürür.
+    """
+    counts = counts if counts is not None else empty_counts()
+    predicted = {}      # sayfa -> [(kategori, rect)]
+    for region in regions:
+        if region.get("category") in CATEGORIES:
+            predicted.setdefault(region["page"], []).append((region["category"], region["rect"]))
+
+    truth_rects = {}    # sayfa -> [rect]
+    missed, seen = [], set()
+    for entry in truth:
+        page_index = entry["page"]
+        # search_for büyük/küçük harf duyarsız: aynı sayfadaki tekrarlar bir kez sayılır
+        key = (entry["category"], entry["text"].lower(), page_index)
+        if page_index >= len(doc) or key in seen:
+            continue
+        seen.add(key)
+        rects = [tuple(r) for r in doc[page_index].search_for(entry["text"])]
+        if not rects:
+            # Etiket metni sayfada yok (yanlış etiket); sayılmaz
+            continue
+        truth_rects.setdefault(page_index, []).extend(rects)
+        stats = counts[entry["category"]]
+        stats["truth"] += 1
+        page_predicted = [rect for _, rect in predicted.get(page_index, [])]
+        if all(_coverage(r, page_predicted) >= COVER_RATIO for r in rects):
+            stats["found"] += 1
+        else:
+            missed.append(entry)
+
+    for page_index, items in predicted.items():
+        labelled = truth_rects.get(page_index, [])
+        for category, rect in items:
+            stats = counts[category]
+            stats["predicted"] += 1
+            area = _area(rect)
+            if area and any(_intersection(rect, t) / area >= HIT_RATIO for t in labelled):
+                stats["correct"] += 1
+    return counts, missed
+
+
+def summarize(counts):
+    """{kategori: {"precision", "recall", ...sayımlar}}; payda sıfırsa None."""
+    summary = {}
+    for category, stats in counts.items():
+        summary[category] = dict(
+            stats,
+            precision=stats["correct"] / stats["predicted"] if stats["predicted"] else None,
+            recall=stats["found"] / stats["truth"] if stats["truth"] else None,
+        )
+    return summary
+
+
+def score_pdf(original_pdf_path, truth, regions, counts=None):
+    with fitz.open(original_pdf_path) as doc:
+        return score_document(doc, truth, regions, counts)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Domain, Reviewer, Log, Message, Subtopic
+from .models import Domain, Reviewer, Log, LogRollup, Message, Subtopic, KnownIdentifier, PendingFileDeletion
 
 # Subtopic'i Domain admin sayfasına inline ekleyeceğiz
 class SubtopicInline(admin.TabularInline):
@@ -32,5 +32,23 @@ class ReviewerAdmin(admin.ModelAdmin):
     list_display = ('name', 'email')
     filter_horizontal = ('interests',)  # Daha kullanışlı bir çoklu seçim widget'ı
 
+@admin.register(KnownIdentifier)
+class KnownIdentifierAdmin(admin.ModelAdmin):
+    """
+    Anonimleştirmede her zaman aranacak isim/e-posta/kurum listesi.
+    Değişiklikler çalışan süreçlerde otomatik olarak yeniden derlenir.
+    """
+    list_display = ('value', 'kind', 'updated_at')
+    list_filter = ('kind',)
+    search_fields = ('value',)
+
 admin.site.register(Log)
 admin.site.register(Message)
+admin.site.register(LogRollup)
+
+
+@admin.register(PendingFileDeletion)
+class PendingFileDeletionAdmin(admin.ModelAdmin):
+    """Arka planda silinmeyi bekleyen dosyalar; attempts dolanlar sweep_files ile yeniden denenebilir."""
+    list_display = ('name', 'created_at', 'attempts', 'last_error')
+    search_fields = ('name',)
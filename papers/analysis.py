@@ -0,0 +1,221 @@
+"""
+Anonimleştirmenin belge analizi.
+
+Bir PDF bir kez açılır; sayfa metinleri, bölüm sınırları (Abstract/Özet,
+Introduction/Giriş, REFERENCES, atlanacak sayfalar) ve anonimleştirilecek
+sayfaların varlıkları (spaCy NER) tek analizde hesaplanır. Anahtar kelimeler
+bu analizi beklemez: yükleme sonrası arka planda, sayfalar akışla okunarak
+sınırlı bir pencereden çıkarılır ve dosya özetiyle ayrıca saklanır (bkz.
+pipeline.py, nlp_utils.extract_keywords_from_pdf_advanced). Anonimleştirilecek sayfalar
+önce ucuz bir sınıflandırıcıdan geçer (bkz. prefilter.py); kimlik bilgisi
+içeremeyecek sayfalarda NER çalıştırılmaz. Sonuç dosya içeriğinin
+SHA-256 özetiyle DocumentAnalysis tablosunda saklanır; aynı dosya için ikinci
+kez ayrıştırma yapılmaz. Zaman bütçesi (bkz. budget.py) regex kademesine
+indiğinde kalan sayfalar NER'siz işlenir; böyle eksik analizler saklanmaz.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+
+import fitz  # PyMuPDF
+
+from . import metrics
+from .budget import TIER_REGEX
+from .prefilter import MODE_IMAGE, MODE_NER, MODE_REGEX, classify_pages, has_text_layer
+from .nlp_utils import get_nlp
+
+ABSTRACT_REGEX = re.compile(r'\b(abstract|özet)\b', re.IGNORECASE)
+REFERENCES_REGEX = re.compile(r'\bREFERENCES\b')
+SKIP_SECTION_KEYWORDS = ["giriş", "ilgili çalışmalar", "teşekkür"]
+# NER geçişinde gerekmeyen bileşenler
+NER_DISABLED_PIPES = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+# Bütçeli çalışmada nlp.pipe parti boyutu: bütçe partiler arasında kontrol edilir
+BUDGET_NER_BATCH = 4
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class Analysis:
+    page_texts: list
+    sections: dict
+    entities: dict = field(default_factory=dict)      # sayfa indeksi -> [[label, text], ...]
+    file_hash: str = ""
+    degraded: bool = False      # bütçe yüzünden bazı sayfalar NER'siz kaldı (saklanmaz)
+
+    def page_mode(self, page_index):
+        """prefilter modu; eski (sınıflandırma öncesi) kayıtlarda her sayfa "ner"."""
+        modes = self.sections.get("page_modes") or []
+        mode = modes[page_index] if page_index < len(modes) else None
+        return mode or MODE_NER
+
+    @property
+    def full_text(self):
+        return "\n".join(self.page_texts)
+
+    def pages_to_process(self):
+        """
+        Anonimleştirilecek sayfalar: [(sayfa_indeksi, process_limit), ...]
+        Abstract'tan önceki sayfalar, Abstract sayfasının başlığa kadar olan
+        kısmı ve REFERENCES'tan sonraki sayfalar (atlanan bölümler hariç).
+        """
+        abstract_page = self.sections.get("abstract_page")
+        references_page = self.sections.get("references_page")
+        skip_pages = set(self.sections.get("skip_pages", []))
+        result = []
+        for i in range(len(self.page_texts)):
+            if i in skip_pages:
+                continue
+            if abstract_page is None:
+                result.append((i, None))
+            elif i < abstract_page:
+                result.append((i, None))
+            elif i == abstract_page:
+                result.append((i, self.sections.get("abstract_y")))
+            elif references_page is not None and i > references_page:
+                result.append((i, None))
+        return result
+
+
+def find_sections(doc, page_texts):
+    """Anonimleştirmenin kullandığı bölüm sınırları (sayfa indeksleri ve y koordinatları)."""
+    sections = {"abstract_page": None, "abstract_y": None, "references_page": None, "skip_pages": []}
+
+    # 1) Abstract/Özet sayfası
+    for i, txt in enumerate(page_texts):
+        m = ABSTRACT_REGEX.search(txt)
+        if m:
+            sections["abstract_page"] = i
+            rects = doc[i].search_for(m.group(0))
+            if rects:
+                sections["abstract_y"] = min(r.y0 for r in rects)
+            break
+
+    # 2) REFERENCES sayfası
+    for i, txt in enumerate(page_texts):
+        if REFERENCES_REGEX.search(txt):
+            sections["references_page"] = i
+            break
+
+    # 3) "giriş", "ilgili çalışmalar", "teşekkür" ile başlayan sayfalar
+    for i in range(len(page_texts)):
+        page = doc[i]
+        page_height = page.rect.height
+        for kw in SKIP_SECTION_KEYWORDS:
+            if any(r.y0 < 0.2 * page_height for r in page.search_for(kw)):
+                sections["skip_pages"].append(i)
+                break
+    return sections
+
+
+def analyze_document(doc, nlp=None, gazetteer=None, mode=None, budget=None):
+    """
+    Açık bir fitz.Document üzerinden belge analizini yapar (veritabanı kullanmaz).
+    gazetteer: sayfa sınıflandırmasında kullanılan bilinen tanımlayıcılar.
+    mode: verilirse (MODE_NER/MODE_REGEX) metin katmanı olan tüm sayfalar
+    sınıflandırıcı kararı yerine bu modla işlenir (ölçüm ve doğruluk testleri için).
+    budget: budget.TimeBudget; regex kademesinde NER atlanır.
+    """
+    with metrics.stage("text_extraction", count=len(doc)):
+        page_texts = [page.get_text("text") for page in doc]
+
+    with metrics.stage("section_scan", count=len(page_texts)):
+        analysis = Analysis(page_texts=page_texts, sections=find_sections(doc, page_texts))
+
+        # Sınıflandırma sadece anonimleştirilecek bölgeye bakar (Abstract sayfasında başlığa kadar)
+        regions = {}
+        for i, limit in analysis.pages_to_process():
+            if limit is None:
+                regions[i] = page_texts[i]
+            else:
+                page = doc[i]
+                regions[i] = page.get_text("text", clip=fitz.Rect(0, 0, page.rect.width, limit))
+        modes = classify_pages(regions, gazetteer)
+        # Görsel (metinsiz) sayfa kararı sayfanın tüm metnine göre verilir: Abstract
+        # başlığı sayfanın en üstündeyse kırpılmış bölge boştur ama sayfa taranmış değildir
+        for i, page_mode in modes.items():
+            if page_mode == MODE_IMAGE and has_text_layer(page_texts[i]):
+                modes[i] = MODE_REGEX
+        if mode is not None:
+            modes = {i: m if m == MODE_IMAGE else mode for i, m in modes.items()}
+        analysis.sections["page_modes"] = [modes.get(i) for i in range(len(page_texts))]
+
+    process_pages = [i for i, page_mode in modes.items() if page_mode == MODE_NER]
+    for i, page_mode in modes.items():
+        if page_mode == MODE_REGEX:
+            analysis.entities[i] = []
+    if budget is not None:
+        budget.check()
+    if process_pages and not (budget is not None and budget.at_least(TIER_REGEX)):
+        nlp = nlp or get_nlp()
+        disable = [name for name in nlp.pipe_names if name in NER_DISABLED_PIPES]
+        pipe_kwargs = {"batch_size": BUDGET_NER_BATCH} if budget is not None else {}
+        texts = (page_texts[i] for i in process_pages)
+        with metrics.stage("ner") as ner:
+            for i, parsed in zip(process_pages, nlp.pipe(texts, disable=disable, **pipe_kwargs)):
+                analysis.entities[i] = [[ent.label_, ent.text] for ent in parsed.ents]
+                ner.add()
+                if budget is not None:
+                    budget.check(page=i)
+                    if budget.at_least(TIER_REGEX):
+                        break
+    if budget is not None and budget.at_least(TIER_REGEX):
+        # NER'e yetişemeyen sayfalar regex + sözlük ile işlenir
+        for i in process_pages:
+            if i not in analysis.entities:
+                analysis.entities[i] = []
+                analysis.sections["page_modes"][i] = MODE_REGEX
+                analysis.degraded = True
+    return analysis
+
+
+def analyze_pdf(pdf_path, gazetteer=None, budget=None):
+    with fitz.open(pdf_path) as doc:
+        return analyze_document(doc, gazetteer=gazetteer, budget=budget)
+
+
+def get_document_analysis(pdf_path, budget=None):
+    """
+    Dosya özetine göre önbellekten okur; yoksa analiz edip kaydeder.
+    Aynı PDF için anahtar kelime çıkarma ve anonimleştirme aynı kaydı kullanır.
+    Sayfa modları bilinen tanımlayıcı listesine bağlı olduğundan liste
+    değiştiyse (Gazetteer.version) kayıt yeniden analiz edilip güncellenir.
+    Bütçe yüzünden eksik kalan analiz kaydedilmez (sonraki çalışma tam yapar).
+    """
+    from django.db import IntegrityError
+    from .gazetteer import get_gazetteer
+    from .models import DocumentAnalysis
+
+    digest = file_hash(pdf_path)
+    gazetteer = get_gazetteer()
+    cached = DocumentAnalysis.objects.filter(file_hash=digest).first()
+    if cached is not None and cached.gazetteer_version == gazetteer.version:
+        return cached.to_analysis()
+
+    analysis = analyze_pdf(pdf_path, gazetteer=gazetteer, budget=budget)
+    analysis.file_hash = digest
+    if analysis.degraded:
+        return analysis
+    fields = {
+        'page_count': len(analysis.page_texts),
+        'page_texts': json.dumps(analysis.page_texts, ensure_ascii=False),
+        'sections': json.dumps(analysis.sections, ensure_ascii=False),
+        'entities': json.dumps(analysis.entities, ensure_ascii=False),
+        'gazetteer_version': gazetteer.version,
+    }
+    if cached is not None:
+        DocumentAnalysis.objects.filter(pk=cached.pk).update(**fields)
+        return analysis
+    try:
+        DocumentAnalysis.objects.create(file_hash=digest, **fields)
+    except IntegrityError:
+        # Aynı dosya başka bir istekte eş zamanlı analiz edilmiş
+        pass
+    return analysis
@@ -4,18 +4,30 @@ import io
 import json
 import base64
 import hashlib
+import logging
+import shutil
+from collections import defaultdict
 
 import fitz  # PyMuPDF
-import spacy
+import numpy as np
 from PIL import Image, ImageFilter
 
+from django.conf import settings
+
 from Cryptodome.Cipher import AES
 from Cryptodome.Util.Padding import pad, unpad
 
-nlp = spacy.load("en_core_web_sm")
+from . import metrics
+from .analysis import analyze_document
+from .budget import LOW_DPI, TIER_LOW_DPI, TIER_NO_ORG, TIER_REGEX
+from .gazetteer import get_gazetteer
+from .nlp_utils import get_nlp
+from .prefilter import MODE_IMAGE
 
 EMAIL_REGEX = r'[\w\.-]+@[\w\.-]+\.\w+'
 
+logger = logging.getLogger(__name__)
+
 def encrypt_data(data_str):
     secret = "my_very_secret_key_for_encryption"
     key = hashlib.sha256(secret.encode('utf-8')).digest()
@@ -36,10 +48,14 @@ def decrypt_data(encrypted_str):
     padded = cipher.decrypt(ciphertext)
     return unpad(padded, AES.block_size).decode('utf-8')
 
-def blur_image_region(page, bbox, blur_radius=5):
-    pix = page.get_pixmap(clip=bbox)
+def blur_image_region(page, bbox, blur_radius=5, dpi=None):
+    """dpi: verilirse görsel bu çözünürlükte (varsayılan 72) işlenir; yarıçap ölçeklenir."""
+    pix = page.get_pixmap(clip=bbox, dpi=dpi)
+    if dpi:
+        blur_radius = max(1, blur_radius * dpi / 72)
     mode = "RGB" if pix.alpha == 0 else "RGBA"
     img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    pix = None  # örnek tamponu PIL'e kopyalandı; büyük sayfalarda hemen bırak
     blurred = img.filter(ImageFilter.GaussianBlur(radius=blur_radius))
     buf = io.BytesIO()
     blurred.save(buf, format="PNG")
@@ -72,154 +88,302 @@ def custom_cipher(original_text):
     return "".join(result)
 
 
-def process_page_text(page, process_limit, page_index, options, all_regions, skip_top=None):
-    full_text = page.get_text("text")
-    doc = nlp(full_text)
+# Aynı kategorideki dikdörtgenleri karşılaştırırken kullanılan tolerans (pt)
+RECT_TOLERANCE = 0.5
+
+
+def _search_hits(page, text, category, hits, lines=None):
+    """
+    page.search_for sonuçlarını (kategori, metin, dikdörtgen) olarak toplar.
+    lines (_line_chars) verilirse kelimenin ortasına düşen sonuçlar atlanır.
+    """
+    for r in page.search_for(text):
+        if lines is None or _is_whole_word(r, lines):
+            hits.append((category, text, (r.x0, r.y0, r.x1, r.y1)))
+
+
+def _line_chars(page):
+    """Sayfanın satırları: [(satır dikdörtgeni, [(karakter merkezi x, karakter), ...]), ...]"""
+    flags = fitz.TEXTFLAGS_RAWDICT & ~fitz.TEXT_PRESERVE_IMAGES
+    lines = []
+    for block in page.get_text("rawdict", flags=flags)["blocks"]:
+        for line in block.get("lines", []):
+            chars = [((c["bbox"][0] + c["bbox"][2]) / 2, c["c"]) for span in line["spans"] for c in span["chars"]]
+            lines.append((fitz.Rect(line["bbox"]), chars))
+    return lines
+
+
+def _is_whole_word(rect, lines):
+    """search_for dikdörtgeninin önündeki/arkasındaki karakter aynı kelimeye mi ait? (Gazetteer.find ile aynı kural)"""
+    middle = (rect.y0 + rect.y1) / 2
+    for bbox, chars in lines:
+        if not bbox.y0 <= middle <= bbox.y1 or bbox.x1 < rect.x0 or bbox.x0 > rect.x1:
+            continue
+        inside = [c for x, c in chars if rect.x0 <= x <= rect.x1]
+        if not inside:
+            continue
+        before = [c for x, c in chars if x < rect.x0]
+        after = [c for x, c in chars if x > rect.x1]
+        if before and before[-1].isalnum() and inside[0].isalnum():
+            return False
+        if after and after[0].isalnum() and inside[-1].isalnum():
+            return False
+    return True
+
+
+def filter_hits(hits, skip_top=None, process_limit=None):
+    """skip_top/process_limit filtresini tüm isabetlere tek bir NumPy geçişinde uygular."""
+    if not hits:
+        return []
+    y0 = np.fromiter((rect[1] for _, _, rect in hits), dtype=np.float64, count=len(hits))
+    keep = np.ones(len(hits), dtype=bool)
+    if skip_top is not None:
+        keep &= y0 >= skip_top
+    if process_limit is not None:
+        keep &= y0 < process_limit
+    return [hits[i] for i in np.flatnonzero(keep)]
+
+
+def _contains(outer, inner, tol=RECT_TOLERANCE):
+    return (outer[0] - tol <= inner[0] and outer[1] - tol <= inner[1]
+            and inner[2] <= outer[2] + tol and inner[3] <= outer[3] + tol)
+
+
+def coalesce_hits(hits, tol=RECT_TOLERANCE):
+    """
+    Aynı kategorideki tekrar eden, birbirini içeren veya aynı satırda örtüşen
+    dikdörtgenleri birleştirir. Her kategori y0'a göre sıralanıp süpürülür;
+    aktif listede sadece dikey olarak hâlâ kesişebilecek dikdörtgenler tutulur.
+    Dönüş ilk görülme sırasıyla [(kategori, metin, (x0, y0, x1, y1)), ...];
+    metin None ise birleşik dikdörtgenin metni sayfadan okunmalıdır.
+    """
+    by_category = defaultdict(list)
+    for index, (category, text, rect) in enumerate(hits):
+        by_category[category].append((rect[1], rect[0], index, text, rect))
+
+    merged = []     # [ilk_indeks, kategori, metin, dikdörtgen, canlı]
+    for category, items in by_category.items():
+        items.sort(key=lambda item: item[:3])
+        active = []
+        for y0, _, index, text, rect in items:
+            active = [a for a in active if a[4] and a[3][3] > y0 - tol]
+            target = None
+            for a in active:
+                if _contains(a[3], rect, tol):
+                    target = a
+                    break
+                if _contains(rect, a[3], tol):
+                    a[2], a[3] = text, rect
+                    target = a
+                    break
+                same_line = abs(a[3][1] - rect[1]) <= tol and abs(a[3][3] - rect[3]) <= tol
+                if same_line and rect[0] < a[3][2] and a[3][0] < rect[2]:
+                    a[2] = None
+                    a[3] = (min(a[3][0], rect[0]), min(a[3][1], rect[1]),
+                            max(a[3][2], rect[2]), max(a[3][3], rect[3]))
+                    target = a
+                    break
+            if target is None:
+                entry = [index, category, text, rect, True]
+                active.append(entry)
+                merged.append(entry)
+            else:
+                # Büyüyen dikdörtgenin artık içerdiği diğer aktif kayıtlar düşer
+                for b in active:
+                    if b is not target and b[4] and _contains(target[3], b[3], tol):
+                        b[4] = False
+
+    merged.sort(key=lambda entry: entry[0])
+    return [(category, text, rect) for _, category, text, rect, alive in merged if alive]
+
+
+def redact_hits(page, hits, page_index, all_regions, skip_top=None, process_limit=None):
+    """Filtrelenmiş ve birleştirilmiş isabetleri bölge listesine ve redaction anotasyonlarına çevirir."""
+    regions = coalesce_hits(filter_hits(hits, skip_top, process_limit))
+    for category, text, rect in regions:
+        r = fitz.Rect(rect)
+        if text is None:
+            text = " ".join(page.get_textbox(r).split())
+
+        cipher_text = custom_cipher(text)
+        all_regions.append({
+            "category": category,
+            "text": text,            # orijinal
+            "cipher": cipher_text,   # şifreli
+            "rect": [r.x0, r.y0, r.x1, r.y1],
+            "page": page_index
+        })
+
+        page.add_redact_annot(
+            r,
+            text=cipher_text,
+            fill=(1,1,1),
+        )
+
+
+def process_page_text(page, process_limit, page_index, options, all_regions, skip_top=None,
+                      full_text=None, entities=None, gazetteer=None, org_ner=True):
+    """
+    full_text/entities ortak belge analizinden (bkz. analysis.py) gelir;
+    verilmezse sayfa burada okunup spaCy ile işlenir.
+    entities: [[label, text], ...]
+    gazetteer: bilinen isim/e-posta/kurum otomatı (bkz. gazetteer.py)
+    org_ner: False ise spaCy ORG varlıkları aranmaz (bkz. budget.py)
+
+    Tüm isabetler önce toplanır, ardından redact_hits ile tek seferde
+    filtrelenip birleştirilir ve sayfaya uygulanır.
+    """
+    if full_text is None:
+        full_text = page.get_text("text")
+    if entities is None:
+        entities = [[ent.label_, ent.text] for ent in get_nlp()(full_text).ents]
+
+    with metrics.stage("entity_location") as location:
+        hits = collect_hits(page, options, full_text, entities, gazetteer, org_ner=org_ner)
+        location.add(len(hits))
+
+    before = len(all_regions)
+    with metrics.stage("redaction") as redaction:
+        redact_hits(page, hits, page_index, all_regions, skip_top=skip_top, process_limit=process_limit)
+        redaction.add(len(all_regions) - before)
+
 
-    # Manuel eklenmiş isim listesi (isterseniz)
-    names_to_check = [
-        "SUDHAKAR MISHRA",
-        "Diksha Kalra",
-        "S. Indu",
-        "MOHAMMAD ASIF",
-        "AJITHIA TEJAS VINODBHAI",
-        "MAJITHIA TEJAS VINODBHAI",
-        "UMA SHANKER TIWARY"
-    ]
+def collect_hits(page, options, full_text, entities, gazetteer=None, org_ner=True):
+    """Seçili kategorilerin sayfadaki tüm isabetleri: [(kategori, metin, dikdörtgen), ...]"""
+    # Bilinen tanımlayıcılar: sayfa metni tek geçişte taranır
+    known = gazetteer.find(full_text) if gazetteer is not None else []
+    # search_for alt dize arar; bilinen değerlerin yalnızca kelime olarak geçtiği yerler alınır
+    lines = _line_chars(page) if known else None
+    hits = []
 
     # 1) İsim (PERSON)
     if options.get("anonymize_name", False):
         # a) spaCy PERSON
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                rects = page.search_for(ent.text)
-                for r in rects:
-                    if skip_top is not None and r.y0 < skip_top:
-                        continue
-                    if process_limit is not None and r.y0 >= process_limit:
-                        continue
-
-                    cipher_text = custom_cipher(ent.text)
-                    all_regions.append({
-                        "category": "name",
-                        "text": ent.text,        # orijinal
-                        "cipher": cipher_text,   # şifreli
-                        "rect": [r.x0, r.y0, r.x1, r.y1],
-                        "page": page_index
-                    })
-
-                    page.add_redact_annot(
-                        r,
-                        text=cipher_text,
-                        fill=(1,1,1),
-                    )
+        for label, ent_text in entities:
+            if label == "PERSON":
+                _search_hits(page, ent_text, "name", hits)
 
-        # b) Manuel isim listesi
-        for name in names_to_check:
-            rects = page.search_for(name)
-            for r in rects:
-                if skip_top is not None and r.y0 < skip_top:
-                    continue
-                if process_limit is not None and r.y0 >= process_limit:
-                    continue
-
-                cipher_text = custom_cipher(name)
-                all_regions.append({
-                    "category": "name",
-                    "text": name,
-                    "cipher": cipher_text,
-                    "rect": [r.x0, r.y0, r.x1, r.y1],
-                    "page": page_index
-                })
-
-                page.add_redact_annot(
-                    r,
-                    text=cipher_text,
-                    fill=(1,1,1),
-                )
+        # b) Bilinen isimler
+        for kind, value in known:
+            if kind == "name":
+                _search_hits(page, value, "name", hits, lines)
 
     # 2) E-POSTA
     if options.get("anonymize_contact", False):
         for match in re.finditer(EMAIL_REGEX, full_text):
-            email = match.group(0)
-            rects = page.search_for(email)
-            for r in rects:
-                if skip_top is not None and r.y0 < skip_top:
-                    continue
-                if process_limit is not None and r.y0 >= process_limit:
-                    continue
-
-                cipher_text = custom_cipher(email)
-                all_regions.append({
-                    "category": "contact",
-                    "text": email,
-                    "cipher": cipher_text,
-                    "rect": [r.x0, r.y0, r.x1, r.y1],
-                    "page": page_index
-                })
-
-                page.add_redact_annot(
-                    r,
-                    text=cipher_text,
-                    fill=(1,1,1),
-                )
+            _search_hits(page, match.group(0), "contact", hits)
+        for kind, value in known:
+            if kind == "email":
+                _search_hits(page, value, "contact", hits, lines)
 
     # 3) Kurum (ORG)
     if options.get("anonymize_institution", False):
         ignore_orgs = {"eeg", "cnn", "convolutional neural network", "ieee", "dataset", "svm"}
-        for ent in doc.ents:
-            if ent.label_ == "ORG" and ent.text.lower() not in ignore_orgs:
-                rects = page.search_for(ent.text)
-                for r in rects:
-                    if skip_top is not None and r.y0 < skip_top:
-                        continue
-                    if process_limit is not None and r.y0 >= process_limit:
-                        continue
-
-                    cipher_text = custom_cipher(ent.text)
-                    all_regions.append({
-                        "category": "institution",
-                        "text": ent.text,
-                        "cipher": cipher_text,
-                        "rect": [r.x0, r.y0, r.x1, r.y1],
-                        "page": page_index
-                    })
-
-                    page.add_redact_annot(
-                        r,
-                        text=cipher_text,
-                        fill=(1,1,1),
-                    )
+        if org_ner:
+            for label, ent_text in entities:
+                if label == "ORG" and ent_text.lower() not in ignore_orgs:
+                    _search_hits(page, ent_text, "institution", hits)
+
+        for kind, value in known:
+            if kind == "institution":
+                _search_hits(page, value, "institution", hits, lines)
 
         # Fallback "University"/"Institute"
         lines = full_text.splitlines()
         for line in lines:
             candidate = line.strip()
             if candidate and ("university" in candidate.lower() or "institute" in candidate.lower()):
-                rects = page.search_for(candidate)
-                for r in rects:
-                    if skip_top is not None and r.y0 < skip_top:
-                        continue
-                    if process_limit is not None and r.y0 >= process_limit:
-                        continue
-
-                    cipher_text = custom_cipher(candidate)
-                    all_regions.append({
-                        "category": "institution",
-                        "text": candidate,
-                        "cipher": cipher_text,
-                        "rect": [r.x0, r.y0, r.x1, r.y1],
-                        "page": page_index
-                    })
-
-                    page.add_redact_annot(
-                        r,
-                        text=cipher_text,
-                        fill=(1,1,1),
-                    )
+                _search_hits(page, candidate, "institution", hits)
                 break
+    return hits
 
-def anonymize_pdf(input_pdf_path, output_pdf_path, options=None):
+def _image_rects(page):
+    """
+    Sayfada çizilen görsellerin (sayfaya kırpılmış) alanları. "blocks" çıktısı
+    rawdict ile aynı görsel bloklarını verir ama görsel baytlarını Python'a
+    kopyalamaz.
+    """
+    flags = fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES
+    return [fitz.Rect(block[:4]) for block in page.get_text("blocks", flags=flags) if block[6] == 1]
+
+
+def _anonymize_page(page, page_index, process_limit, analysis, options, gazetteer, all_regions, budget=None):
+    references_page_index = analysis.sections.get("references_page")
+    if budget is not None:
+        budget.check(page=page_index)
+    org_ner = budget is None or not budget.at_least(TIER_NO_ORG)
+    blur_dpi = LOW_DPI if budget is not None and budget.at_least(TIER_LOW_DPI) else None
+    entities = analysis.entities.get(page_index)
+    if entities is None and budget is not None and budget.at_least(TIER_REGEX):
+        # Analizde NER'i olmayan sayfa: spaCy yerine yalnızca regex + sözlük
+        entities = []
+
+    skip_top = None
+    if page_index == 0:
+        skip_top = 0.15 * page.rect.height
+
+    # Metin katmanı olmayan (taranmış) sayfalar doğrudan görsel yoluna gider
+    image_only = analysis.page_mode(page_index) == MODE_IMAGE
+    if not image_only:
+        process_page_text(
+            page, process_limit, page_index, options, all_regions, skip_top=skip_top,
+            full_text=analysis.page_texts[page_index],
+            entities=entities,
+            gazetteer=gazetteer,
+            org_ner=org_ner,
+        )
+        # Redaction anotasyonlarını uygula
+        with metrics.stage("redaction"):
+            page.apply_redactions()
+
+    # REFERENCES'tan sonra (ve metinsiz sayfalarda) görsel bulanıklaştırma
+    after_references = references_page_index is not None and page_index > references_page_index
+    if (after_references or image_only) and options.get("blur_images", True):
+        rects = _image_rects(page)
+        if process_limit is not None:
+            # Abstract sayfasında yalnızca başlığın üstündeki görseller; makale içeriğine dokunulmaz
+            rects = [r for r in rects if r.y1 <= process_limit]
+        with metrics.stage("image_blur") as blur:
+            for r in rects:
+                all_regions.append({
+                    "category": "image",
+                    "rect": [r.x0, r.y0, r.x1, r.y1],
+                    "page": page_index
+                })
+                blur_image_region(page, r, blur_radius=5, dpi=blur_dpi)
+                blur.add()
+
+
+def save_anonymized(doc, output_pdf_path):
+    """
+    Anonim çıktıyı yazar. garbage ile artık referans verilmeyen eski içerik
+    akışları (redaction öncesi sayfa metni) dosyaya taşınmaz; XMP ve yazar
+    bilgisi de silinir.
+    """
+    doc.del_xml_metadata()
+    if doc.metadata and doc.metadata.get("author"):
+        doc.set_metadata(dict(doc.metadata, author=""))
+    with metrics.stage("save"):
+        doc.save(output_pdf_path, garbage=1, deflate=True)
+
+
+def _streaming_limits():
+    return (
+        getattr(settings, "ANONYMIZE_FLUSH_PAGES", 25),
+        getattr(settings, "ANONYMIZE_RSS_CEILING_MB", 1024) * 2 ** 20,
+    )
+
+
+def anonymize_pdf(input_pdf_path, output_pdf_path, options=None, analysis=None, gazetteer=None,
+                  streaming=None, budget=None):
+    """
+    analysis: aynı dosyanın önceden hesaplanmış ortak analizi (analysis.Analysis).
+    Verilmezse belge burada bir kez analiz edilir.
+    gazetteer: bilinen tanımlayıcılar; verilmezse KnownIdentifier tablosundan alınır.
+    streaming: None ise sayfa sayısı settings.ANONYMIZE_STREAMING_PAGES ve
+    üzerindeyse sayfa sayfa akış kipi (_anonymize_streaming) kullanılır.
+    budget: budget.TimeBudget; süre azaldıkça daha ucuz kademelere inilir.
+    """
     if options is None:
         options = {
             "anonymize_name": True,
@@ -227,96 +391,80 @@ def anonymize_pdf(input_pdf_path, output_pdf_path, options=None):
             "anonymize_institution": True,
             "blur_images": True
         }
-    print("DEBUG: anonymize_pdf fonksiyonuna gelen options =", options)
+    logger.debug("anonymize_pdf options = %s", options)
+
+    if gazetteer is None:
+        gazetteer = get_gazetteer()
 
     doc = fitz.open(input_pdf_path)
     all_regions = []
 
-    # 1) Abstract/Özet sayfası bulma
-    abstract_page_index = None
-    abstract_y = None
-    for i in range(len(doc)):
-        page = doc[i]
-        txt = page.get_text("text")
-        m = re.search(r'\b(abstract|özet)\b', txt, re.IGNORECASE)
-        if m:
-            abstract_page_index = i
-            rects = page.search_for(m.group(0))
-            if rects:
-                abstract_y = min(r.y0 for r in rects)
-            break
-
-    # 2) REFERENCES sayfası bulma
-    references_page_index = None
-    for i in range(len(doc)):
-        page = doc[i]
-        txt = page.get_text("text")
-        if re.search(r'\bREFERENCES\b', txt):
-            references_page_index = i
-            break
-
-    # 3) "giriş", "ilgili çalışmalar", "teşekkür" sayfalarını atla
-    skip_section_keywords = ["giriş", "ilgili çalışmalar", "teşekkür"]
-    skip_pages = set()
-    for i in range(len(doc)):
-        page = doc[i]
-        page_height = page.rect.height
-        txt_lower = page.get_text("text").lower()
-        for kw in skip_section_keywords:
-            kw_rects = page.search_for(kw)
-            for r in kw_rects:
-                if r.y0 < 0.2 * page_height:
-                    skip_pages.add(i)
-                    break
-            if i in skip_pages:
-                break
+    # 1-3) Abstract/Özet, REFERENCES ve atlanacak bölümler ortak analizden gelir
+    if analysis is None:
+        analysis = analyze_document(doc, gazetteer=gazetteer, budget=budget)
 
-    # 4) Tüm sayfaları dolaş
-    for page_index in range(len(doc)):
-        page = doc[page_index]
+    if streaming is None:
+        streaming = len(doc) >= getattr(settings, "ANONYMIZE_STREAMING_PAGES", 200)
+    if streaming:
+        doc.close()
+        return _anonymize_streaming(input_pdf_path, output_pdf_path, options, analysis, gazetteer, budget)
 
-        if page_index in skip_pages:
-            continue
+    # 4) İşlenecek sayfaları dolaş
+    for page_index, process_limit in analysis.pages_to_process():
+        _anonymize_page(doc[page_index], page_index, process_limit, analysis, options, gazetteer, all_regions,
+                        budget)
 
-        skip_top = None
-        if page_index == 0:
-            skip_top = 0.15 * page.rect.height
-
-        process = False
-        process_limit = None
-
-        if abstract_page_index is not None:
-            if page_index < abstract_page_index:
-                process = True
-            elif page_index == abstract_page_index:
-                process = True
-                process_limit = abstract_y
-            elif references_page_index is not None and page_index > references_page_index:
-                process = True
-        else:
-            process = True
+    save_anonymized(doc, output_pdf_path)
+    doc.close()
+    return all_regions
 
-        if process:
-            process_page_text(page, process_limit, page_index, options, all_regions, skip_top=skip_top)
-            # Redaction anotasyonlarını uygula
-            page.apply_redactions()
 
-        # REFERENCES'tan sonra görsel bulanıklaştırma
-        if references_page_index is not None and page_index > references_page_index and options.get("blur_images", True):
-            rawdict = page.get_text("rawdict")
-            for block in rawdict.get("blocks", []):
-                if block.get("type") == 1 and "bbox" in block:
-                    bbox = block["bbox"]
-                    r = fitz.Rect(bbox)
-                    all_regions.append({
-                        "category": "image",
-                        "rect": [r.x0, r.y0, r.x1, r.y1],
-                        "page": page_index
-                    })
-                    blur_image_region(page, r, blur_radius=5)
-
-    doc.save(output_pdf_path)
-    doc.close()
+def _anonymize_streaming(input_pdf_path, output_pdf_path, options, analysis, gazetteer, budget=None):
+    """
+    Çok büyük PDF'ler için bellek sınırlı kip. Sayfalar tek tek işlenir; her
+    sayfadan sonra sayfa nesnesi bırakılır ve MuPDF önbelleği boşaltılır.
+    Değişen sayfalar ANONYMIZE_FLUSH_PAGES sayfada bir (ya da süreç RSS'i
+    ANONYMIZE_RSS_CEILING_MB'yi aşınca) bir çalışma kopyasına artımlı olarak
+    yazılıp belge yeniden açılır; böylece bellekte yalnızca son parti kalır.
+    Sonda çalışma kopyası save_anonymized ile tam olarak yeniden yazılır
+    (artımlı kayıtlar eski içerik akışlarını dosyada tutar).
+    """
+    flush_pages, rss_ceiling = _streaming_limits()
+    work_path = output_pdf_path + ".work"
+    shutil.copyfile(input_pdf_path, work_path)
+    all_regions = []
+    flushes = 0
+    try:
+        doc = fitz.open(work_path)
+        incremental = doc.can_save_incrementally()
+        pending = 0
+        for page_index, process_limit in analysis.pages_to_process():
+            page = doc[page_index]
+            _anonymize_page(page, page_index, process_limit, analysis, options, gazetteer, all_regions, budget)
+            page = None
+            fitz.TOOLS.store_shrink(100)
+            pending += 1
+
+            rss = metrics.current_rss()
+            over_ceiling = rss is not None and rss > rss_ceiling
+            if incremental and (pending >= flush_pages or over_ceiling):
+                with metrics.stage("stream_flush", count=pending):
+                    doc.saveIncr()
+                    doc.close()
+                    doc = fitz.open(work_path)
+                flushes += 1
+                pending = 0
+                if over_ceiling:
+                    logger.warning(
+                        "anonymize_pdf: RSS %.0f MB > tavan, %d. sayfada ara kayıt yapıldı",
+                        rss / 2 ** 20, page_index,
+                    )
+        save_anonymized(doc, output_pdf_path)
+        doc.close()
+    finally:
+        if os.path.exists(work_path):
+            os.remove(work_path)
+    logger.debug("anonymize_pdf (akış kipi): %d ara kayıt", flushes)
     return all_regions
 
 def custom_decipher(cipher_text):
@@ -366,53 +514,54 @@ def restore_original_fields(input_pdf_path, original_pdf_path, regions,
     orig_doc = fitz.open(original_pdf_path)
     os.makedirs(os.path.dirname(output_pdf_path), exist_ok=True)
 
-    for region in regions:
-        cat = region.get("category", "")
-        if cat not in categories_to_restore:
-            continue
-        page_num = region.get("page", 0)
-        if page_num >= len(doc):
-            continue
-
-        coords = region.get("rect", [])
-        if len(coords) != 4:
-            continue
-
-        rect = fitz.Rect(*coords)
-        page = doc[page_num]
+    with metrics.stage("restore") as restore:
+        for region in regions:
+            cat = region.get("category", "")
+            if cat not in categories_to_restore:
+                continue
+            page_num = region.get("page", 0)
+            if page_num >= len(doc):
+                continue
 
-        if cat in ["name", "contact", "institution"]:
-            cipher_text = region.get("cipher", "")
-            if not cipher_text.strip():
+            coords = region.get("rect", [])
+            if len(coords) != 4:
                 continue
-            decrypted_text = custom_decipher(cipher_text)
 
-            # Metni gerçekten PDF'ten sil:
-            page.add_redact_annot(rect, text="", fill=None)
-            page.apply_redactions()
+            rect = fitz.Rect(*coords)
+            page = doc[page_num]
+
+            if cat in ["name", "contact", "institution"]:
+                cipher_text = region.get("cipher", "")
+                if not cipher_text.strip():
+                    continue
+                decrypted_text = custom_decipher(cipher_text)
+
+                # Metni gerçekten PDF'ten sil:
+                page.add_redact_annot(rect, text="", fill=None)
+                page.apply_redactions()
+
+                logger.debug("restore: sayfa %d, %s", page_num, rect)
+
+                # Metni ekle - basit bir (x, y) ile deneyin:
+                x, y = rect.x0, rect.y0 + 2  # +2 piksel kaydırma
+                page.insert_text(
+                    (x, y),
+                    decrypted_text,
+                    fontsize=8,
+                    color=(0, 0, 0),
+                    overlay=True
+                )
 
-            # Debug: dikdörtgen boyutunu ve metni yazdır
-            print(f"Rect: {rect}, Decrypted: '{decrypted_text}'")
-
-            # Metni ekle - basit bir (x, y) ile deneyin:
-            x, y = rect.x0, rect.y0 + 2  # +2 piksel kaydırma
-            page.insert_text(
-                (x, y),
-                decrypted_text,
-                fontsize=8,
-                color=(0, 0, 0),
-                overlay=True
-            )
-
-        elif cat == "image":
-            if page_num < len(orig_doc):
-                orig_page = orig_doc[page_num]
-                pix = orig_page.get_pixmap(clip=rect)
-                img_bytes = pix.tobytes("png")
-                page.insert_image(rect, stream=img_bytes, overlay=True)
+            elif cat == "image":
+                if page_num < len(orig_doc):
+                    orig_page = orig_doc[page_num]
+                    pix = orig_page.get_pixmap(clip=rect)
+                    img_bytes = pix.tobytes("png")
+                    page.insert_image(rect, stream=img_bytes, overlay=True)
 
     temp_path = output_pdf_path + ".temp"
-    doc.save(temp_path)
+    with metrics.stage("save"):
+        doc.save(temp_path)
     doc.close()
     orig_doc.close()
     os.replace(temp_path, output_pdf_path)
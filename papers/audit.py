@@ -0,0 +1,161 @@
+"""
+Tamponlu denetim kaydı (Log) yazıcısı.
+
+    from . import audit
+    audit.log(sub, "Makale anonimleştirildi", details=run.to_json())
+
+Satırlar çağrı anında INSERT edilmez:
+- Açık bir transaction içindeyse satır o transaction'a bağlanır; commit'te
+  tampondaki diğer satırlarla birlikte tek bulk_create ile yazılır,
+  rollback'te atılır.
+- Autocommit'te süreç içi tampona eklenir; tampon AUDIT_LOG_BUFFER_SIZE
+  satıra ulaşınca ya da en eski satır AUDIT_LOG_MAX_AGE saniyeyi geçince
+  yazılır. Ayrıca her isteğin sonunda (request_finished), her arka plan
+  işinin sonunda ve süreç düzgün kapanırken (atexit) tampon boşaltılır.
+
+Yazmalar tek bir kilitle sıralanır; satırlar log() çağrı sırasıyla eklenir.
+bulk_create başarısız olursa satırlar tamponun başına geri konur. Makalesi
+tampondayken silinmiş satırlar atlanır. İç içe bir atomic bloğunun savepoint
+rollback'i o blokta eklenen satırları geri almaz (satırlar en dış
+transaction'a bağlıdır).
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def buffer_size():
+    return getattr(settings, "AUDIT_LOG_BUFFER_SIZE", 500)
+
+
+def max_age():
+    return getattr(settings, "AUDIT_LOG_MAX_AGE", 2.0)
+
+
+def _reset(rows):
+    # Başarısız bulk_create'in atadığı (geri alınmış) id'ler yeniden kullanılmasın
+    for row in rows:
+        row.pk = None
+        row._state.adding = True
+
+
+class AuditLogger:
+    def __init__(self):
+        self._lock = threading.Lock()           # tampon
+        self._flush_lock = threading.Lock()     # yazma sırası
+        self._rows = []
+        self._oldest = None
+        self._local = threading.local()
+
+    def log(self, submission, action, details=""):
+        from .models import Log
+
+        # Yalnızca id tutulur: makale tampondayken silinirse nesnenin pk'sı None olur
+        row = Log(submission_id=submission.pk, action=action, details=details or "", timestamp=timezone.now())
+        if connection.in_atomic_block:
+            self._transaction_rows().append(row)
+        else:
+            self._add([row])
+        return row
+
+    def log_many(self, submission_ids, action, details=""):
+        """Aynı işlemi birçok makale için kaydeder (toplu durum geçişleri, bkz. bulk.py)."""
+        from .models import Log
+
+        now = timezone.now()
+        rows = [Log(submission_id=submission_id, action=action, details=details or "", timestamp=now)
+                for submission_id in submission_ids]
+        if connection.in_atomic_block:
+            self._transaction_rows().extend(rows)
+        else:
+            self._add(rows)
+        return rows
+
+    def _transaction_rows(self):
+        """Bu iş parçacığındaki açık transaction'ın satır listesi (commit'te tampona geçer)."""
+        state = self._local
+        pending = getattr(state, "pending", None)
+        # Önceki transaction rollback olduysa geri çağrısı listeden düşmüştür
+        if pending is None or not any(entry[1] is pending[1] for entry in connection.run_on_commit):
+            rows = []
+
+            def committed():
+                state.pending = None
+                self._add(rows, force=True)
+
+            transaction.on_commit(committed)
+            state.pending = pending = (rows, committed)
+        return pending[0]
+
+    def _add(self, rows, force=False):
+        if not rows:
+            return
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.extend(rows)
+            due = force or len(self._rows) >= buffer_size() or time.monotonic() - self._oldest >= max_age()
+        if due:
+            self.flush()
+
+    def pending(self):
+        with self._lock:
+            return len(self._rows)
+
+    def flush(self):
+        """Tampondaki satırları yazar; yazılan satır sayısını döndürür."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                self._oldest = None
+            if not rows:
+                return 0
+            try:
+                return self._write(rows)
+            except DatabaseError:
+                logger.exception("Log tamponu yazılamadı (%d satır); sonraki boşaltmada yeniden denenecek", len(rows))
+                _reset(rows)
+                with self._lock:
+                    self._rows[:0] = rows
+                    self._oldest = time.monotonic()
+                return 0
+
+    def _write(self, rows):
+        from .models import Log, Submission
+
+        try:
+            with transaction.atomic():
+                Log.objects.bulk_create(rows)
+        except IntegrityError:
+            _reset(rows)
+            alive = set(
+                Submission.objects.filter(id__in={row.submission_id for row in rows}).values_list("id", flat=True)
+            )
+            dropped = sum(1 for row in rows if row.submission_id not in alive)
+            rows = [row for row in rows if row.submission_id in alive]
+            logger.warning("Silinmiş makalelere ait %d log satırı atlandı", dropped)
+            with transaction.atomic():
+                Log.objects.bulk_create(rows)
+        return len(rows)
+
+
+_audit = AuditLogger()
+log = _audit.log
+log_many = _audit.log_many
+flush = _audit.flush
+pending = _audit.pending
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        _audit.flush()
+    except Exception:
+        logger.exception("Kapanışta log tamponu yazılamadı")
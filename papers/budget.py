@@ -0,0 +1,81 @@
+"""
+Belge başına zaman bütçesi ve kademeli bozulma.
+
+Anonimleştirme (analiz dahil) bir TimeBudget ile çalıştırılır. Bütçenin
+harcanan oranı arttıkça işlem daha ucuz kademelere iner ve geri dönmez:
+
+    full     -> tam işlem
+    no_org   -> spaCy ORG varlıkları aranmaz (kurumlar sözlük + "University" satırı)
+    regex    -> kalan sayfalarda spaCy çalıştırılmaz (e-posta regex'i + sözlük)
+    low_dpi  -> görseller düşük çözünürlükte bulanıklaştırılır
+
+Kademe sayfa sınırlarında kontrol edilir; bir sayfa başladığı kademeyle
+biter. Kullanılan en düşük kademe ve geçişler Log.details["budget"] altına
+yazılır; bozulmuş çalışmalar reanonymize_degraded komutuyla sınırsız bütçeyle
+yeniden çalıştırılabilir.
+"""
+import time
+
+from django.conf import settings
+
+TIER_FULL = "full"
+TIER_NO_ORG = "no_org"
+TIER_REGEX = "regex"
+TIER_LOW_DPI = "low_dpi"
+TIERS = (TIER_FULL, TIER_NO_ORG, TIER_REGEX, TIER_LOW_DPI)
+TIER_LABELS = {
+    TIER_FULL: "tam",
+    TIER_NO_ORG: "kurum NER'i kapalı",
+    TIER_REGEX: "regex + sözlük",
+    TIER_LOW_DPI: "düşük çözünürlüklü bulanıklaştırma",
+}
+# (bütçenin harcanan oranı, kademe); settings.ANONYMIZE_BUDGET_STEPS ile değiştirilebilir
+DEFAULT_STEPS = ((0.5, TIER_NO_ORG), (0.7, TIER_REGEX), (0.85, TIER_LOW_DPI))
+# low_dpi kademesinde bulanıklaştırma çözünürlüğü (varsayılan 72)
+LOW_DPI = 36
+
+
+class TimeBudget:
+    def __init__(self, seconds, steps=None, clock=time.monotonic):
+        self.seconds = seconds
+        self.steps = tuple(steps if steps is not None else getattr(settings, "ANONYMIZE_BUDGET_STEPS", DEFAULT_STEPS))
+        self._clock = clock
+        self._start = clock()
+        self.tier = TIER_FULL
+        self.transitions = []       # [{"tier", "page", "elapsed"}]
+
+    def elapsed(self):
+        return self._clock() - self._start
+
+    def check(self, page=None):
+        """Harcanan süreye göre kademeyi (yalnızca aşağı doğru) günceller ve döndürür."""
+        if not self.seconds:
+            return self.tier
+        elapsed = self.elapsed()
+        used = elapsed / self.seconds
+        for ratio, tier in self.steps:
+            if used >= ratio and TIERS.index(tier) > TIERS.index(self.tier):
+                self.tier = tier
+                self.transitions.append({"tier": tier, "page": page, "elapsed": round(elapsed, 3)})
+        return self.tier
+
+    def at_least(self, tier):
+        """Geçerli kademe tier ya da daha ucuzu mu?"""
+        return TIERS.index(self.tier) >= TIERS.index(tier)
+
+    @property
+    def degraded(self):
+        return self.tier != TIER_FULL
+
+    def as_dict(self):
+        return {
+            "seconds": self.seconds,
+            "tier": self.tier,
+            "elapsed": round(self.elapsed(), 3),
+            "transitions": self.transitions,
+        }
+
+
+def document_budget():
+    """settings.ANONYMIZE_TIME_BUDGET saniyelik bütçe (None/0: sınırsız)."""
+    return TimeBudget(getattr(settings, "ANONYMIZE_TIME_BUDGET", None))
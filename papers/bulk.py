@@ -0,0 +1,235 @@
+"""
+Editörün toplu işlemleri: filtreyle seçilen makalelerde durum geçişleri,
+final PDF üretimi ve silme.
+
+Durum geçişleri makale başına save() yerine id parçaları üzerinde UPDATE ile
+yapılır; Log satırları audit.log_many ile aynı transaction'a bağlanır ve
+commit'te tek bulk_create ile yazılır. UPDATE post_save sinyalini
+tetiklemez; arama indeksi yalnızca anahtar kelime/değerlendirme metnini
+tuttuğu için durum geçişlerinden etkilenmez.
+
+Silmede dosyalara istek içinde dokunulmaz: dosya adları PendingFileDeletion
+kuyruğuna yazılır, satırlar silinir ve commit'ten sonra arka planda
+sweep_file_deletions dosyaları siler (yarım kalırsa: sweep_files komutu).
+"""
+import json
+import logging
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, Q
+
+from . import audit, metrics
+from .anonymization import restore_original_fields
+from .models import PendingFileDeletion, Submission, version_bump
+from .tasks import submit_on_commit
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELDS = ("original_pdf", "revised_pdf", "anonymized_pdf", "final_pdf", "reviewed_pdf")
+# UPDATE ... WHERE id IN (...) başına id sayısı
+CHUNK_SIZE = 500
+
+OPERATIONS = (
+    ("assign_reviewer", "Hakeme ata"),
+    ("request_revision", "Revizyon iste"),
+    ("finalize", "Final PDF oluştur"),
+)
+# Tekil görünümlerdeki koşullar: seçimdeki makalelerden yalnızca bunlara uyanlar işlenir
+ELIGIBLE = {
+    "assign_reviewer": Q(status__in=["Anonimleştirildi", "Düzenlenmiş"]),
+    "request_revision": Q(status="Değerlendirildi"),
+    "finalize": (Q(status="Değerlendirildi") & Q(reviewed_pdf__isnull=False) & ~Q(reviewed_pdf="")
+                 & Q(anonymized_data__isnull=False) & ~Q(anonymized_data="")),
+}
+
+
+def parse_tracking_numbers(text):
+    """Boşluk, virgül veya satır sonuyla ayrılmış takip numaraları."""
+    return [value for value in text.replace(",", " ").split() if value]
+
+
+def select_submissions(status=None, tracking_numbers=None, submitted_after=None, submitted_before=None):
+    """Filtrelere uyan makaleler (boş filtre uygulanmaz)."""
+    queryset = Submission.objects.all()
+    if status:
+        queryset = queryset.filter(status=status)
+    if tracking_numbers:
+        queryset = queryset.filter(tracking_number__in=tracking_numbers)
+    if submitted_after:
+        queryset = queryset.filter(timestamp__date__gte=submitted_after)
+    if submitted_before:
+        queryset = queryset.filter(timestamp__date__lte=submitted_before)
+    return queryset
+
+
+def preview(queryset):
+    """{"total": seçilen, <işlem>: o işleme uygun makale sayısı} (tek sorgu)."""
+    return queryset.aggregate(
+        total=Count("id"),
+        **{operation: Count("id", filter=condition) for operation, condition in ELIGIBLE.items()},
+    )
+
+
+def _eligible_ids(queryset, operation):
+    return list(
+        queryset.filter(ELIGIBLE[operation]).select_for_update().order_by("id").values_list("id", flat=True)
+    )
+
+
+def _apply(queryset, operation, action, **changes):
+    """Seçimdeki uygun makaleleri changes ile günceller ve her birine log yazar; id listesini döndürür."""
+    with transaction.atomic():
+        ids = _eligible_ids(queryset, operation)
+        for start in range(0, len(ids), CHUNK_SIZE):
+            Submission.objects.filter(id__in=ids[start:start + CHUNK_SIZE]).update(**changes, **version_bump())
+        audit.log_many(ids, action)
+    return ids
+
+
+def assign_reviewer(queryset, reviewer):
+    return _apply(queryset, "assign_reviewer", f"Hakeme atandı: {reviewer.name} (toplu)",
+                  reviewer=reviewer, status="Hakeme Atandı")
+
+
+def request_revision(queryset):
+    return _apply(queryset, "request_revision", "Editör revizyon istedi (Revize Gerekli, toplu)",
+                  status="Revize Gerekli")
+
+
+def finalize(queryset):
+    """Uygun makalelerin final PDF'leri arka planda üretilir; kuyruğa alınan id'leri döndürür."""
+    with transaction.atomic():
+        ids = _eligible_ids(queryset, "finalize")
+        if ids:
+            submit_on_commit(finalize_submissions, ids)
+    return ids
+
+
+def render_final_pdf(sub):
+    """
+    Değerlendirilmiş PDF'e orijinal alanları geri yükleyerek final PDF'i yazar.
+    (final dosya adı ya da başarısızsa None, metrics run) döndürür;
+    anonymized_data okunamazsa ValueError.
+    """
+    regions = json.loads(sub.anonymized_data)
+    final_filename = f"final_{os.path.basename(sub.reviewed_pdf.path)}"
+    final_path = os.path.join(settings.MEDIA_ROOT, 'final', final_filename)
+    with metrics.run("restore") as run:
+        success = restore_original_fields(
+            input_pdf_path=sub.reviewed_pdf.path,
+            original_pdf_path=sub.original_pdf.path,
+            regions=regions,
+            categories_to_restore=["name", "contact", "institution", "image"],
+            output_pdf_path=final_path
+        )
+    return (os.path.join('final', final_filename) if success else None), run
+
+
+def finalize_submissions(submission_ids, chunk_size=50):
+    """
+    Arka plan işi: final PDF'leri üretir, her chunk_size makalede bir durumları
+    tek bulk_update ile Final yapar. Bu sırada durumu değişmiş makaleler atlanır.
+    """
+    for start in range(0, len(submission_ids), chunk_size):
+        chunk = Submission.objects.filter(ELIGIBLE["finalize"], id__in=submission_ids[start:start + chunk_size])
+        done = []
+        for sub in chunk:
+            try:
+                final_name, run = render_final_pdf(sub)
+            except Exception:
+                # Bozuk bir PDF diğer makaleleri durdurmasın
+                logger.exception("Final PDF üretilemedi: %s", sub.tracking_number)
+                continue
+            if final_name:
+                sub.final_pdf.name = final_name
+                sub.status = "Final"
+                sub.final_sent = False
+                done.append((sub, run))
+        with transaction.atomic():
+            still = set(
+                Submission.objects.filter(ELIGIBLE["finalize"], id__in=[sub.id for sub, _ in done])
+                .select_for_update().values_list("id", flat=True)
+            )
+            done = [(sub, run) for sub, run in done if sub.id in still]
+            for sub, _ in done:
+                for field, value in version_bump().items():
+                    setattr(sub, field, value)
+            Submission.objects.bulk_update([sub for sub, _ in done],
+                                           ["final_pdf", "status", "final_sent", "version", "updated_at"])
+            for sub, run in done:
+                audit.log(sub, "Final PDF oluşturuldu (toplu, henüz gönderilmedi)", details=run.to_json())
+
+
+def delete_submissions(queryset):
+    """
+    Makaleleri ve bağlı kayıtlarını (Log, Message, imza, arama kaydı; CASCADE)
+    siler, dosyalarını silme kuyruğuna yazar. Silinen makale sayısını döndürür.
+    """
+    with transaction.atomic():
+        names = set()
+        for row in queryset.values_list(*FILE_FIELDS).iterator(chunk_size=2000):
+            names.update(name for name in row if name)
+        queue_file_deletions(names)
+        # Yalnızca id okunur; bağlı tablolar id parçalarıyla DELETE edilir
+        _, per_model = queryset.only("id").delete()
+        submit_on_commit(sweep_file_deletions)
+    return per_model.get(Submission._meta.label, 0)
+
+
+def queue_file_deletions(names):
+    PendingFileDeletion.objects.bulk_create(
+        (PendingFileDeletion(name=name) for name in names), ignore_conflicts=True, batch_size=CHUNK_SIZE,
+    )
+
+
+def _names_in_use(names):
+    """names içinden hâlâ bir makalenin dosya alanında bulunanlar."""
+    condition = Q()
+    for field in FILE_FIELDS:
+        condition |= Q(**{f"{field}__in": names})
+    in_use = set()
+    for row in Submission.objects.filter(condition).values_list(*FILE_FIELDS):
+        in_use.update(row)
+    return in_use & set(names)
+
+
+def sweep_file_deletions(batch_size=100, max_attempts=5):
+    """
+    Silme kuyruğundaki dosyaları siler. {"deleted", "kept", "failed"} döndürür;
+    kept: başka bir makale hâlâ kullandığı için silinmeden kuyruktan düşülenler.
+    Silinemeyen dosyanın deneme sayısı artar, max_attempts'te bırakılır.
+    """
+    stats = Counter(deleted=0, kept=0, failed=0)
+    last_id = 0
+    while True:
+        batch = list(
+            PendingFileDeletion.objects.filter(id__gt=last_id, attempts__lt=max_attempts).order_by("id")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        in_use = _names_in_use([pending.name for pending in batch])
+        done, failed = [], []
+        for pending in batch:
+            if pending.name in in_use:
+                stats["kept"] += 1
+                done.append(pending.id)
+                continue
+            try:
+                default_storage.delete(pending.name)
+            except OSError as e:
+                pending.attempts += 1
+                pending.last_error = str(e)
+                failed.append(pending)
+                continue
+            stats["deleted"] += 1
+            done.append(pending.id)
+        PendingFileDeletion.objects.filter(id__in=done).delete()
+        if failed:
+            PendingFileDeletion.objects.bulk_update(failed, ["attempts", "last_error"])
+            stats["failed"] += len(failed)
+    return dict(stats)
@@ -0,0 +1,260 @@
+"""
+Hakem, alan ve alt başlık kataloğunun toplu içe aktarımı (CSV/JSON).
+
+JSON:
+    {"domains": [{"name": "Yapay Zeka", "subtopics": ["Derin öğrenme", ...]}],
+     "reviewers": [{"name": "...", "email": "...", "interests": ["Yapay Zeka: Derin öğrenme", ...]}]}
+    (üst düzey liste yalnızca hakemler demektir)
+CSV (başlık satırına göre):
+    domain,subtopic          -> alt başlık başına bir satır
+    name,email[,interests]   -> hakem başına bir satır; interests ";" ile ayrılır
+
+İlgi alanı "Alan: Alt başlık" (Subtopic.__str__) ya da yalnızca alt başlık adı
+olabilir; yalnızca ad birden çok alanda geçiyorsa ya da hiç yoksa hata verilir.
+"Alan: Alt başlık" biçiminde geçen eksik alan ve alt başlıklar oluşturulur.
+
+Kayıt başına save() yapılmaz. Alan ve alt başlıklar ada göre eşlenir ve
+yalnızca eksikler bulk_create ile eklenir. Bu tablolarda benzersizlik kısıtı
+yoktur: okuma ve ekleme aynı transaction'dadır (SQLite'ta IMMEDIATE yazma
+kilidi başka bir içe aktarımı bekletir). Hakemler e-postaya göre
+bulk_create(update_conflicts) ile eklenir ya da adları güncellenir; ilgi
+alanları ara tabloya toplu yazılır (ignore_conflicts). Dosyada ilgi alanı
+verilen hakemlerin mevcut ilgi alanları varsayılan olarak dosyadakiyle
+değiştirilir.
+"""
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .classifier import invalidate_classifier
+from .models import Domain, Reviewer, Subtopic
+
+BATCH_SIZE = 500
+INTEREST_SEPARATOR = ";"
+
+
+class CatalogError(ValueError):
+    """Dosya okunamadı ya da geçersiz satırlar var; errors: satır başına mesajlar."""
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors[:5]) + (f" (+{len(errors) - 5} hata)" if len(errors) > 5 else ""))
+
+
+class Catalog:
+    def __init__(self):
+        self.domains = {}      # alan adı -> {alt başlık adı: None} (sıralı küme)
+        self.reviewers = {}    # e-posta -> [ad, ilgi alanları ya da None (dokunma)]
+        self.errors = []
+
+    def add_subtopic(self, domain, subtopic=None, where=""):
+        domain = (domain or "").strip()
+        subtopic = (subtopic or "").strip()
+        if not domain:
+            self.errors.append(f"{where}: alan adı boş")
+            return
+        if len(domain) > 150 or len(subtopic) > 150:
+            self.errors.append(f"{where}: ad 150 karakterden uzun")
+            return
+        names = self.domains.setdefault(domain, {})
+        if subtopic:
+            names[subtopic] = None
+
+    def add_reviewer(self, name, email, interests, where=""):
+        name, email = (name or "").strip(), (email or "").strip()
+        try:
+            validate_email(email)
+        except ValidationError:
+            self.errors.append(f"{where}: geçersiz e-posta {email!r}")
+            return
+        if not name or len(name) > 100:
+            self.errors.append(f"{where}: hakem adı boş ya da 100 karakterden uzun")
+            return
+        if interests is not None:
+            normalized = []
+            for value in interests:
+                domain, separator, subtopic = (value or "").partition(": ")
+                domain, subtopic = domain.strip(), subtopic.strip()
+                if not domain:
+                    if separator or subtopic:
+                        self.errors.append(f"{where}: geçersiz ilgi alanı {value!r}")
+                        return
+                    continue
+                if len(domain) > 150 or len(subtopic) > 150 or (separator and not subtopic):
+                    self.errors.append(f"{where}: geçersiz ilgi alanı {value!r}")
+                    return
+                normalized.append(f"{domain}: {subtopic}" if separator else domain)
+            interests = normalized
+        # Aynı e-posta tekrar ederse son satır geçerli
+        self.reviewers[email] = [name, interests]
+
+
+def _split_interests(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.split(INTEREST_SEPARATOR)
+    return list(value)
+
+
+def parse_catalog(content, filename=""):
+    """content: bytes ya da str. Biçim dosya uzantısından, yoksa içerikten anlaşılır."""
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise CatalogError(["Dosya UTF-8 olmalı"])
+    catalog = Catalog()
+    is_json = filename.lower().endswith(".json") or content.lstrip()[:1] in ("{", "[")
+    if is_json:
+        _parse_json(content, catalog)
+    else:
+        _parse_csv(content, catalog)
+    if catalog.errors:
+        raise CatalogError(catalog.errors)
+    if not catalog.domains and not catalog.reviewers:
+        raise CatalogError(["Dosyada alan, alt başlık ya da hakem yok"])
+    return catalog
+
+
+def _parse_json(content, catalog):
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise CatalogError([f"JSON okunamadı: {e}"])
+    if isinstance(data, list):
+        data = {"reviewers": data}
+    if not isinstance(data, dict):
+        raise CatalogError(["JSON bir nesne ya da hakem listesi olmalı"])
+    for i, domain in enumerate(data.get("domains") or []):
+        where = f"domains[{i}]"
+        if not isinstance(domain, dict):
+            catalog.errors.append(f"{where}: nesne olmalı")
+            continue
+        catalog.add_subtopic(domain.get("name"), where=where)
+        for subtopic in domain.get("subtopics") or []:
+            catalog.add_subtopic(domain.get("name"), subtopic, where=where)
+    for i, reviewer in enumerate(data.get("reviewers") or []):
+        where = f"reviewers[{i}]"
+        if not isinstance(reviewer, dict):
+            catalog.errors.append(f"{where}: nesne olmalı")
+            continue
+        catalog.add_reviewer(reviewer.get("name"), reviewer.get("email"),
+                             _split_interests(reviewer.get("interests")), where=where)
+
+
+def _parse_csv(content, catalog):
+    reader = csv.DictReader(io.StringIO(content))
+    fields = {name.strip().lower() for name in reader.fieldnames or []}
+    if {"domain", "subtopic"} <= fields:
+        for row in reader:
+            row = {k.strip().lower(): v for k, v in row.items() if k}
+            catalog.add_subtopic(row.get("domain"), row.get("subtopic"), where=f"satır {reader.line_num}")
+    elif {"name", "email"} <= fields:
+        has_interests = "interests" in fields
+        for row in reader:
+            row = {k.strip().lower(): v for k, v in row.items() if k}
+            interests = _split_interests(row.get("interests") or "") if has_interests else None
+            catalog.add_reviewer(row.get("name"), row.get("email"), interests, where=f"satır {reader.line_num}")
+    else:
+        raise CatalogError(["CSV başlığı 'domain,subtopic' ya da 'name,email[,interests]' olmalı"])
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def import_catalog(catalog, replace_interests=True, dry_run=False):
+    """
+    Kataloğu veritabanına yazar (tek transaction). dry_run'da değişiklikler geri alınır.
+    Dönüş: {"domains", "subtopics", "reviewers_created", "reviewers_updated", "interests"}
+    """
+    stats = {"domains": 0, "subtopics": 0, "reviewers_created": 0, "reviewers_updated": 0, "interests": 0}
+    with transaction.atomic():
+        # İlgi alanlarındaki "Alan: Alt başlık" çiftleri de oluşturulacaklara eklenir
+        wanted = {domain: dict(names) for domain, names in catalog.domains.items()}
+        for _, interests in catalog.reviewers.values():
+            for interest in interests or []:
+                if ": " in interest:
+                    domain, name = interest.split(": ", 1)
+                    wanted.setdefault(domain, {})[name] = None
+
+        domain_ids = dict(Domain.objects.filter(name__in=wanted).values_list("name", "id"))
+        new_domains = Domain.objects.bulk_create(Domain(name=name) for name in wanted if name not in domain_ids)
+        domain_ids.update((d.name, d.id) for d in new_domains)
+        stats["domains"] = len(new_domains)
+
+        subtopic_ids = {(domain_id, name): sid for sid, domain_id, name in
+                        Subtopic.objects.values_list("id", "domain_id", "name")}
+        new_subtopics = Subtopic.objects.bulk_create(
+            (Subtopic(domain_id=domain_ids[domain], name=name)
+             for domain, names in wanted.items() for name in names
+             if (domain_ids[domain], name) not in subtopic_ids),
+            batch_size=BATCH_SIZE,
+        )
+        subtopic_ids.update(((s.domain_id, s.name), s.id) for s in new_subtopics)
+        stats["subtopics"] = len(new_subtopics)
+
+        links = _resolve_interests(catalog, domain_ids, subtopic_ids)
+
+        existing = set()
+        for emails in _chunks(catalog.reviewers):
+            existing.update(Reviewer.objects.filter(email__in=emails).values_list("email", flat=True))
+        Reviewer.objects.bulk_create(
+            (Reviewer(name=name, email=email) for email, (name, _) in catalog.reviewers.items()),
+            update_conflicts=True, unique_fields=["email"], update_fields=["name"], batch_size=BATCH_SIZE,
+        )
+        stats["reviewers_created"] = len(catalog.reviewers) - len(existing)
+        stats["reviewers_updated"] = len(existing)
+
+        if links:
+            reviewer_ids = {}
+            for emails in _chunks(links):
+                reviewer_ids.update(Reviewer.objects.filter(email__in=emails).values_list("email", "id"))
+            Interest = Reviewer.interests.through
+            if replace_interests:
+                for ids in _chunks(reviewer_ids[email] for email in links):
+                    Interest.objects.filter(reviewer_id__in=ids).delete()
+            rows = [Interest(reviewer_id=reviewer_ids[email], subtopic_id=subtopic_id)
+                    for email, subtopic_set in links.items() for subtopic_id in subtopic_set]
+            Interest.objects.bulk_create(rows, ignore_conflicts=True, batch_size=BATCH_SIZE)
+            stats["interests"] = len(rows)
+
+        if dry_run:
+            transaction.set_rollback(True)
+        elif new_domains or new_subtopics:
+            # bulk_create post_save sinyali göndermez (bkz. signals.subtopics_changed)
+            transaction.on_commit(invalidate_classifier)
+    return stats
+
+
+def _resolve_interests(catalog, domain_ids, subtopic_ids):
+    """{e-posta: {subtopic_id}}; yalnızca ilgi alanı verilen hakemler. Çözülemeyen ad CatalogError."""
+    by_name = {}
+    for (_, name), sid in subtopic_ids.items():
+        by_name.setdefault(name, []).append(sid)
+    links, errors = {}, []
+    for email, (_, interests) in catalog.reviewers.items():
+        if interests is None:
+            continue
+        resolved = set()
+        for interest in interests:
+            if ": " in interest:
+                domain, name = interest.split(": ", 1)
+                resolved.add(subtopic_ids[(domain_ids[domain], name)])
+                continue
+            matches = by_name.get(interest, [])
+            if len(matches) == 1:
+                resolved.add(matches[0])
+            else:
+                problem = "bulunamadı" if not matches else "birden çok alanda var, 'Alan: Alt başlık' yazın"
+                errors.append(f"{email}: ilgi alanı {interest!r} {problem}")
+        links[email] = resolved
+    if errors:
+        raise CatalogError(errors)
+    return links
@@ -0,0 +1,161 @@
+"""
+Anahtar kelimelerden alt başlık (Subtopic) önerisi.
+
+Tüm alt başlıklar için bir TF-IDF matrisi bir kez hesaplanır ve bellekte
+tutulur. Bir makalenin (ya da bir grup makalenin) anahtar kelimeleri aynı
+uzaya taşınıp tek bir matris çarpımıyla tüm alt başlıklara karşı puanlanır.
+Matris, Subtopic/Domain tabloları değiştiğinde (bkz. signals.py) yeniden
+kurulur.
+"""
+import threading
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .text_utils import extract_terms
+
+DEFAULT_TOP_K = 3
+MIN_SCORE = 0.05
+
+
+class SubtopicClassifier:
+    def __init__(self, subtopic_ids, vocabulary, idf, matrix):
+        self.subtopic_ids = np.asarray(subtopic_ids, dtype=np.int64)
+        self.vocabulary = vocabulary      # terim -> sütun indeksi
+        self.idf = idf                    # (V,)
+        self.matrix = matrix              # (S, V), satırlar L2-normalize
+
+    @classmethod
+    def build(cls, documents):
+        """
+        documents: [(subtopic_id, metin), ...]
+        Her alt başlığın metni; domain adı, alt başlık adı ve (varsa) o alt
+        başlıkla etiketlenmiş makalelerin anahtar kelimelerinden oluşur.
+        """
+        subtopic_ids = [sid for sid, _ in documents]
+        term_counts = [Counter(extract_terms(text)) for _, text in documents]
+
+        vocabulary = {}
+        for counts in term_counts:
+            for term in counts:
+                vocabulary.setdefault(term, len(vocabulary))
+
+        n_docs, n_terms = len(documents), len(vocabulary)
+        tf = np.zeros((n_docs, n_terms), dtype=np.float32)
+        for row, counts in enumerate(term_counts):
+            if counts:
+                cols = np.fromiter((vocabulary[t] for t in counts), dtype=np.int64, count=len(counts))
+                tf[row, cols] = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        matrix = _l2_normalize(_sublinear(tf) * idf)
+        return cls(subtopic_ids, vocabulary, idf, matrix)
+
+    def vectorize(self, texts):
+        """Metinleri (N, V) boyutlu, L2-normalize TF-IDF matrisine dönüştürür."""
+        queries = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            cols = [self.vocabulary[t] for t in extract_terms(text or "") if t in self.vocabulary]
+            if cols:
+                np.add.at(queries[row], cols, 1.0)
+        return _l2_normalize(_sublinear(queries) * self.idf)
+
+    def score(self, texts):
+        """(N, S) kosinüs benzerlik matrisi: tek matris çarpımı."""
+        if not len(self.subtopic_ids):
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        return self.vectorize(texts) @ self.matrix.T
+
+    def top_k(self, texts, k=DEFAULT_TOP_K, min_score=MIN_SCORE):
+        """Her metin için en yüksek puanlı k alt başlık: [[(subtopic_id, puan), ...], ...]"""
+        scores = self.score(texts)
+        if scores.shape[1] == 0:
+            return [[] for _ in texts]
+        k = min(k, scores.shape[1])
+        # argpartition ile önce k aday, sonra sadece onları sıralıyoruz
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, cols in enumerate(candidates):
+            cols = cols[np.argsort(-scores[row, cols])]
+            results.append([
+                (int(self.subtopic_ids[c]), float(scores[row, c]))
+                for c in cols if scores[row, c] >= min_score
+            ])
+        return results
+
+
+def _sublinear(tf):
+    out = np.zeros_like(tf)
+    mask = tf > 0
+    out[mask] = 1.0 + np.log(tf[mask])
+    return out
+
+
+def _l2_normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# --- Süreç içi önbellek ---
+_classifier = None
+_lock = threading.Lock()
+
+
+def _training_documents():
+    from .models import Subtopic, Submission
+
+    training = defaultdict(list)
+    labeled = (
+        Submission.subtopics.through.objects
+        .exclude(submission__extracted_keywords__isnull=True)
+        .exclude(submission__extracted_keywords="")
+        .values_list("subtopic_id", "submission__extracted_keywords")
+    )
+    for subtopic_id, keywords in labeled:
+        training[subtopic_id].append(keywords)
+
+    documents = []
+    for st in Subtopic.objects.select_related("domain").order_by("id"):
+        # Alt başlık adı, domain adından daha ayırt edici olduğu için iki kez
+        parts = [st.domain.name, st.name, st.name] + training.get(st.id, [])
+        documents.append((st.id, " ".join(parts)))
+    return documents
+
+
+def get_classifier():
+    global _classifier
+    clf = _classifier
+    if clf is None:
+        with _lock:
+            if _classifier is None:
+                _classifier = SubtopicClassifier.build(_training_documents())
+            clf = _classifier
+    return clf
+
+
+def invalidate_classifier(**kwargs):
+    """Subtopic/Domain değiştiğinde çağrılır; matris bir sonraki istekte yeniden kurulur."""
+    global _classifier
+    with _lock:
+        _classifier = None
+
+
+def suggest_subtopics_batch(submissions, top_k=DEFAULT_TOP_K):
+    """
+    Birden çok makale için tek çağrıda öneri üretir.
+    Dönüş: {submission.id: [subtopic_id, ...]}
+    """
+    submissions = list(submissions)
+    if not submissions:
+        return {}
+    ranked = get_classifier().top_k([s.extracted_keywords or "" for s in submissions], k=top_k)
+    return {
+        sub.id: [subtopic_id for subtopic_id, _ in row]
+        for sub, row in zip(submissions, ranked)
+    }
+
+
+def suggest_subtopics(submission, top_k=DEFAULT_TOP_K):
+    return suggest_subtopics_batch([submission], top_k=top_k).get(submission.id, [])
@@ -0,0 +1,42 @@
+"""
+SQLite bağlantı profili.
+
+Her yeni SQLite bağlantısında DEFAULT_PRAGMAS (ayarlarda SQLITE_PRAGMAS
+verilmişse o) uygulanır (bkz. signals.py, connection_created). Varsayılan
+profil eş zamanlı worker'lar içindir:
+
+- journal_mode=WAL: okuyucular yazarı, yazar okuyucuları beklemez
+  (kalıcıdır; veritabanı dosyasının yanında -wal/-shm dosyaları oluşur).
+- synchronous=NORMAL: WAL'da commit başına fsync yerine checkpoint'te fsync.
+- busy_timeout: kilit alınamazsa hemen "database is locked" yerine bekle.
+- mmap_size/cache_size: sayfa okumaları için bellek eşlemesi ve önbellek.
+
+Transaction'lar DATABASES OPTIONS'taki transaction_mode=IMMEDIATE ile
+yazma kilidini baştan alır; böylece okuyup sonra yazan iki transaction
+arasında kilit yükseltme çıkmazı (busy_timeout'un bekleyemediği SQLITE_BUSY)
+oluşmaz. Görünümler durum değişikliklerini (Submission + Log) PDF işleme
+bittikten sonra kısa bir transaction.atomic() bloğunda yazar.
+"""
+from django.conf import settings
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,          # ms
+    "mmap_size": 256 * 2 ** 20,     # bayt
+    "cache_size": -64000,           # negatif: KiB (~64 MB)
+    "temp_store": "MEMORY",
+}
+
+
+def sqlite_pragmas():
+    return getattr(settings, "SQLITE_PRAGMAS", DEFAULT_PRAGMAS)
+
+
+def configure_connection(connection):
+    """connection: Django bağlantı sarmalayıcısı; SQLite değilse dokunulmaz."""
+    if connection.vendor != "sqlite":
+        return
+    raw = connection.connection
+    for name, value in sqlite_pragmas().items():
+        raw.execute(f"PRAGMA {name} = {value}")
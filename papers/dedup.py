@@ -0,0 +1,205 @@
+"""
+Mükerrer / çok benzer makale tespiti (MinHash + LSH).
+
+Makale metni kelime 5-gram'larına (shingle) bölünür, her shingle 32 bitlik
+bir hash'e çevrilir ve NUM_PERM adet hash fonksiyonunun minimumları tek bir
+NumPy işlemiyle imzaya dönüştürülür. İmza BANDS banda bölünür; aynı bantta
+aynı değeri taşıyan makaleler aday kabul edilir. Böylece "benzer makaleler"
+sorgusu tüm PDF'lerle karşılaştırma yapmadan, sadece aynı kovadaki adaylara
+bakar.
+"""
+import logging
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from .text_utils import read_pdf_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS     # 8 satırlık bantlarda eşik ~ (1/16)^(1/8) ~ 0.71
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(20250316)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+# Çok büyük belgelerde bellek kullanımını sınırlamak için shingle'lar parça parça işlenir
+_CHUNK = 8192
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+
+
+def minhash(hashes):
+    """Shingle hash'lerinden NUM_PERM uzunluklu uint32 MinHash imzası üretir."""
+    signature = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(hashes), _CHUNK):
+        chunk = hashes[start:start + _CHUNK]
+        # (a*x + b) mod p; a < 2^31, x < 2^32 olduğundan çarpım uint64'e sığar
+        permuted = (_PERM_A[:, None] * chunk[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+        np.minimum(signature, (permuted & _MAX_HASH).min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def compute_signature(pdf_path):
+    """PDF'in MinHash imzası ve shingle sayısı; metin yoksa (None, 0)."""
+    try:
+        text = read_pdf_text(pdf_path)
+    except Exception:
+        logger.exception("PDF metni okunamadı: %s", pdf_path)
+        return None, 0
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None, 0
+    return minhash(hashes), len(hashes)
+
+
+def estimate_similarity(sig_a, sig_b):
+    """İki imza arasındaki tahmini Jaccard benzerliği."""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def band_keys(signature):
+    return [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+class LSHIndex:
+    def __init__(self):
+        self.buckets = defaultdict(set)     # (bant, anahtar) -> {submission_id}
+        self.signatures = {}                # submission_id -> imza
+        self._lock = threading.Lock()
+
+    def add(self, submission_id, signature):
+        with self._lock:
+            self._remove(submission_id)
+            self.signatures[submission_id] = signature
+            for key in band_keys(signature):
+                self.buckets[key].add(submission_id)
+
+    def remove(self, submission_id):
+        with self._lock:
+            self._remove(submission_id)
+
+    def _remove(self, submission_id):
+        old = self.signatures.pop(submission_id, None)
+        if old is not None:
+            for key in band_keys(old):
+                bucket = self.buckets.get(key)
+                if bucket:
+                    bucket.discard(submission_id)
+                    if not bucket:
+                        del self.buckets[key]
+
+    def query(self, signature, threshold=SIMILARITY_THRESHOLD, exclude=None):
+        """Aynı kovayı paylaşan adaylar arasından eşiği geçenler: [(id, benzerlik), ...]"""
+        with self._lock:
+            candidates = set()
+            for key in band_keys(signature):
+                candidates |= self.buckets.get(key, set())
+            candidates.discard(exclude)
+            scored = [(cid, estimate_similarity(signature, self.signatures[cid])) for cid in candidates]
+        return sorted([c for c in scored if c[1] >= threshold], key=lambda c: -c[1])
+
+
+# --- Süreç içi indeks (ilk kullanımda veritabanından yüklenir) ---
+_index = None
+_fingerprint = None
+_index_lock = threading.Lock()
+
+
+def _current_fingerprint():
+    from django.db.models import Count, Max
+    from .models import SubmissionSignature
+
+    agg = SubmissionSignature.objects.aggregate(count=Count('id'), latest=Max('created_at'))
+    return agg['count'], agg['latest']
+
+
+def _load(index, rows):
+    for submission_id, raw in rows.iterator(chunk_size=2000):
+        index.add(submission_id, np.frombuffer(bytes(raw), dtype=np.uint32))
+
+
+def get_index():
+    """
+    İndeksi döndürür. Diğer süreçlerde (başka bir worker, backfill_signatures)
+    yazılan imzalar tek bir aggregate sorgusuyla fark edilir: yeni/güncellenen
+    satırlar eklenir, silinen varsa indeks baştan yüklenir.
+    """
+    global _index, _fingerprint
+    fingerprint = _current_fingerprint()
+    if _index is not None and fingerprint == _fingerprint:
+        return _index
+    with _index_lock:
+        if _index is not None and fingerprint == _fingerprint:
+            return _index
+        from .models import SubmissionSignature
+
+        rows = SubmissionSignature.objects.values_list('submission_id', 'minhash')
+        count, latest = fingerprint
+        index = _index
+        if index is not None and _fingerprint[1] is not None:
+            # created_at auto_now: güncellenen imzalar da bu aralığa düşer
+            _load(index, rows.filter(created_at__gte=_fingerprint[1]))
+        if index is None or len(index.signatures) != count:
+            index = LSHIndex()
+            _load(index, rows)
+        _index, _fingerprint = index, fingerprint
+    return _index
+
+
+def store_signature(submission, signature, shingle_count):
+    from .models import SubmissionSignature
+
+    SubmissionSignature.objects.update_or_create(
+        submission=submission,
+        defaults={'minhash': signature.tobytes(), 'shingle_count': shingle_count},
+    )
+    get_index().add(submission.id, signature)
+
+
+def find_similar(submission, threshold=SIMILARITY_THRESHOLD):
+    """Makaleye benzeyen diğer makaleler: [(Submission, benzerlik), ...]"""
+    from .models import Submission
+
+    index = get_index()
+    signature = index.signatures.get(submission.id)
+    if signature is None:
+        return []
+    matches = index.query(signature, threshold=threshold, exclude=submission.id)
+    found = Submission.objects.in_bulk([sid for sid, _ in matches])
+    for sid, _ in matches:
+        if sid not in found:
+            # Silinmiş makalenin imzası bellekte kalmış olabilir
+            index.remove(sid)
+    return [(found[sid], score) for sid, score in matches if sid in found]
+
+
+def index_submission(submission):
+    """
+    Yükleme/revizyon sonrası çağrılır: güncel PDF'in imzasını hesaplar, indekse
+    ekler ve benzer makaleleri döndürür.
+    """
+    pdf = submission.revised_pdf or submission.original_pdf
+    if not pdf:
+        return []
+    signature, shingle_count = compute_signature(pdf.path)
+    if signature is None:
+        return []
+    store_signature(submission, signature, shingle_count)
+    return find_similar(submission)
@@ -0,0 +1,154 @@
+"""
+Raporlama için akış hâlinde dışa aktarma: makaleler, anonimleştirme bölgeleri
+ve loglar; CSV ya da JSONL.
+
+Satırlar .iterator(chunk_size=...) ile okunur ve üretildikçe yazılır; bellek
+kullanımı tablo boyutundan bağımsızdır. anonymized_data makale başına ayrı
+ayrı çözülür. Aynı üreticiyi export_view (StreamingHttpResponse) ve
+export_data komutu kullanır.
+"""
+import csv
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from .bulk import select_submissions
+from .models import Log
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson; charset=utf-8"}
+CHUNK_SIZE = 2000
+# anonymized_data büyük olabilir: bölge dökümünde daha küçük okuma parçası
+REGION_CHUNK_SIZE = 200
+# HTTP yanıtında satırlar bu boyutta parçalar hâlinde gönderilir
+WRITE_BUFFER = 64 * 1024
+
+SUBMISSION_FIELDS = ["id", "tracking_number", "status", "reviewer", "reviewer_email", "keywords",
+                     "timestamp", "updated_at", "final_sent", "restored"]
+REGION_FIELDS = ["submission_id", "tracking_number", "index", "page", "category", "text", "cipher",
+                 "x0", "y0", "x1", "y1"]
+LOG_FIELDS = ["id", "submission_id", "tracking_number", "action", "timestamp", "details"]
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def submission_rows(status=None, since=None, until=None):
+    rows = (select_submissions(status=status, submitted_after=since, submitted_before=until)
+            .order_by("id")
+            .values_list("id", "tracking_number", "status", "reviewer__name", "reviewer__email",
+                         "extracted_keywords", "timestamp", "updated_at", "final_sent", "restored"))
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(SUBMISSION_FIELDS, row))
+
+
+def region_rows(status=None, since=None, until=None, include_text=True):
+    """Her anonimleştirme bölgesi bir satır; include_text=False ise orijinal metin boş bırakılır."""
+    rows = (select_submissions(status=status, submitted_after=since, submitted_before=until)
+            .exclude(anonymized_data__isnull=True).exclude(anonymized_data="")
+            .order_by("id")
+            .values_list("id", "tracking_number", "anonymized_data"))
+    for submission_id, tracking_number, data in rows.iterator(chunk_size=REGION_CHUNK_SIZE):
+        try:
+            regions = json.loads(data)
+        except ValueError:
+            logger.warning("Anonimleştirme bilgisi okunamadı: %s", tracking_number)
+            continue
+        for index, region in enumerate(regions):
+            x0, y0, x1, y1 = region.get("rect") or (None, None, None, None)
+            yield {
+                "submission_id": submission_id,
+                "tracking_number": tracking_number,
+                "index": index,
+                "page": region.get("page"),
+                "category": region.get("category"),
+                "text": region.get("text") if include_text else None,
+                "cipher": region.get("cipher"),
+                "x0": x0, "y0": y0, "x1": x1, "y1": y1,
+            }
+
+
+def log_rows(status=None, since=None, until=None):
+    """since/until makale değil log tarihine uygulanır (yerel gün, dahil)."""
+    logs = Log.objects.all()
+    if status:
+        logs = logs.filter(submission__status=status)
+    # __date yerine aralık: Log.timestamp indeksi kullanılır
+    if since:
+        logs = logs.filter(timestamp__gte=_day_start(since))
+    if until:
+        logs = logs.filter(timestamp__lt=_day_start(until + timedelta(days=1)))
+    rows = logs.order_by("id").values_list(
+        "id", "submission_id", "submission__tracking_number", "action", "timestamp", "details",
+    )
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        record = dict(zip(LOG_FIELDS, row))
+        record["details"] = json.loads(record["details"]) if record["details"] else None
+        yield record
+
+
+DATASETS = {
+    "submissions": (SUBMISSION_FIELDS, submission_rows),
+    "regions": (REGION_FIELDS, region_rows),
+    "logs": (LOG_FIELDS, log_rows),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class _Echo:
+    """csv.writer'ın yazdığı satırı döndüren dosya benzeri nesne."""
+    def write(self, value):
+        return value
+
+
+def csv_lines(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[field]) for field in fields])
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def export_lines(dataset, fmt, **filters):
+    """dataset ("submissions", "regions", "logs") satırlarını fmt biçiminde metin satırları olarak üretir."""
+    fields, rows = DATASETS[dataset]
+    rows = rows(**filters)
+    return csv_lines(fields, rows) if fmt == "csv" else jsonl_lines(rows)
+
+
+def export_chunks(dataset, fmt, **filters):
+    """export_lines'ı WRITE_BUFFER boyutunda bayt parçalarına toplar (StreamingHttpResponse için)."""
+    buffer, size = [], 0
+    for line in export_lines(dataset, fmt, **filters):
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= WRITE_BUFFER:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
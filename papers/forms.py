@@ -33,6 +33,9 @@ class StatusForm(forms.Form):
 # papers/forms.py
 from django import forms
 
+from .bulk import OPERATIONS, parse_tracking_numbers
+from .models import STATUS_CHOICES, Reviewer
+
 class ReviewForm(forms.Form):
     review_text = forms.CharField(
         label='Değerlendirme Notları',
@@ -58,4 +61,50 @@ class ReplyForm(forms.Form):
 class AnonymizeOptionsForm(forms.Form):
     anonymize_name = forms.BooleanField(required=False, label="Yazar Ad-Soyad")
     anonymize_contact = forms.BooleanField(required=False, label="Yazar İletişim Bilgileri")
-    anonymize_institution = forms.BooleanField(required=False, label="Yazar Kurum Bilgileri")
\ No newline at end of file
+    anonymize_institution = forms.BooleanField(required=False, label="Yazar Kurum Bilgileri")
+
+class BulkSelectionForm(forms.Form):
+    # "Düzenlenmiş" (kısmi restore) STATUS_CHOICES'ta yok ama kullanılıyor
+    status = forms.ChoiceField(label='Statü', required=False,
+                               choices=[('', 'Tümü'), *STATUS_CHOICES, ('Düzenlenmiş', 'Düzenlenmiş')])
+    tracking_numbers = forms.CharField(
+        label='Takip Numaraları', required=False,
+        widget=forms.Textarea(attrs={'rows': 3, 'placeholder': 'Boşluk, virgül veya satır sonuyla ayırın (boş: tümü)'})
+    )
+    submitted_after = forms.DateField(label='Gönderim (başlangıç)', required=False,
+                                      widget=forms.DateInput(attrs={'type': 'date'}))
+    submitted_before = forms.DateField(label='Gönderim (bitiş)', required=False,
+                                       widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def clean_tracking_numbers(self):
+        return parse_tracking_numbers(self.cleaned_data.get('tracking_numbers') or '')
+
+    def selection(self):
+        """bulk.select_submissions argümanları."""
+        return {name: self.cleaned_data.get(name)
+                for name in ('status', 'tracking_numbers', 'submitted_after', 'submitted_before')}
+
+
+class BulkOperationForm(BulkSelectionForm):
+    operation = forms.ChoiceField(label='İşlem', choices=OPERATIONS)
+    reviewer = forms.ModelChoiceField(queryset=Reviewer.objects.order_by('name'), label='Atanacak Hakem',
+                                      required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get('operation') == 'assign_reviewer' and not cleaned.get('reviewer'):
+            self.add_error('reviewer', "Hakeme atama için bir hakem seçiniz.")
+        return cleaned
+
+
+class CatalogImportForm(forms.Form):
+    catalog_file = forms.FileField(label='Katalog Dosyası (CSV veya JSON)')
+    merge_interests = forms.BooleanField(
+        required=False, label='Mevcut ilgi alanlarını koru (dosyadakileri ekle)'
+    )
+
+    def clean_catalog_file(self):
+        catalog_file = self.cleaned_data.get('catalog_file')
+        if catalog_file and not catalog_file.name.lower().endswith(('.csv', '.json')):
+            raise forms.ValidationError("Sadece CSV veya JSON yükleyebilirsiniz.")
+        return catalog_file
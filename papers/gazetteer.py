@@ -0,0 +1,158 @@
+"""
+Bilinen isim / e-posta / kurum listesi (KnownIdentifier) için çoklu desen eşleştirici.
+
+Tüm kayıtlar tek bir Aho-Corasick otomatına derlenir; sayfa metni desen
+sayısından bağımsız olarak tek geçişte taranır ve sadece kelime sınırında
+eşleşen değerler için page.search_for çağrılır. Otomat süreç başına önbelleklenir; tablo değiştiğinde
+(sinyal veya kayıt sayısı/son güncelleme parmak izi) yeniden derlenir.
+"""
+import hashlib
+import re
+import threading
+from collections import deque
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text):
+    """Büyük/küçük harf ve satır sonu farklarını yok sayar (page.search_for gibi)."""
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+class Automaton:
+    """
+    Saf Python Aho-Corasick. Geçişler tek bir {(durum, karakter): durum}
+    sözlüğünde tutulur; on binlerce desende bile durum başına ayrı sözlük
+    açılmaz.
+    """
+
+    def __init__(self, patterns):
+        self.goto = {}
+        self.fail = [0]
+        self.out = {}                   # durum -> (desen indeksleri)
+        self.lengths = [len(p) for p in patterns]
+
+        children = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto.get((state, ch))
+                if nxt is None:
+                    nxt = len(self.fail)
+                    self.goto[(state, ch)] = nxt
+                    self.fail.append(0)
+                    children.append([])
+                    children[state].append((ch, nxt))
+                state = nxt
+            if pattern:
+                self.out[state] = self.out.get(state, ()) + (index,)
+
+        # Genişlik öncelikli: hata bağlantıları ve çıktıların birleştirilmesi
+        queue = deque(child for _, child in children[0])
+        while queue:
+            state = queue.popleft()
+            for ch, child in children[state]:
+                queue.append(child)
+                f = self.fail[state]
+                while f and (f, ch) not in self.goto:
+                    f = self.fail[f]
+                target = self.goto.get((f, ch), 0)
+                self.fail[child] = target
+                if target in self.out:
+                    self.out[child] = self.out.get(child, ()) + self.out[target]
+
+    def iter_matches(self, text):
+        """(başlangıç, bitiş, desen_indeksi) üçlüleri üretir."""
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto.get((state, ch))
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto.get((state, ch))
+            state = nxt or 0
+            if state in out:
+                for index in out[state]:
+                    yield i + 1 - lengths[index], i + 1, index
+
+
+class Gazetteer:
+    def __init__(self, entries):
+        """entries: [(kind, value), ...] (sıra korunur)"""
+        self.entries = []
+        patterns, seen = [], {}
+        for kind, value in entries:
+            key = normalize(value)
+            if not key or (kind, key) in seen:
+                continue
+            seen[(kind, key)] = len(self.entries)
+            self.entries.append((kind, value))
+            patterns.append(key)
+        self.automaton = Automaton(patterns)
+        # İçerik özeti: bu listeyle yapılmış analizleri (DocumentAnalysis) tanımak için
+        digest = hashlib.sha256()
+        for kind, value in self.entries:
+            digest.update(f"{kind}\0{normalize(value)}\n".encode("utf-8"))
+        self.version = digest.hexdigest()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def find(self, text):
+        """
+        Metinde kelime olarak geçen kayıtlar: [(kind, value), ...] (tablo
+        sırasıyla, tekrarsız). "Ali" "Alignment" içinde, "MIT" "submitted"
+        içinde eşleşmez.
+        """
+        if not self.entries or not text:
+            return []
+        text = normalize(text)
+        found = {index for start, end, index in self.automaton.iter_matches(text)
+                 if is_word_bounded(text, start, end)}
+        return [self.entries[i] for i in sorted(found)]
+
+
+def is_word_bounded(text, start, end):
+    """text[start:end] iki yanında da bir kelimenin ortasında değil mi?"""
+    if start > 0 and text[start - 1].isalnum() and text[start].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum() and text[end - 1].isalnum():
+        return False
+    return True
+
+
+# --- Süreç içi önbellek (KnownIdentifier tablosundan) ---
+_gazetteer = None
+_fingerprint = None
+_lock = threading.Lock()
+
+
+def _current_fingerprint():
+    from django.db.models import Count, Max
+    from .models import KnownIdentifier
+
+    agg = KnownIdentifier.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return agg['count'], agg['latest']
+
+
+def get_gazetteer():
+    """
+    Derlenmiş otomatı döndürür. Diğer süreçlerde (ör. başka bir worker) yapılan
+    değişiklikler tek bir aggregate sorgusuyla fark edilir.
+    """
+    global _gazetteer, _fingerprint
+    fingerprint = _current_fingerprint()
+    if _gazetteer is None or fingerprint != _fingerprint:
+        with _lock:
+            if _gazetteer is None or fingerprint != _fingerprint:
+                from .models import KnownIdentifier
+
+                rows = KnownIdentifier.objects.order_by('id').values_list('kind', 'value')
+                _gazetteer = Gazetteer(rows.iterator(chunk_size=5000))
+                _fingerprint = fingerprint
+    return _gazetteer
+
+
+def invalidate_gazetteer(**kwargs):
+    global _gazetteer
+    _gazetteer = None
@@ -0,0 +1,229 @@
+"""
+Makale iş akışı için yük testi istemcisi (yalnızca standart kütüphane).
+
+Her sanal kullanıcı kendi çerez kavanozuyla gerçek URL'leri sırayla çağırır:
+yükleme -> anahtar kelimeler -> anonimleştirme -> hakem atama ->
+değerlendirme -> final -> durum sorgulama. CSRF belirteci csrftoken
+çerezinden okunup formlara eklenir; yönlendirmeler izlenmez (302 başarı
+sayılır, hedef sayfanın süresi ölçüme karışmaz).
+
+Recorder uç nokta bazında gecikmeleri ve hataları toplar; 500 yanıtlarında
+"database is locked" geçiyorsa SQLite kilit hatası olarak ayrıca sayılır
+(gövde yalnızca DEBUG=True iken hata metnini içerir).
+"""
+import http.cookiejar
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+TRACKING_REGEX = re.compile(r'Takip numaranız: <strong>([^<]+)</strong>')
+SUBTOPIC_REGEX = re.compile(r'<select name="chosen_subtopics".*?</select>', re.S)
+REVIEWER_REGEX = re.compile(r'<select name="reviewer_id".*?</select>', re.S)
+OPTION_REGEX = re.compile(r'<option value="(\d+)"')
+STATUS_REGEX = re.compile(r'<strong>Durum:</strong> ([^<]+)</p>')
+LOCK_MARKER = b"database is locked"
+
+
+def percentile(sorted_values, q):
+    """En yakın sıra yöntemi; sorted_values artan sırada olmalı."""
+    if not sorted_values:
+        return None
+    index = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}     # uç nokta -> [saniye]
+        self.errors = {}        # uç nokta -> adet
+        self.lock_errors = 0
+        self.workflows = 0
+        self.failed_workflows = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint, seconds, ok, locked=False):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            if locked:
+                self.lock_errors += 1
+
+    def workflow_done(self, ok):
+        with self._lock:
+            if ok:
+                self.workflows += 1
+            else:
+                self.failed_workflows += 1
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        total = 0
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            total += len(values)
+            endpoints[endpoint] = {
+                "count": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(values) / elapsed, 2) if elapsed else None,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1],
+            }
+        return {
+            "elapsed": round(elapsed, 3),
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else None,
+            "workflows": self.workflows,
+            "failed_workflows": self.failed_workflows,
+            "workflows_per_minute": round(self.workflows * 60 / elapsed, 2) if elapsed else None,
+            "lock_errors": self.lock_errors,
+            "endpoints": endpoints,
+        }
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class WorkflowError(Exception):
+    pass
+
+
+class Client:
+    """Tek bir sanal kullanıcı (oturum çerezleri ve CSRF belirteci ayrı)."""
+
+    def __init__(self, base_url, recorder, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect(),
+        )
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, endpoint, path, data=None, files=None):
+        """(durum kodu, gövde) döndürür; süre endpoint etiketiyle kaydedilir."""
+        headers = {}
+        body = None
+        if data is not None or files:
+            fields = dict(data or {})
+            fields["csrfmiddlewaretoken"] = self.csrf_token()
+            if files:
+                body, content_type = encode_multipart(fields, files)
+            else:
+                body = urllib.parse.urlencode(fields, doseq=True).encode()
+                content_type = "application/x-www-form-urlencoded"
+            headers["Content-Type"] = content_type
+            headers["X-CSRFToken"] = fields["csrfmiddlewaretoken"]
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as resp:
+                status, content = resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            status, content = e.code, e.read()
+        except (urllib.error.URLError, OSError):
+            status, content = 0, b""
+        elapsed = time.perf_counter() - start
+
+        locked = status >= 500 and LOCK_MARKER in content
+        self.recorder.record(endpoint, elapsed, ok=0 < status < 400, locked=locked)
+        return status, content
+
+    def get(self, endpoint, path):
+        return self.request(endpoint, path)
+
+    def post(self, endpoint, path, data, files=None):
+        return self.request(endpoint, path, data=data or {}, files=files)
+
+
+def encode_multipart(fields, files):
+    """files: {alan: (dosya_adı, bayt, içerik_türü)}"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            parts.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{item}\r\n'.encode()
+            )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def run_workflow(client, urls, pdf_name, pdf_bytes, email, polls=3, subtopics=2, rng=None):
+    """
+    Bir makaleyi yüklemeden finale kadar götürür.
+    urls: {url_adı: callable(tracking_number) veya yol}
+    """
+    status, _ = client.get("GET upload_paper", urls["upload_paper"])
+    if status != 200:
+        raise WorkflowError(f"yükleme formu: {status}")
+    status, body = client.post(
+        "POST upload_paper", urls["upload_paper"], {"email": email},
+        files={"pdf_file": (pdf_name, pdf_bytes, "application/pdf")},
+    )
+    match = TRACKING_REGEX.search(body.decode("utf-8", "replace"))
+    if status != 200 or not match:
+        raise WorkflowError(f"yükleme: {status}")
+    tracking = match.group(1)
+
+    client.get("GET extract_keywords", urls["extract_keywords_view"](tracking))
+    status, _ = client.post("POST anonymize", urls["anonymize_view"](tracking), {
+        "anonymize_name": "on", "anonymize_contact": "on", "anonymize_institution": "on",
+    })
+    if status >= 400:
+        raise WorkflowError(f"anonimleştirme: {status}")
+
+    assign = urls["assign_reviewer"](tracking)
+    status, body = client.get("GET assign_reviewer", assign)
+    select = SUBTOPIC_REGEX.search(body.decode("utf-8", "replace"))
+    subtopic_ids = OPTION_REGEX.findall(select.group(0)) if select else []
+    if not subtopic_ids:
+        raise WorkflowError("alt başlık yok (seed_loadtest çalıştırıldı mı?)")
+    chosen = rng.sample(subtopic_ids, min(subtopics, len(subtopic_ids))) if rng else subtopic_ids[:subtopics]
+    status, body = client.post("POST assign_reviewer step=1", assign, {"step": "1", "chosen_subtopics": chosen})
+    select = REVIEWER_REGEX.search(body.decode("utf-8", "replace"))
+    reviewer_ids = OPTION_REGEX.findall(select.group(0)) if select else []
+    if not reviewer_ids:
+        raise WorkflowError("seçilen alt başlıklarda hakem yok")
+    reviewer = rng.choice(reviewer_ids) if rng else reviewer_ids[0]
+    status, _ = client.post("POST assign_reviewer step=2", assign, {
+        "step": "2", "chosen_subtopics": chosen, "reviewer_id": reviewer,
+    })
+    if status >= 400:
+        raise WorkflowError(f"hakem atama: {status}")
+
+    client.post("POST review", urls["review_view"](tracking), {
+        "review_text": "Yük testi değerlendirmesi: yöntem yeterli, sonuçlar tutarlı.",
+    })
+    client.post("POST finalize", urls["finalize_view"](tracking), {})
+
+    final = False
+    for _ in range(polls):
+        status, body = client.post("POST status", urls["status"], {"tracking_number": tracking, "email": email})
+        match = STATUS_REGEX.search(body.decode("utf-8", "replace"))
+        final = final or (match is not None and match.group(1).strip() == "Final")
+    return tracking, final
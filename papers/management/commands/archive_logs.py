@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from papers.retention import archive_dir, archive_logs, retention_days
+
+
+class Command(BaseCommand):
+    help = (
+        "Saklama süresinden (LOG_RETENTION_DAYS) eski Log satırlarını aylık gzip JSONL "
+        "segmentlerine taşır, gün/makale/işlem türü sayımlarını LogRollup'a ekler ve "
+        "satırları tablodan siler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Bu günden eski kayıtlar (varsayılan: LOG_RETENTION_DAYS)")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help="Yalnızca arşivlenecek satırları say")
+
+    def handle(self, *args, **opts):
+        days = retention_days() if opts['days'] is None else opts['days']
+        stats = archive_logs(days=days, batch_size=opts['batch_size'], dry_run=opts['dry_run'])
+        if opts['dry_run']:
+            self.stdout.write(f"{stats['rows']} satır {days} günden eski ({stats['cutoff']} öncesi).")
+            return
+        for month, count in sorted(stats['segments'].items()):
+            self.stdout.write(f"  {month}: {count} satır")
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['rows']} satır {archive_dir()} altına arşivlendi, "
+            f"{stats['rollups']} rollup güncellemesi."
+        ))
@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from papers.analysis import file_hash
+from papers.models import KeywordExtraction, Submission, version_bump
+from papers.nlp_utils import extract_keywords_from_pdf_advanced
+from papers.pipeline import keyword_mode, store_keywords
+from papers.search import index_submission_fields
+
+
+def _keywords_job(item):
+    digest, path, mode = item
+    return digest, extract_keywords_from_pdf_advanced(path, mode=mode)
+
+
+class Command(BaseCommand):
+    help = (
+        "Anahtar kelimesi olmayan makaleler için anahtar kelimeleri paralel çıkarır. "
+        "Aynı içerikli PDF'ler (dosya özeti) bir kez işlenir, önbellekteki sonuçlar yeniden kullanılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--all', action='store_true', help="Mevcut anahtar kelimeleri de yeniden yaz")
+        parser.add_argument('--mode', choices=['nlp', 'fast'], default=None)
+
+    def handle(self, *args, **opts):
+        mode = opts['mode'] or keyword_mode()
+        subs = Submission.objects.all()
+        if not opts['all']:
+            subs = subs.filter(extracted_keywords__isnull=True) | subs.filter(extracted_keywords='')
+
+        targets = {}    # submission -> özet
+        paths = {}      # özet -> dosya yolu
+        for sub in subs.only('id', 'original_pdf', 'revised_pdf', 'extracted_keywords', 'review').iterator():
+            pdf = sub.revised_pdf or sub.original_pdf
+            if pdf and os.path.exists(pdf.path):
+                digest = file_hash(pdf.path)
+                targets[sub] = digest
+                paths.setdefault(digest, pdf.path)
+
+        results = {
+            row.file_hash: row.get_keywords()
+            for row in KeywordExtraction.objects.filter(file_hash__in=list(paths), mode=mode)
+        }
+        missing = [(digest, path, mode) for digest, path in paths.items() if digest not in results]
+        self.stdout.write(f"{len(targets)} makale, {len(paths)} farklı PDF, {len(missing)} tanesi önbellekte yok.")
+
+        with ProcessPoolExecutor(max_workers=opts['workers']) as pool:
+            for digest, keywords in pool.map(_keywords_job, missing, chunksize=2):
+                store_keywords(digest, mode, keywords)
+                results[digest] = keywords
+
+        updated = []
+        for sub, digest in targets.items():
+            keywords = results.get(digest)
+            if keywords:
+                sub.extracted_keywords = ", ".join(keywords)
+                for field, value in version_bump().items():
+                    setattr(sub, field, value)
+                updated.append(sub)
+        Submission.objects.bulk_update(updated, ['extracted_keywords', 'version', 'updated_at'], batch_size=500)
+        # bulk_update sinyal tetiklemez; arama indeksini ayrıca güncelle
+        for sub in updated:
+            index_submission_fields(sub)
+        self.stdout.write(self.style.SUCCESS(f"{len(updated)} makalenin anahtar kelimeleri yazıldı."))
@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from papers.dedup import compute_signature
+from papers.models import Submission, SubmissionSignature
+
+
+def _signature_job(item):
+    submission_id, path = item
+    signature, shingle_count = compute_signature(path)
+    return submission_id, signature, shingle_count
+
+
+class Command(BaseCommand):
+    help = "İmzası olmayan makalelerin MinHash imzalarını paralel olarak hesaplar ve kaydeder."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--all', action='store_true', help="Mevcut imzaları da yeniden hesapla")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **opts):
+        subs = Submission.objects.all()
+        if not opts['all']:
+            subs = subs.filter(signature__isnull=True)
+
+        items = []
+        for sub in subs.only('id', 'original_pdf', 'revised_pdf').iterator():
+            pdf = sub.revised_pdf or sub.original_pdf
+            if pdf and os.path.exists(pdf.path):
+                items.append((sub.id, pdf.path))
+
+        done = 0
+        batch = []
+        with ProcessPoolExecutor(max_workers=opts['workers']) as pool:
+            for submission_id, signature, shingle_count in pool.map(_signature_job, items, chunksize=4):
+                if signature is None:
+                    continue
+                batch.append(SubmissionSignature(
+                    submission_id=submission_id,
+                    minhash=signature.tobytes(),
+                    shingle_count=shingle_count,
+                ))
+                if len(batch) >= opts['batch_size']:
+                    done += self._flush(batch)
+                    batch = []
+        done += self._flush(batch)
+        self.stdout.write(self.style.SUCCESS(f"{done} makale imzası kaydedildi ({len(items)} PDF tarandı)."))
+
+    def _flush(self, batch):
+        if batch:
+            SubmissionSignature.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=['submission'],
+                update_fields=['minhash', 'shingle_count', 'created_at'],
+            )
+        return len(batch)
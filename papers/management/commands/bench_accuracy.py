@@ -0,0 +1,170 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+import fitz  # PyMuPDF
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from papers.accuracy import CATEGORIES, empty_counts, load_ground_truth, score_document, summarize
+from papers.analysis import analyze_document
+from papers.anonymization import anonymize_pdf
+from papers.gazetteer import Gazetteer, get_gazetteer
+from papers.nlp_utils import get_nlp
+from papers.prefilter import MODE_NER, MODE_REGEX
+from papers.synthetic import PaperSpec, generate_paper
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# Anonimleştirici modları -> analyze_document(mode=...)
+MODES = {
+    "ner": MODE_NER,        # her sayfada NER
+    "prefilter": None,      # sayfa sınıflandırıcısının kararı (varsayılan akış)
+    "regex": MODE_REGEX,    # NER yok: regex + bilinen tanımlayıcılar
+}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # Linux'ta KB, macOS'ta bayt
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+def _run_mode(mode, corpus, use_db_gazetteer, output_dir):
+    """Ayrı bir süreçte çalışır; tepe bellek ölçümü modlar arasında karışmasın."""
+    gazetteer = get_gazetteer() if use_db_gazetteer else Gazetteer([])
+    if MODES[mode] != MODE_REGEX:
+        # Model yükleme süresi ölçüme girmez (belleğe girer)
+        get_nlp()
+
+    counts = empty_counts()
+    missed, pages, elapsed = {}, 0, 0.0
+    for name, path, truth in corpus:
+        output = os.path.join(output_dir, f"{mode}_{os.path.basename(path)}")
+        with fitz.open(path) as doc:
+            start = time.perf_counter()
+            analysis = analyze_document(doc, gazetteer=gazetteer, mode=MODES[mode])
+            regions = anonymize_pdf(path, output, analysis=analysis, gazetteer=gazetteer)
+            elapsed += time.perf_counter() - start
+            pages += len(doc)
+            _, doc_missed = score_document(doc, truth, regions, counts)
+        if doc_missed:
+            missed[name] = doc_missed
+    return {
+        "mode": mode,
+        "pages": pages,
+        "seconds": round(elapsed, 4),
+        "pages_per_second": round(pages / elapsed, 2) if elapsed else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "categories": summarize(counts),
+        "missed": missed,
+    }
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.3f}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Etiketli derlem (sentetik makaleler + örnek makaleler) üzerinde her anonimleştirici "
+        "modu için kategori bazında precision/recall, sayfa/saniye ve tepe bellek (RSS) raporlar. "
+        "Daha hızlı bir mod, recall referans moddakinin altına düşmüyorsa kabul edilebilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=",".join(MODES))
+        parser.add_argument('--reference', default='ner', help="Recall karşılaştırmasının yapıldığı mod")
+        parser.add_argument('--sizes', default='4,16', help="Sentetik makale sayfa sayıları")
+        parser.add_argument('--languages', default='en,tr')
+        parser.add_argument('--seeds', type=int, default=3, help="Her boyut/dil için farklı tohumlu makale sayısı")
+        parser.add_argument('--samples', default=os.path.join(settings.MEDIA_ROOT, 'uploads'),
+                            help="ground_truth.json'daki örnek makalelerin bulunduğu klasör ('' = kullanma)")
+        parser.add_argument('--db-gazetteer', action='store_true',
+                            help="KnownIdentifier tablosunu kullan (varsayılan: boş; örnek isimler tabloda olabilir)")
+        parser.add_argument('--tolerance', type=float, default=0.0,
+                            help="Referansa göre kabul edilen recall düşüşü (0.02 = 2 puan)")
+        parser.add_argument('--output', help="Sonuç JSON dosyası")
+        parser.add_argument('--fail-on-recall-drop', action='store_true')
+
+    def handle(self, *args, **opts):
+        modes = [m for m in opts['modes'].split(',') if m]
+        unknown = [m for m in modes if m not in MODES]
+        if unknown:
+            raise CommandError(f"Bilinmeyen mod: {', '.join(unknown)} (seçenekler: {', '.join(MODES)})")
+
+        with tempfile.TemporaryDirectory(prefix='bench_accuracy_') as tmp:
+            corpus = self.build_corpus(tmp, opts)
+            self.stderr.write(f"Derlem: {len(corpus)} makale")
+
+            results = {}
+            context = multiprocessing.get_context("spawn")
+            for mode in modes:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=django.setup) as pool:
+                    results[mode] = pool.submit(_run_mode, mode, corpus, opts['db_gazetteer'], tmp).result()
+
+        drops = self.report(results, opts['reference'], opts['tolerance'])
+        if opts['output']:
+            with open(opts['output'], 'w', encoding='utf-8') as f:
+                json.dump({"corpus": len(corpus), "results": results}, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Sonuçlar yazıldı: {opts['output']}")
+        if drops and opts['fail_on_recall_drop']:
+            raise CommandError(f"Recall düşüşü: {', '.join(drops)}")
+
+    def build_corpus(self, tmp, opts):
+        corpus = []     # [(ad, yol, etiketler)]
+        sizes = [int(s) for s in opts['sizes'].split(',') if s]
+        for lang in [lang for lang in opts['languages'].split(',') if lang]:
+            for pages in sizes:
+                for seed in range(opts['seeds']):
+                    spec = PaperSpec(pages=pages, language=lang, seed=seed)
+                    name = f"{spec.label()}-s{seed}"
+                    paper = generate_paper(os.path.join(tmp, f"{name}.pdf"), spec)
+                    corpus.append((name, paper.path, paper.truth))
+
+        if opts['samples']:
+            for filename, truth in load_ground_truth().items():
+                path = os.path.join(opts['samples'], filename)
+                if os.path.exists(path):
+                    corpus.append((filename, path, truth))
+                else:
+                    self.stderr.write(f"Örnek makale bulunamadı, atlandı: {path}")
+        return corpus
+
+    def report(self, results, reference, tolerance):
+        header = f"{'mod':<10} {'kategori':<12} {'precision':>9} {'recall':>7} {'etiket':>7} {'bölge':>6}"
+        self.stdout.write(header)
+        drops = []
+        ref = results.get(reference)
+        for mode, result in results.items():
+            for category in CATEGORIES:
+                stats = result["categories"][category]
+                flag = ""
+                if ref is not None and mode != reference:
+                    ref_recall = ref["categories"][category]["recall"]
+                    if stats["recall"] is not None and ref_recall is not None \
+                            and stats["recall"] < ref_recall - tolerance:
+                        flag = "  RECALL DÜŞTÜ"
+                        drops.append(f"{mode}/{category}")
+                self.stdout.write(
+                    f"{mode:<10} {category:<12} {_fmt(stats['precision']):>9} {_fmt(stats['recall']):>7} "
+                    f"{stats['truth']:>7} {stats['predicted']:>6}{flag}"
+                )
+            rss = result["peak_rss_mb"]
+            self.stdout.write(
+                f"{mode:<10} {result['pages']} sayfa, {result['seconds']:.2f} sn, "
+                f"{result['pages_per_second']} sayfa/sn, tepe RSS {rss if rss is not None else '-'} MB, "
+                f"kaçırılan etiket: {sum(len(v) for v in result['missed'].values())}"
+            )
+        style = self.style.ERROR if drops else self.style.SUCCESS
+        self.stdout.write(style(f"{len(drops)} kategoride recall düşüşü (referans: {reference})."))
+        return drops
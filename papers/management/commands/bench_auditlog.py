@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from papers import audit
+from papers.models import Log, Submission
+
+MODES = ("create", "buffered", "transaction")
+
+
+class Command(BaseCommand):
+    help = (
+        "Log yazma yollarını geçici bir veritabanında karşılaştırır: "
+        "create (çağrı başına Log.objects.create), buffered (audit.log, autocommit; "
+        "boyut/yaş sınırıyla bulk_create), transaction (tek transaction içinde audit.log; "
+        "commit'te tek bulk_create). Satır/sn ve yazılan satırların sırası raporlanır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--modes', default=",".join(MODES))
+        parser.add_argument('--repeat', type=int, default=3, help="Her mod için tekrar (en iyisi raporlanır)")
+        parser.add_argument('--output', help="Sonuç JSON dosyası")
+
+    def handle(self, *args, **opts):
+        modes = opts['modes'].split(",")
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Bilinmeyen mod: {', '.join(sorted(unknown))}")
+
+        connection = connections["default"]
+        original_name = connection.settings_dict["NAME"]
+        results = {}
+        with tempfile.TemporaryDirectory(prefix="bench_auditlog_") as tmp:
+            # Gerçek veritabanına dokunmamak için geçici dosya (settings'teki PRAGMA'lar uygulanır)
+            connection.close()
+            connection.settings_dict["NAME"] = os.path.join(tmp, "bench.sqlite3")
+            try:
+                call_command("migrate", verbosity=0, interactive=False)
+                sub = Submission.objects.create(tracking_number="AUDITBENCH", email_hash="0" * 64,
+                                                original_pdf="uploads/bench.pdf", status="Gönderildi")
+                for mode in modes:
+                    best = None
+                    for attempt in range(opts['repeat']):
+                        prefix = f"{mode}-{attempt}-"
+                        elapsed = self.run_mode(mode, sub, prefix, opts['rows'])
+                        actions = list(
+                            Log.objects.filter(action__startswith=prefix).order_by("id").values_list("action", flat=True)
+                        )
+                        ordered = actions == [f"{prefix}{i}" for i in range(opts['rows'])]
+                        if not ordered:
+                            raise CommandError(f"{mode}: {len(actions)}/{opts['rows']} satır, sıra bozuk")
+                        best = elapsed if best is None else min(best, elapsed)
+                    results[mode] = {"seconds": round(best, 4), "rows_per_second": round(opts['rows'] / best)}
+            finally:
+                connection.close()
+                connection.settings_dict["NAME"] = original_name
+
+        self.stdout.write(f"{opts['rows']} satır, {opts['repeat']} tekrarın en iyisi\n{'mod':<12} {'süre':>9} {'satır/sn':>10} {'hız':>7}")
+        baseline = results.get("create", {}).get("rows_per_second")
+        for mode, r in results.items():
+            speedup = f"{r['rows_per_second'] / baseline:.1f}x" if baseline else "-"
+            self.stdout.write(f"{mode:<12} {r['seconds']:>8.3f}s {r['rows_per_second']:>10} {speedup:>7}")
+        if opts['output']:
+            with open(opts['output'], 'w', encoding='utf-8') as f:
+                json.dump({"rows": opts['rows'], "modes": results}, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Sonuçlar yazıldı: {opts['output']}")
+
+    def run_mode(self, mode, sub, prefix, rows):
+        start = time.perf_counter()
+        if mode == "create":
+            for i in range(rows):
+                Log.objects.create(submission=sub, action=f"{prefix}{i}")
+        elif mode == "buffered":
+            for i in range(rows):
+                audit.log(sub, f"{prefix}{i}")
+            audit.flush()
+        else:
+            with transaction.atomic():
+                for i in range(rows):
+                    audit.log(sub, f"{prefix}{i}")
+        return time.perf_counter() - start
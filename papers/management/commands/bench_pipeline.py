@@ -0,0 +1,152 @@
+import dataclasses
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+from django.core.management.base import BaseCommand, CommandError
+
+from papers import metrics
+from papers.anonymization import anonymize_pdf, merge_review_comments, restore_original_fields
+from papers.gazetteer import Gazetteer
+from papers.nlp_utils import SPACY_MODEL, extract_keywords_from_pdf_advanced, get_nlp
+from papers.synthetic import PaperSpec, generate_paper
+
+ALL_CATEGORIES = ["name", "contact", "institution", "image"]
+REVIEW_TEXT = "Hakem değerlendirmesi: yöntem bölümü genişletilmeli, deneyler tekrarlanabilir. " * 5
+
+
+def _timed(fn, repeat):
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+    return result, {
+        "median": statistics.median(runs),
+        "min": min(runs),
+        "runs": [round(r, 5) for r in runs],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Sentetik makalelerle anonymize_pdf, restore_original_fields, merge_review_comments "
+        "ve extract_keywords_from_pdf_advanced sürelerini ölçer; sonucu JSON olarak yazar ve "
+        "isteğe bağlı olarak kayıtlı bir temel (baseline) ile karşılaştırır. Ağ erişimi gerekmez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='4,16,64', help="Sayfa sayıları (virgülle)")
+        parser.add_argument('--languages', default='en,tr')
+        parser.add_argument('--authors', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Sonuç JSON dosyası (verilmezse stdout)")
+        parser.add_argument('--baseline', help="Karşılaştırılacak önceki sonuç JSON dosyası")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Medyan süre bu oranda artarsa gerileme sayılır (0.2 = %%20)")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **opts):
+        sizes = [int(s) for s in opts['sizes'].split(',') if s]
+        languages = [lang for lang in opts['languages'].split(',') if lang]
+        repeat = max(opts['repeat'], 1)
+        # Ölçüm veritabanından bağımsız olsun: boş gazetteer
+        gazetteer = Gazetteer([])
+        # Model yükleme süresi ilk ölçüme binmesin
+        get_nlp()
+
+        results = {}
+        with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as tmp:
+            for lang in languages:
+                for pages in sizes:
+                    spec = PaperSpec(pages=pages, authors=opts['authors'], language=lang, seed=opts['seed'])
+                    src = os.path.join(tmp, f"{spec.label()}.pdf")
+                    paper = generate_paper(src, spec)
+                    anon = os.path.join(tmp, f"anon_{spec.label()}.pdf")
+                    reviewed = os.path.join(tmp, f"reviewed_{spec.label()}.pdf")
+                    restored = os.path.join(tmp, f"restored_{spec.label()}.pdf")
+
+                    stages = {}
+
+                    def anonymize():
+                        with metrics.run("anonymize", pages=paper.page_count) as run:
+                            regions = anonymize_pdf(src, anon, gazetteer=gazetteer)
+                        stages.update(run.as_dict().get("stages", {}))
+                        return regions
+
+                    regions, timing = _timed(anonymize, repeat)
+                    timing["regions"] = len(regions)
+                    timing["stages"] = stages
+                    results[f"anonymize_pdf/{spec.label()}"] = timing
+
+                    _, timing = _timed(lambda: restore_original_fields(
+                        anon, src, regions, ALL_CATEGORIES, restored), repeat)
+                    results[f"restore_original_fields/{spec.label()}"] = timing
+
+                    _, timing = _timed(lambda: merge_review_comments(anon, REVIEW_TEXT, reviewed), repeat)
+                    results[f"merge_review_comments/{spec.label()}"] = timing
+
+                    # Başlıksız kopya: "Keywords:" satırı olmadığında isim öbeği (nlp) / RAKE (fast) yolu
+                    bare_spec = dataclasses.replace(spec, keywords_header=False)
+                    bare = os.path.join(tmp, f"{bare_spec.label()}.pdf")
+                    generate_paper(bare, bare_spec)
+                    for label, path in ((spec.label(), src), (bare_spec.label(), bare)):
+                        for mode in ("nlp", "fast"):
+                            keywords, timing = _timed(
+                                lambda: extract_keywords_from_pdf_advanced(path, mode=mode), repeat)
+                            timing["keywords"] = keywords
+                            results[f"extract_keywords[{mode}]/{label}"] = timing
+
+                    self.stderr.write(f"{spec.label()} ({paper.page_count} sayfa) tamamlandı")
+
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "pymupdf": fitz.VersionBind,
+                "spacy_model": SPACY_MODEL,
+                "repeat": repeat,
+                "seed": opts['seed'],
+                "sizes": sizes,
+                "languages": languages,
+            },
+            "results": results,
+        }
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if opts['output']:
+            with open(opts['output'], 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.stdout.write(f"Sonuçlar yazıldı: {opts['output']}")
+        else:
+            self.stdout.write(text)
+
+        if opts['baseline']:
+            regressions = self.compare(report, opts['baseline'], opts['threshold'])
+            if regressions and opts['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} ölçümde gerileme var.")
+
+    def compare(self, report, baseline_path, threshold):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        regressions = []
+        self.stdout.write(f"\n{'ölçüm':<50} {'temel':>9} {'şimdi':>9} {'oran':>7}")
+        for key, current in sorted(report["results"].items()):
+            if key not in baseline:
+                continue
+            before, now = baseline[key]["median"], current["median"]
+            ratio = now / before if before else float('inf')
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  GERİLEME"
+                regressions.append(key)
+            elif ratio < 1 - threshold:
+                flag = "  iyileşme"
+            self.stdout.write(f"{key:<50} {before:>9.4f} {now:>9.4f} {ratio:>7.2f}{flag}")
+        style = self.style.ERROR if regressions else self.style.SUCCESS
+        self.stdout.write(style(f"{len(regressions)} gerileme (eşik %{threshold * 100:.0f})."))
+        return regressions
@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from papers.recommender import ReviewerIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Hakem öneri indeksinin performans testi: sentetik makalelerle profilleri "
+        "artımlı oluşturur, ardından sorgu gecikmesini ölçer (veritabanı kullanmaz)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--papers', type=int, default=10000)
+        parser.add_argument('--reviewers', type=int, default=1000)
+        parser.add_argument('--vocabulary', type=int, default=50000)
+        parser.add_argument('--terms-per-paper', type=int, default=300)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **opts):
+        rng = np.random.default_rng(opts['seed'])
+        vocab = opts['vocabulary']
+        # Zipf dağılımı: gerçek metinlerdeki gibi az sayıda çok sık terim
+        def random_document():
+            ids = rng.zipf(1.3, size=opts['terms_per_paper']) % vocab
+            uniq, counts = np.unique(ids, return_counts=True)
+            return {f"t{i}": int(c) for i, c in zip(uniq, counts)}
+
+        index = ReviewerIndex()
+        started = time.perf_counter()
+        for _ in range(opts['papers']):
+            index.add_document(int(rng.integers(opts['reviewers'])), random_document())
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.rank(random_document())  # ilk sorgu indeksi derler
+        compile_s = time.perf_counter() - started
+
+        queries = [random_document() for _ in range(opts['queries'])]
+        latencies = []
+        for q in queries:
+            t0 = time.perf_counter()
+            index.rank(q, top_k=10)
+            latencies.append(time.perf_counter() - t0)
+        latencies = np.array(latencies) * 1000
+
+        nnz = sum(len(ids) for ids, _ in index.rows.values())
+        self.stdout.write(f"makale={opts['papers']} hakem={len(index.rows)} terim={len(index.vocabulary)} nnz={nnz}")
+        self.stdout.write(f"artımlı profil oluşturma: {build_s:.2f} s ({opts['papers'] / build_s:.0f} makale/s)")
+        self.stdout.write(f"indeks derleme: {compile_s * 1000:.1f} ms")
+        self.stdout.write(
+            f"sorgu: p50={np.percentile(latencies, 50):.2f} ms "
+            f"p95={np.percentile(latencies, 95):.2f} ms p99={np.percentile(latencies, 99):.2f} ms"
+        )
@@ -0,0 +1,81 @@
+import random
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from papers.search import BM25_WEIGHTS, FTS_TABLE, SNIPPET_TOKENS, fts_query
+
+# 0026_searchdocument_fts ile aynı şema; ayrı bir bellek içi veritabanında kurulur
+SCHEMA = [
+    "CREATE TABLE papers_searchdocument (id INTEGER PRIMARY KEY, submission_id INTEGER, body TEXT, keywords TEXT, review TEXT, messages TEXT)",
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(body, keywords, review, messages,
+        content='papers_searchdocument', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER papers_searchdocument_ai AFTER INSERT ON papers_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, body, keywords, review, messages)
+        VALUES (new.id, new.body, new.keywords, new.review, new.messages); END""",
+]
+
+WORDS = (
+    "deep learning neural network convolutional transformer attention dataset "
+    "security encryption blockchain consensus cloud distributed latency spark "
+    "hadoop visualization mining regression classification segmentation eeg "
+    "öğrenme ağ güvenlik şifreleme veri analiz görüntü işleme sistem model "
+    "performans doğruluk yöntem deney sonuç hakem revizyon"
+).split()
+
+
+class Command(BaseCommand):
+    help = "FTS5 arama sorgularının gecikmesini sentetik N belgelik bir bellek içi veritabanında ölçer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=100000)
+        parser.add_argument('--words', type=int, default=200, help="Belge başına kelime")
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts['seed'])
+        # Nadir terimler de olsun diye sözlüğü sentetik kelimelerle genişletiyoruz
+        vocab = WORDS + [f"terim{i}" for i in range(20000)]
+        weights = [50] * len(WORDS) + [1] * 20000
+
+        db = sqlite3.connect(':memory:')
+        for sql in SCHEMA:
+            db.execute(sql)
+
+        started = time.perf_counter()
+        rows = (
+            (i, i, ' '.join(rng.choices(vocab, weights, k=opts['words'])),
+             ', '.join(rng.choices(WORDS, k=5)), ' '.join(rng.choices(vocab, weights, k=40)), '')
+            for i in range(1, opts['documents'] + 1)
+        )
+        db.executemany("INSERT INTO papers_searchdocument VALUES (?, ?, ?, ?, ?, ?)", rows)
+        db.commit()
+        self.stdout.write(f"{opts['documents']} belge indekslendi: {time.perf_counter() - started:.1f} s")
+
+        weights_sql = ', '.join(str(w) for w in BM25_WEIGHTS)
+        page_sql = f"""
+            SELECT d.submission_id, snippet({FTS_TABLE}, -1, '[', ']', '…', {SNIPPET_TOKENS})
+            FROM {FTS_TABLE} JOIN papers_searchdocument d ON d.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH ? ORDER BY bm25({FTS_TABLE}, {weights_sql}) LIMIT 20
+        """
+        count_sql = f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?"
+
+        for label, pool in (("yaygın terim", WORDS), ("nadir terim", vocab[len(WORDS):])):
+            page_ms, count_ms = [], []
+            for _ in range(opts['queries']):
+                query = fts_query(rng.sample(pool, 2))
+                t0 = time.perf_counter()
+                db.execute(page_sql, [query]).fetchall()
+                t1 = time.perf_counter()
+                db.execute(count_sql, [query]).fetchone()
+                t2 = time.perf_counter()
+                page_ms.append((t1 - t0) * 1000)
+                count_ms.append((t2 - t1) * 1000)
+            self.stdout.write(
+                f"{label}: sayfa p50={statistics.median(page_ms):.1f} ms "
+                f"p95={statistics.quantiles(page_ms, n=20)[-1]:.1f} ms | "
+                f"sayım p50={statistics.median(count_ms):.1f} ms"
+            )
@@ -0,0 +1,152 @@
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from papers.loadtest import percentile
+
+PROFILES = ("default", "tuned")
+STATUSES = ["Anonimleştirildi", "Hakeme Atandı", "Değerlendirildi", "Final"]
+
+
+def _setup(db_path, profile):
+    """
+    Worker başlangıcı: ayarlardaki veritabanı yerine geçici dosya kullanılır.
+    default: SQLite varsayılanları (rollback journal, DEFERRED, 5 sn timeout, PRAGMA yok)
+    tuned: uygulamanın profili (papers/db.py PRAGMA'ları, settings.py'deki IMMEDIATE ve timeout)
+    """
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connections
+
+    connection = connections["default"]
+    connection.settings_dict["NAME"] = db_path
+    if profile == "default":
+        connection.settings_dict["OPTIONS"] = {}
+        settings.SQLITE_PRAGMAS = {}
+
+
+def _prepare(submissions):
+    from django.core.management import call_command
+    from django.db import connection
+    from papers.models import Submission
+
+    call_command("migrate", verbosity=0, interactive=False)
+    Submission.objects.bulk_create(
+        Submission(tracking_number=f"SQLBENCH{i:05d}", email_hash="0" * 64,
+                   original_pdf="uploads/bench.pdf", status="Gönderildi")
+        for i in range(submissions)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        return cursor.fetchone()[0]
+
+
+def _writer(job):
+    """Görünümlerdeki durum değişikliği: makaleyi oku, güncelle, log yaz."""
+    from django.db import OperationalError, transaction
+    from papers.models import Log, Submission
+
+    index, profile, updates, start_at, seed = job
+    rng = random.Random(seed * 1000 + index)
+    ids = list(Submission.objects.values_list("id", flat=True))
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    latencies, lock_errors = [], 0
+    for n in range(updates):
+        start = time.perf_counter()
+        try:
+            if profile == "default":
+                # Eski görünüm kodu: autocommit, iki ayrı yazma
+                sub = Submission.objects.get(id=rng.choice(ids))
+                sub.status = STATUSES[n % len(STATUSES)]
+                sub.save()
+                Log.objects.create(submission=sub, action=f"Yazma testi {index}-{n}")
+            else:
+                with transaction.atomic():
+                    sub = Submission.objects.get(id=rng.choice(ids))
+                    sub.status = STATUSES[n % len(STATUSES)]
+                    sub.save()
+                    Log.objects.create(submission=sub, action=f"Yazma testi {index}-{n}")
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            lock_errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, lock_errors, time.time()
+
+
+class Command(BaseCommand):
+    help = (
+        "N süreçten eş zamanlı makale durum güncellemesi (Submission.save + Log) yaparak "
+        "SQLite yazma çekişmesini ölçer. Her profil için geçici bir veritabanı oluşturulur; "
+        "'default' SQLite varsayılanları ve autocommit yazmalar, 'tuned' settings.py'deki "
+        "WAL/IMMEDIATE profili ve kısa transaction'lardır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--updates', type=int, default=200, help="Süreç başına güncelleme")
+        parser.add_argument('--submissions', type=int, default=100)
+        parser.add_argument('--profiles', default=",".join(PROFILES))
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Sonuç JSON dosyası")
+
+    def handle(self, *args, **opts):
+        context = multiprocessing.get_context("spawn")
+        results = {}
+        with tempfile.TemporaryDirectory(prefix="bench_sqlite_") as tmp:
+            for profile in opts['profiles'].split(","):
+                db_path = os.path.join(tmp, f"{profile}.sqlite3")
+                with ProcessPoolExecutor(1, mp_context=context, initializer=_setup,
+                                         initargs=(db_path, profile)) as pool:
+                    journal_mode = pool.submit(_prepare, opts['submissions']).result()
+
+                with ProcessPoolExecutor(opts['processes'], mp_context=context, initializer=_setup,
+                                         initargs=(db_path, profile)) as pool:
+                    # Süreçler django.setup() bitene kadar beklemeden aynı anda başlasın
+                    start_at = time.time() + 3
+                    jobs = [(i, profile, opts['updates'], start_at, opts['seed']) for i in range(opts['processes'])]
+                    outcomes = list(pool.map(_writer, jobs))
+
+                latencies = sorted(v for values, _, _ in outcomes for v in values)
+                elapsed = max(end for _, _, end in outcomes) - start_at
+                lock_errors = sum(errors for _, errors, _ in outcomes)
+                results[profile] = {
+                    "journal_mode": journal_mode,
+                    "transactions": len(latencies) - lock_errors,
+                    "lock_errors": lock_errors,
+                    "elapsed": round(elapsed, 3),
+                    "tps": round((len(latencies) - lock_errors) / elapsed, 1) if elapsed else None,
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99),
+                    "max": latencies[-1] if latencies else None,
+                }
+
+        self.report(results, opts)
+        if opts['output']:
+            summary = {"config": {k: opts[k] for k in ('processes', 'updates', 'submissions')}, "profiles": results}
+            with open(opts['output'], 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Sonuçlar yazıldı: {opts['output']}")
+
+    def report(self, results, opts):
+        self.stdout.write(
+            f"{opts['processes']} süreç x {opts['updates']} güncelleme, {opts['submissions']} makale\n"
+            f"{'profil':<10} {'journal':>8} {'başarılı':>9} {'kilit':>6} {'tx/sn':>8} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        )
+        for profile, r in results.items():
+            style = self.style.ERROR if r["lock_errors"] else self.style.SUCCESS
+            self.stdout.write(style(
+                f"{profile:<10} {r['journal_mode']:>8} {r['transactions']:>9} {r['lock_errors']:>6} {r['tps']:>8} "
+                f"{r['p50'] * 1000:>6.1f}ms {r['p95'] * 1000:>6.1f}ms {r['p99'] * 1000:>6.1f}ms {r['max'] * 1000:>6.0f}ms"
+            ))
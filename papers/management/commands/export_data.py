@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from papers.export import DATASETS, FORMATS, export_lines
+from papers.retention import parse_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Makaleleri (submissions), çözülmüş anonimleştirme bölgelerini (regions) ya da logları (logs) "
+        "CSV veya JSONL olarak akış hâlinde yazar; bellek kullanımı tablo boyutundan bağımsızdır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--status', help="Yalnızca bu statüdeki makaleler")
+        parser.add_argument('--since', help="YYYY-AA-GG (dahil); logs için log tarihi, diğerlerinde gönderim tarihi")
+        parser.add_argument('--until', help="YYYY-AA-GG (dahil)")
+        parser.add_argument('--no-text', action='store_true', help="regions: orijinal metni yazma")
+        parser.add_argument('--output', help="Dosya (varsayılan: standart çıktı)")
+
+    def handle(self, *args, **opts):
+        try:
+            filters = {'status': opts['status'], 'since': parse_day(opts['since']), 'until': parse_day(opts['until'])}
+        except ValueError:
+            raise CommandError("Tarihler YYYY-AA-GG biçiminde olmalı.")
+        if opts['dataset'] == 'regions':
+            filters['include_text'] = not opts['no_text']
+
+        lines = export_lines(opts['dataset'], opts['format'], **filters)
+        if not opts['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        count = -1 if opts['format'] == 'csv' else 0   # CSV başlık satırı sayılmaz
+        with open(opts['output'], 'w', encoding='utf-8', newline='') as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"{max(count, 0)} satır yazıldı: {opts['output']}"))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from papers.catalog import CatalogError, import_catalog, parse_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Alan, alt başlık ve hakem kataloğunu CSV/JSON dosyasından içe aktarır (bkz. papers/catalog.py). "
+        "Mevcut kayıtlar ada/e-postaya göre güncellenir; kayıt başına save() yapılmaz."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--merge-interests', action='store_true',
+                            help="Hakemlerin mevcut ilgi alanlarını silme, dosyadakileri ekle")
+        parser.add_argument('--dry-run', action='store_true', help="Yaz ve geri al; yalnızca sayıları göster")
+
+    def handle(self, *args, **opts):
+        with open(opts['path'], 'rb') as f:
+            content = f.read()
+        start = time.perf_counter()
+        try:
+            catalog = parse_catalog(content, opts['path'])
+            stats = import_catalog(catalog, replace_interests=not opts['merge_interests'], dry_run=opts['dry_run'])
+        except CatalogError as e:
+            raise CommandError("\n".join(e.errors))
+        elapsed = time.perf_counter() - start
+        prefix = "(deneme, geri alındı) " if opts['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{stats['domains']} yeni alan, {stats['subtopics']} yeni alt başlık, "
+            f"{stats['reviewers_created']} yeni / {stats['reviewers_updated']} güncellenen hakem, "
+            f"{stats['interests']} ilgi alanı bağlantısı ({elapsed:.2f} sn)."
+        ))
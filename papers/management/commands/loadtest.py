@@ -0,0 +1,128 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from papers.loadtest import Client, Recorder, WorkflowError, run_workflow
+from papers.synthetic import PaperSpec, generate_paper
+
+TRACKED_URLS = ("extract_keywords_view", "anonymize_view", "assign_reviewer", "review_view", "finalize_view")
+
+
+def _urls():
+    urls = {"upload_paper": reverse("upload_paper"), "status": reverse("status")}
+    for name in TRACKED_URLS:
+        # reverse bir kez; takip numarası yer tutucunun yerine konur
+        template = reverse(name, kwargs={"tracking_number": "TRACKING"})
+        urls[name] = lambda tracking, template=template: template.replace("TRACKING", tracking)
+    return urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Çalışan bir sunucuya (runserver, gunicorn, uvicorn...) karşı eş zamanlı sanal kullanıcılarla "
+        "yükleme -> anahtar kelime -> anonimleştirme -> atama -> değerlendirme -> final -> durum "
+        "akışını çalıştırır; uç nokta bazında throughput, p50/p95/p99 ve SQLite kilit hatalarını raporlar. "
+        "Önce seed_loadtest ile hakem ve alt başlıklar oluşturulmalıdır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--users', type=int, default=4, help="Eş zamanlı sanal kullanıcı sayısı")
+        parser.add_argument('--iterations', type=int, default=2, help="Kullanıcı başına iş akışı sayısı")
+        parser.add_argument('--duration', type=float, default=0,
+                            help="Saniye; verilirse iterations yerine bu süre boyunca çalışır")
+        parser.add_argument('--polls', type=int, default=3, help="İş akışı sonunda durum sorgulama sayısı")
+        parser.add_argument('--pdf', help="Yüklenecek PDF (verilmezse her iş akışı için farklı sentetik makale)")
+        parser.add_argument('--pages', type=int, default=8, help="Sentetik makale sayfa sayısı")
+        parser.add_argument('--think', type=float, default=0, help="İstekler arası bekleme değil, akışlar arası (sn)")
+        parser.add_argument('--timeout', type=float, default=120)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Sonuç JSON dosyası")
+
+    def handle(self, *args, **opts):
+        urls = _urls()
+        recorder = Recorder()
+        deadline = time.monotonic() + opts['duration'] if opts['duration'] else None
+        counter = iter(range(10 ** 9))
+        counter_lock = threading.Lock()
+
+        with tempfile.TemporaryDirectory(prefix='loadtest_') as tmp:
+            fixed_pdf = None
+            if opts['pdf']:
+                if not os.path.exists(opts['pdf']):
+                    raise CommandError(f"PDF bulunamadı: {opts['pdf']}")
+                with open(opts['pdf'], 'rb') as f:
+                    fixed_pdf = (os.path.basename(opts['pdf']), f.read())
+
+            def next_pdf():
+                with counter_lock:
+                    n = next(counter)
+                if fixed_pdf:
+                    return n, fixed_pdf
+                # Farklı içerik: analiz/anahtar kelime önbellekleri gerçekçi olmayan isabet vermesin
+                spec = PaperSpec(pages=opts['pages'], seed=opts['seed'] * 100000 + n)
+                path = os.path.join(tmp, f"yuk_{n}.pdf")
+                generate_paper(path, spec)
+                with open(path, 'rb') as f:
+                    content = f.read()
+                os.remove(path)
+                return n, (f"yuk_{n}.pdf", content)
+
+            def user(index):
+                client = Client(opts['base_url'], recorder, timeout=opts['timeout'])
+                rng = random.Random(opts['seed'] * 1000 + index)
+                done = 0
+                while (deadline is None and done < opts['iterations']) or \
+                        (deadline is not None and time.monotonic() < deadline):
+                    n, (name, content) = next_pdf()
+                    try:
+                        _, final = run_workflow(
+                            client, urls, name, content, f"yuk{n}@yuktesti.com",
+                            polls=opts['polls'], rng=rng,
+                        )
+                        recorder.workflow_done(final)
+                    except WorkflowError as e:
+                        self.stderr.write(f"Kullanıcı {index}: iş akışı yarıda kaldı ({e})")
+                        recorder.workflow_done(False)
+                    done += 1
+                    if opts['think']:
+                        time.sleep(opts['think'])
+
+            self.stderr.write(f"{opts['users']} sanal kullanıcı -> {opts['base_url']}")
+            with ThreadPoolExecutor(max_workers=opts['users']) as pool:
+                list(pool.map(user, range(opts['users'])))
+            recorder.finished = time.perf_counter()
+
+        summary = recorder.summary()
+        summary["config"] = {k: opts[k] for k in ('base_url', 'users', 'iterations', 'duration', 'polls', 'pages')}
+        self.report(summary)
+        if opts['output']:
+            with open(opts['output'], 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Sonuçlar yazıldı: {opts['output']}")
+
+    def report(self, summary):
+        self.stdout.write(
+            f"\n{'uç nokta':<30} {'adet':>6} {'hata':>5} {'istek/sn':>9} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        )
+        for endpoint, stats in summary["endpoints"].items():
+            self.stdout.write(
+                f"{endpoint:<30} {stats['count']:>6} {stats['errors']:>5} {stats['rps']:>9} "
+                f"{stats['p50'] * 1000:>6.0f}ms {stats['p95'] * 1000:>6.0f}ms "
+                f"{stats['p99'] * 1000:>6.0f}ms {stats['max'] * 1000:>6.0f}ms"
+            )
+        self.stdout.write(
+            f"\n{summary['requests']} istek / {summary['elapsed']} sn ({summary['rps']} istek/sn), "
+            f"tamamlanan iş akışı: {summary['workflows']} ({summary['workflows_per_minute']}/dk), "
+            f"yarım kalan: {summary['failed_workflows']}"
+        )
+        style = self.style.ERROR if summary["lock_errors"] else self.style.SUCCESS
+        self.stdout.write(style(f"SQLite kilit hatası: {summary['lock_errors']}"))
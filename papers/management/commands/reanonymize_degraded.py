@@ -0,0 +1,75 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from papers import audit, metrics
+from papers.analysis import get_document_analysis
+from papers.anonymization import anonymize_pdf
+from papers.budget import TimeBudget
+from papers.models import Log
+
+ANONYMIZE_ACTIONS = ("Makale anonimleştirildi", "Makale yeniden anonimleştirildi")
+# Hakeme gönderilmiş makalelerde bölgeler değişirse geri yükleme eski PDF'le uyuşmaz
+RERUN_STATUSES = ("Anonimleştirildi",)
+
+
+class Command(BaseCommand):
+    help = (
+        "Son anonimleştirmesi süre bütçesi yüzünden kısıtlı kademede çalışmış makaleleri "
+        "(Log.details['budget']['tier'] != 'full') bütçesiz, tam modda yeniden anonimleştirir. "
+        "Yalnızca henüz hakeme atanmamış makaleler işlenir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tracking', nargs='*', help="Yalnızca bu takip numaraları")
+        parser.add_argument('--dry-run', action='store_true', help="Yalnızca listele")
+
+    def handle(self, *args, **opts):
+        query = Q()
+        for action in ANONYMIZE_ACTIONS:
+            query |= Q(action__startswith=action)
+        logs = Log.objects.filter(query).select_related('submission')
+        if opts['tracking']:
+            logs = logs.filter(submission__tracking_number__in=opts['tracking'])
+
+        latest = {}     # submission_id -> son anonimleştirme logu
+        for log in logs.order_by('submission_id', 'timestamp', 'id').iterator():
+            latest[log.submission_id] = log
+        degraded = [log for log in latest.values() if log.budget_tier]
+        self.stdout.write(f"{len(degraded)} makalenin son anonimleştirmesi kısıtlı kademede.")
+
+        done = skipped = 0
+        for log in degraded:
+            sub = log.submission
+            if sub.status not in RERUN_STATUSES:
+                self.stdout.write(f"  {sub.tracking_number}: atlandı (durum: {sub.status})")
+                skipped += 1
+                continue
+            self.stdout.write(f"  {sub.tracking_number}: {log.budget_tier}")
+            if opts['dry_run']:
+                continue
+            self.rerun(sub, log.get_details().get('options'))
+            done += 1
+        audit.flush()
+        self.stdout.write(self.style.SUCCESS(f"{done} makale yeniden anonimleştirildi, {skipped} atlandı."))
+
+    def rerun(self, sub, options):
+        input_path = sub.revised_pdf.path if sub.revised_pdf else sub.original_pdf.path
+        filename = os.path.basename(input_path)
+        output_path = os.path.join(os.path.dirname(sub.anonymized_pdf.path), f"anon_{filename}")
+        budget = TimeBudget(None)
+        with metrics.run("anonymize") as run:
+            analysis = get_document_analysis(input_path)
+            run.pages = len(analysis.page_texts)
+            regions = anonymize_pdf(input_path, output_path, options, analysis=analysis, budget=budget)
+        sub.anonymized_pdf.name = os.path.join('anonymized', f"anon_{filename}")
+        sub.record_anonymized_pdf()
+        sub.anonymized_data = json.dumps(regions)
+        sub.save()
+        details = dict(run.as_dict(), budget=budget.as_dict(), options=options)
+        audit.log(
+            sub, "Makale yeniden anonimleştirildi (tam mod, çevrimdışı)",
+            details=json.dumps(details, ensure_ascii=False),
+        )
@@ -0,0 +1,34 @@
+import json
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+
+from papers.models import Submission, ReviewerProfile
+from papers.recommender import MAX_PROFILE_TERMS, document_terms, paper_text
+
+
+class Command(BaseCommand):
+    help = "Hakem profillerini, hakemlerin değerlendirdiği tüm makalelerden yeniden oluşturur."
+
+    def handle(self, *args, **options):
+        profiles = defaultdict(Counter)
+        paper_counts = Counter()
+        reviewed = (
+            Submission.objects
+            .filter(reviewer__isnull=False, review__isnull=False)
+            .exclude(review="")
+        )
+        for sub in reviewed.iterator():
+            profiles[sub.reviewer_id].update(document_terms(paper_text(sub)))
+            paper_counts[sub.reviewer_id] += 1
+
+        ReviewerProfile.objects.all().delete()
+        ReviewerProfile.objects.bulk_create([
+            ReviewerProfile(
+                reviewer_id=reviewer_id,
+                terms=json.dumps(dict(terms.most_common(MAX_PROFILE_TERMS)), ensure_ascii=False),
+                paper_count=paper_counts[reviewer_id],
+            )
+            for reviewer_id, terms in profiles.items()
+        ])
+        self.stdout.write(self.style.SUCCESS(f"{len(profiles)} hakem profili oluşturuldu."))
@@ -0,0 +1,41 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from papers.models import Message, SearchDocument, Submission
+from papers.text_utils import read_pdf_text
+
+
+class Command(BaseCommand):
+    help = "Arama indeksini (SearchDocument + FTS5) mevcut makale, değerlendirme ve mesajlardan yeniden oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-pdf', action='store_true', help="PDF metinlerini okumadan sadece alanları indeksle")
+
+    def handle(self, *args, **opts):
+        messages = defaultdict(list)
+        for submission_id, content in Message.objects.order_by('timestamp').values_list('submission_id', 'content').iterator():
+            messages[submission_id].append(content)
+
+        SearchDocument.objects.all().delete()
+        batch = []
+        for sub in Submission.objects.iterator(chunk_size=500):
+            body = ''
+            pdf = sub.revised_pdf or sub.original_pdf
+            if pdf and not opts['skip_pdf']:
+                try:
+                    body = read_pdf_text(pdf.path)
+                except Exception as e:
+                    self.stderr.write(f"{sub.tracking_number}: PDF okunamadı ({e})")
+            batch.append(SearchDocument(
+                submission_id=sub.id,
+                body=body,
+                keywords=sub.extracted_keywords or '',
+                review=sub.review or '',
+                messages='\n'.join(messages.get(sub.id, [])),
+            ))
+            if len(batch) >= 500:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        self.stdout.write(self.style.SUCCESS(f"{SearchDocument.objects.count()} makale indekslendi."))
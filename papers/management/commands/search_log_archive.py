@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from papers.retention import iter_archived_logs, parse_day
+
+
+class Command(BaseCommand):
+    help = "Arşivlenmiş Log kayıtlarında (archive_logs) akış hâlinde arama yapar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tracking', help="Takip numarası")
+        parser.add_argument('--contains', help="İşlem metninde geçen ifade")
+        parser.add_argument('--since', help="YYYY-AA-GG (dahil)")
+        parser.add_argument('--until', help="YYYY-AA-GG (dahil)")
+        parser.add_argument('--limit', type=int, default=100, help="0: sınırsız")
+        parser.add_argument('--json', action='store_true', help="Her satıra bir JSON kaydı yaz")
+
+    def handle(self, *args, **opts):
+        try:
+            since, until = parse_day(opts['since']), parse_day(opts['until'])
+        except ValueError as e:
+            raise CommandError(f"Geçersiz tarih: {e}")
+        found = 0
+        for record in iter_archived_logs(since, until, opts['tracking'], opts['contains']):
+            if opts['json']:
+                self.stdout.write(json.dumps(record, ensure_ascii=False))
+            else:
+                self.stdout.write(f"{record['timestamp']}  {record['tracking_number']}  {record['action']}")
+            found += 1
+            if opts['limit'] and found >= opts['limit']:
+                break
+        self.stderr.write(f"{found} kayıt.")
@@ -0,0 +1,77 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from papers.models import Domain, Reviewer, Submission, Subtopic
+
+SEED_PREFIX = "Yük Testi"
+EMAIL_DOMAIN = "yuktesti.com"
+TOPICS = [
+    "Derin öğrenme", "Doğal dil işleme", "Bilgisayarlı görü", "Sinyal işleme",
+    "Veri madenciliği", "Ağ güvenliği", "Dağıtık sistemler", "Bulut bilişim",
+    "Kriptografi", "Pekiştirmeli öğrenme", "Biyomedikal görüntüleme", "Nesnelerin interneti",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Yük testi için alan, alt başlık ve hakem kayıtları oluşturur "
+        f"(adlar '{SEED_PREFIX}' ile başlar, hakem e-postaları @{EMAIL_DOMAIN}). "
+        "--clear önceki yük testi kayıtlarını ve loadtest'in yüklediği sentetik makaleleri siler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--domains', type=int, default=4)
+        parser.add_argument('--subtopics', type=int, default=6, help="Alan başına alt başlık")
+        parser.add_argument('--reviewers', type=int, default=40)
+        parser.add_argument('--interests', type=int, default=3, help="Hakem başına ilgi alanı")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true')
+
+    @transaction.atomic
+    def handle(self, *args, **opts):
+        if opts['clear']:
+            self.clear()
+        rng = random.Random(opts['seed'])
+
+        domains = Domain.objects.bulk_create(
+            Domain(name=f"{SEED_PREFIX} Alan {i + 1}") for i in range(opts['domains'])
+        )
+        subtopics = Subtopic.objects.bulk_create(
+            Subtopic(domain=domain, name=f"{SEED_PREFIX} {TOPICS[(d * opts['subtopics'] + j) % len(TOPICS)]} {j + 1}")
+            for d, domain in enumerate(domains)
+            for j in range(opts['subtopics'])
+        )
+        start = Reviewer.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").count()
+        reviewers = Reviewer.objects.bulk_create(
+            Reviewer(name=f"{SEED_PREFIX} Hakem {start + i + 1}", email=f"hakem{start + i + 1}@{EMAIL_DOMAIN}")
+            for i in range(opts['reviewers'])
+        )
+
+        # Her alt başlığın en az bir hakemi olsun: önce sırayla dağıt, sonra rastgele doldur
+        Interest = Reviewer.interests.through
+        links = set()
+        for i, subtopic in enumerate(subtopics):
+            if reviewers:
+                links.add((reviewers[i % len(reviewers)].id, subtopic.id))
+        for reviewer in reviewers:
+            for subtopic in rng.sample(subtopics, min(opts['interests'], len(subtopics))):
+                links.add((reviewer.id, subtopic.id))
+        Interest.objects.bulk_create(
+            Interest(reviewer_id=reviewer_id, subtopic_id=subtopic_id) for reviewer_id, subtopic_id in sorted(links)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(domains)} alan, {len(subtopics)} alt başlık, {len(reviewers)} hakem, "
+            f"{len(links)} ilgi alanı bağlantısı oluşturuldu."
+        ))
+
+    def clear(self):
+        reviewers = Reviewer.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+        # loadtest komutu yuk_<N>.pdf adlı sentetik makaleler yükler
+        subs = Submission.objects.filter(original_pdf__startswith='uploads/yuk_')
+        deleted_subs = subs.count()
+        subs.delete()
+        reviewers.delete()
+        Domain.objects.filter(name__startswith=SEED_PREFIX).delete()
+        self.stdout.write(f"Önceki yük testi kayıtları silindi ({deleted_subs} makale).")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from papers.bulk import sweep_file_deletions
+from papers.models import PendingFileDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Silinen makalelerden kalan, silme kuyruğundaki (PendingFileDeletion) dosyaları siler. "
+        "Toplu silmeden sonra arka plan işi yarım kaldıysa kullanılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Deneme sınırına ulaşmış dosyaları da yeniden dene")
+
+    def handle(self, *args, **opts):
+        if opts['retry_failed']:
+            PendingFileDeletion.objects.filter(attempts__gte=opts['max_attempts']).update(attempts=0)
+        stats = sweep_file_deletions(batch_size=opts['batch_size'], max_attempts=opts['max_attempts'])
+        left = PendingFileDeletion.objects.count()
+        style = self.style.WARNING if stats['failed'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{stats['deleted']} dosya silindi, {stats['kept']} dosya başka makalede kullanıldığı için "
+            f"bırakıldı, {stats['failed']} hata; kuyrukta {left} dosya kaldı."
+        ))
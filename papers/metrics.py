@@ -0,0 +1,302 @@
+"""
+Aşama bazlı süre ölçümü (anonimleştirme, geri yükleme, anahtar kelime çıkarma).
+
+    with metrics.run("anonymize") as run:
+        with metrics.stage("ner", count=len(pages)):
+            ...
+        run.pages = page_count
+    audit.log(sub, ..., details=run.to_json())
+
+Her aşama için duvar saati süresi, CPU süresi (iş parçacığı) ve işlenen öğe
+sayısı tutulur. Açık bir run varsa aşamalar ona eklenir ve run bittiğinde
+süreç içi kayıt defterindeki histogramlara sayfa sayısı kovasıyla birlikte
+yazılır; /metrics bu defteri Prometheus metin formatında döndürür. Kayıt
+defteri süreç başınadır (çok süreçli sunucularda her worker kendi değerlerini
+raporlar).
+
+Run ayrıca süreç RSS'ini (başlangıç ve aşama çıkışlarında örneklenen tepe)
+ve settings.METRICS_TRACEMALLOC açıksa tracemalloc tepe değerini tutar;
+as_dict()["memory"] altında döner, /metrics tür başına tepe RSS'i raporlar.
+RSS /proc/self/statm'den okunur (Linux); okunamazsa None.
+
+settings.METRICS_ENABLED = False iken stage()/run() paylaşılan boş nesneler
+döndürür; ölçüm maliyeti bir ayar okumasından ibarettir.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Saniye cinsinden histogram kovaları
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Sayfa sayısı etiket kovaları (üst sınır, etiket)
+PAGE_BUCKETS = ((4, "1-4"), (9, "5-9"), (19, "10-19"), (49, "20-49"))
+PAGE_BUCKET_MAX = "50+"
+
+_current_run = ContextVar("papers_metrics_run", default=None)
+
+
+def enabled():
+    return getattr(settings, "METRICS_ENABLED", True)
+
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss():
+    """Sürecin o anki yerleşik bellek boyutu (bayt) ya da None."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _mb(value):
+    return round(value / 2 ** 20, 1) if value is not None else None
+
+
+def page_bucket(pages):
+    if not pages:
+        return "unknown"
+    for limit, label in PAGE_BUCKETS:
+        if pages <= limit:
+            return label
+    return PAGE_BUCKET_MAX
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "observations")
+
+    def __init__(self):
+        self.counts = [0] * len(DURATION_BUCKETS)
+        self.total = 0.0
+        self.observations = 0
+
+    def observe(self, value):
+        index = bisect_left(DURATION_BUCKETS, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.observations += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = {}     # (stage, pages) -> Histogram
+        self.run_seconds = {}       # (kind, pages) -> Histogram
+        self.stage_cpu = {}         # stage -> saniye
+        self.stage_items = {}       # stage -> adet
+        self.run_rss_peak = {}      # kind -> bayt (görülen en yüksek)
+
+    def observe_stage(self, name, pages, wall, cpu, count):
+        with self._lock:
+            self.stage_seconds.setdefault((name, pages), Histogram()).observe(wall)
+            self.stage_cpu[name] = self.stage_cpu.get(name, 0.0) + cpu
+            self.stage_items[name] = self.stage_items.get(name, 0) + count
+
+    def observe_run(self, kind, pages, wall, rss_peak=None):
+        with self._lock:
+            self.run_seconds.setdefault((kind, pages), Histogram()).observe(wall)
+            if rss_peak is not None and rss_peak > self.run_rss_peak.get(kind, 0):
+                self.run_rss_peak[kind] = rss_peak
+
+    def reset(self):
+        with self._lock:
+            self.stage_seconds.clear()
+            self.run_seconds.clear()
+            self.stage_cpu.clear()
+            self.stage_items.clear()
+            self.run_rss_peak.clear()
+
+    def render(self):
+        """Prometheus metin formatı (text/plain; version=0.0.4)."""
+        lines = []
+        with self._lock:
+            _render_histograms(
+                lines, "papers_stage_seconds", "Aşama başına duvar saati süresi",
+                ("stage", "pages"), self.stage_seconds,
+            )
+            _render_histograms(
+                lines, "papers_run_seconds", "Çalışma (anonimleştirme vb.) başına toplam süre",
+                ("kind", "pages"), self.run_seconds,
+            )
+            lines.append("# HELP papers_stage_cpu_seconds_total Aşama başına CPU süresi")
+            lines.append("# TYPE papers_stage_cpu_seconds_total counter")
+            for name, value in sorted(self.stage_cpu.items()):
+                lines.append(f'papers_stage_cpu_seconds_total{{stage="{name}"}} {value:.6f}')
+            lines.append("# HELP papers_stage_items_total Aşamada işlenen öğe sayısı")
+            lines.append("# TYPE papers_stage_items_total counter")
+            for name, value in sorted(self.stage_items.items()):
+                lines.append(f'papers_stage_items_total{{stage="{name}"}} {value}')
+            lines.append("# HELP papers_run_rss_peak_bytes Çalışma türü başına görülen en yüksek süreç RSS'i")
+            lines.append("# TYPE papers_run_rss_peak_bytes gauge")
+            for kind, value in sorted(self.run_rss_peak.items()):
+                lines.append(f'papers_run_rss_peak_bytes{{kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _render_histograms(lines, metric, help_text, label_names, histograms):
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} histogram")
+    for key, hist in sorted(histograms.items()):
+        labels = ",".join(f'{name}="{value}"' for name, value in zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, hist.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist.observations}')
+        lines.append(f"{metric}_sum{{{labels}}} {hist.total:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {hist.observations}")
+
+
+registry = Registry()
+
+
+class Stage:
+    __slots__ = ("name", "count", "_wall", "_cpu")
+
+    def __init__(self, name, count=0):
+        self.name = name
+        self.count = count
+
+    def add(self, n=1):
+        self.count += n
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        current = _current_run.get()
+        if current is not None:
+            current.record(self.name, wall, cpu, self.count)
+            current.sample_memory()
+        else:
+            registry.observe_stage(self.name, "unknown", wall, cpu, self.count)
+        return False
+
+
+class Run:
+    """Bir işlemin (ör. tek bir anonimleştirme) aşamalarını toplar."""
+
+    def __init__(self, kind, pages=0):
+        self.kind = kind
+        self.pages = pages
+        self.stages = {}
+        self.wall = self.cpu = 0.0
+        self.rss_start = self.rss_peak = None
+        self.traced_peak = None
+
+    def sample_memory(self):
+        """Anlık RSS'i okur, tepe değeri günceller ve döndürür."""
+        rss = current_rss()
+        if rss is not None and (self.rss_peak is None or rss > self.rss_peak):
+            self.rss_peak = rss
+        return rss
+
+    def record(self, name, wall, cpu, count):
+        entry = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "count": 0, "calls": 0})
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+        entry["count"] += count
+        entry["calls"] += 1
+        self._observations.append((name, wall, cpu, count))
+
+    def __enter__(self):
+        self._observations = []
+        self._token = _current_run.set(self)
+        self.rss_start = self.rss_peak = current_rss()
+        # tracemalloc yalnızca Python ayırmalarını görür (MuPDF'in C belleği RSS'te)
+        self._tracing = getattr(settings, "METRICS_TRACEMALLOC", False) and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._wall
+        self.cpu = time.thread_time() - self._cpu
+        _current_run.reset(self._token)
+        self.sample_memory()
+        if self._tracing:
+            self.traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        pages = page_bucket(self.pages)
+        for name, wall, cpu, count in self._observations:
+            registry.observe_stage(name, pages, wall, cpu, count)
+        registry.observe_run(self.kind, pages, self.wall, self.rss_peak)
+        return False
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "pages": self.pages,
+            "wall": round(self.wall, 4),
+            "cpu": round(self.cpu, 4),
+            "stages": {
+                name: {k: round(v, 4) if isinstance(v, float) else v for k, v in entry.items()}
+                for name, entry in self.stages.items()
+            },
+            "memory": {
+                "rss_start_mb": _mb(self.rss_start),
+                "rss_peak_mb": _mb(self.rss_peak),
+                "tracemalloc_peak_mb": _mb(self.traced_peak),
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False)
+
+
+class _NoopStage:
+    __slots__ = ()
+    count = 0
+
+    def add(self, n=1):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _NoopRun(_NoopStage):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        # run.pages = ... gibi atamalar yok sayılır
+        pass
+
+    def as_dict(self):
+        return {}
+
+    def to_json(self):
+        return ""
+
+
+_NOOP_STAGE = _NoopStage()
+_NOOP_RUN = _NoopRun()
+
+
+def stage(name, count=0):
+    return Stage(name, count) if enabled() else _NOOP_STAGE
+
+
+def run(kind, pages=0):
+    return Run(kind, pages) if enabled() else _NOOP_RUN
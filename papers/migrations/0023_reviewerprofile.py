@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0022_submission_final_sent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('terms', models.TextField(default='{}')),
+                ('paper_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reviewer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to='papers.reviewer')),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0024_submissionsignature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('body', models.TextField(blank=True, default='')),
+                ('keywords', models.TextField(blank=True, default='')),
+                ('review', models.TextField(blank=True, default='')),
+                ('messages', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='papers.submission')),
+            ],
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+FTS_TABLE = 'papers_searchdocument_fts'
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        body, keywords, review, messages,
+        content='papers_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS papers_searchdocument_ai AFTER INSERT ON papers_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, body, keywords, review, messages)
+        VALUES (new.id, new.body, new.keywords, new.review, new.messages);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS papers_searchdocument_ad AFTER DELETE ON papers_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body, keywords, review, messages)
+        VALUES ('delete', old.id, old.body, old.keywords, old.review, old.messages);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS papers_searchdocument_au
+    AFTER UPDATE OF body, keywords, review, messages ON papers_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body, keywords, review, messages)
+        VALUES ('delete', old.id, old.body, old.keywords, old.review, old.messages);
+        INSERT INTO {FTS_TABLE}(rowid, body, keywords, review, messages)
+        VALUES (new.id, new.body, new.keywords, new.review, new.messages);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS papers_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS papers_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS papers_searchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def fts5_supported(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def create_fts(apps, schema_editor):
+    # FTS5 yoksa (ya da SQLite değilse) arama LIKE tabanlı yedek yola düşer
+    if not fts5_supported(schema_editor):
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0025_searchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0026_searchdocument_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64, unique=True)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('page_texts', models.TextField(default='[]')),
+                ('sections', models.TextField(default='{}')),
+                ('entities', models.TextField(default='{}')),
+                ('noun_chunks', models.TextField(default='[]')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
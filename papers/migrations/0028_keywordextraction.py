@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0027_documentanalysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordExtraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64)),
+                ('mode', models.CharField(default='nlp', max_length=10)),
+                ('keywords', models.TextField(default='[]')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('file_hash', 'mode'), name='unique_keywords_per_hash_mode')],
+            },
+        ),
+    ]
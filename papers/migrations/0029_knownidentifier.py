@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0028_keywordextraction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KnownIdentifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('name', 'İsim'), ('email', 'E-posta'), ('institution', 'Kurum')], default='name', max_length=20)),
+                ('value', models.CharField(max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'value'), name='unique_identifier_per_kind')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# anonymization.process_page_text içindeki eski sabit names_to_check listesi
+SEED_NAMES = [
+    "SUDHAKAR MISHRA",
+    "Diksha Kalra",
+    "S. Indu",
+    "MOHAMMAD ASIF",
+    "AJITHIA TEJAS VINODBHAI",
+    "MAJITHIA TEJAS VINODBHAI",
+    "UMA SHANKER TIWARY",
+]
+
+
+def seed_names(apps, schema_editor):
+    KnownIdentifier = apps.get_model('papers', 'KnownIdentifier')
+    KnownIdentifier.objects.bulk_create(
+        [KnownIdentifier(kind='name', value=name) for name in SEED_NAMES],
+        ignore_conflicts=True,
+    )
+
+
+def unseed_names(apps, schema_editor):
+    KnownIdentifier = apps.get_model('papers', 'KnownIdentifier')
+    KnownIdentifier.objects.filter(kind='name', value__in=SEED_NAMES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0029_knownidentifier'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_names, unseed_names),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0030_seed_knownidentifier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='details',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
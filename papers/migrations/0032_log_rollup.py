@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 16:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0031_log_details'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='log',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='LogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='log_rollups', to='papers.submission')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'submission', 'action'), name='unique_log_rollup')],
+            },
+        ),
+    ]
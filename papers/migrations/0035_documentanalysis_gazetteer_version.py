@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0034_submission_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentanalysis',
+            name='gazetteer_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0035_documentanalysis_gazetteer_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='anonymized_pdf_crc32',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='anonymized_pdf_mtime_ns',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='anonymized_pdf_size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:31
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0036_submission_anonymized_pdf_info'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='documentanalysis',
+            name='noun_chunks',
+        ),
+    ]
@@ -1,8 +1,12 @@
 # papers/models.py
-from django.db import models
+import json
+
+from django.db import models, transaction
 from django.utils import timezone
 from cryptography.fernet import Fernet
 
+from .zipstream import file_info
+
 FERNET_KEY = b'Z5eXdtiy1qQL1NIFVb5K7G4PXAz2NEzLjZN6g2xH6JA='
 
 def encrypt_filename(filename: str) -> str:
@@ -40,6 +44,20 @@ class Reviewer(models.Model):
         return f"{self.name} - {self.email}"
 
 
+class ReviewerProfile(models.Model):
+    """
+    Hakemin değerlendirdiği makalelerin metninden oluşan terim profili.
+    terms: {"terim": adet, ...} (JSON). Her yeni değerlendirmede artımlı güncellenir.
+    """
+    reviewer = models.OneToOneField(Reviewer, on_delete=models.CASCADE, related_name='profile')
+    terms = models.TextField(default='{}')
+    paper_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.reviewer.name} profili ({self.paper_count} makale)"
+
+
 STATUS_CHOICES = (
     ("Gönderildi", "Gönderildi"),
     ("Revize Gerekli", "Revize Gerekli"),
@@ -57,6 +75,11 @@ class Submission(models.Model):
     original_pdf = models.FileField(upload_to='uploads/')
     revised_pdf = models.FileField(upload_to='uploads/', null=True, blank=True)
     anonymized_pdf = models.FileField(upload_to='anonymized/', null=True, blank=True)
+    # anonymized_pdf yazılırken hesaplanır (record_anonymized_pdf); ZIP paketlerinin
+    # düzeni dosyaları okumadan bunlardan kurulur (bkz. zipstream.py)
+    anonymized_pdf_size = models.PositiveBigIntegerField(null=True, blank=True)
+    anonymized_pdf_crc32 = models.PositiveBigIntegerField(null=True, blank=True)
+    anonymized_pdf_mtime_ns = models.PositiveBigIntegerField(null=True, blank=True)
     final_pdf = models.FileField(upload_to='final/', null=True, blank=True)
     final_sent = models.BooleanField(default=False)  # Final PDF gönderildi mi?
     extracted_keywords = models.TextField(blank=True, null=True)
@@ -69,25 +92,191 @@ class Submission(models.Model):
     reviewed_pdf = models.FileField(upload_to='reviewed/', null=True, blank=True)  # Yeni alan
     anonymized_data = models.TextField(null=True, blank=True)
     restored = models.BooleanField(default=False)
+    # Her yazmada artar; editör panelindeki satır önbelleğinin anahtarı (id, version).
+    # save() dışında yazan yollar (update/bulk_update) version_bump() kullanır.
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
     def __str__(self):
         return f"{self.tracking_number} - {self.status}"
     def save(self, *args, **kwargs):
         if self.original_pdf and not self.encrypted_filename:
             self.encrypted_filename = encrypt_filename(self.original_pdf.name)
-        super().save(*args, **kwargs)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version', 'updated_at'}
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        # Artış SQL'de yapılır: aynı sürümden yüklenmiş iki nesnenin eş zamanlı
+        # save()'i aynı (id, version) anahtarını üretmez
+        self.version = models.F('version') + 1
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.refresh_from_db(fields=['version'])
+    def record_anonymized_pdf(self):
+        """anonymized_pdf diske yazıldıktan sonra, save()'den önce çağrılır."""
+        (self.anonymized_pdf_size, self.anonymized_pdf_crc32,
+         self.anonymized_pdf_mtime_ns) = file_info(self.anonymized_pdf.path)
     def get_decrypted_filename(self):
         if self.encrypted_filename:
             return decrypt_filename(self.encrypted_filename)
         return "N/A"
 
 
+def version_bump():
+    """Submission satırlarını save() olmadan yazarken eklenecek alanlar (update(**...) ya da bulk_update)."""
+    return {'version': models.F('version') + 1, 'updated_at': timezone.now()}
+
+
+class SubmissionSignature(models.Model):
+    """
+    Makalenin metninden hesaplanan MinHash imzası (uint32 dizisi, ham bayt).
+    Benzer makale (LSH) indeksi bu tablodan belleğe yüklenir.
+    """
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name='signature')
+    minhash = models.BinaryField()
+    shingle_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.submission.tracking_number} imzası ({self.shingle_count} shingle)"
+
+
+class SearchDocument(models.Model):
+    """
+    Editör araması için makale başına tek satırlık metin deposu.
+    SQLite'ta FTS5 sanal tablosu (papers_searchdocument_fts) bu tabloyu
+    tetikleyicilerle izler; diğer veritabanlarında doğrudan bu tablo sorgulanır.
+    """
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name='search_document')
+    body = models.TextField(blank=True, default='')
+    keywords = models.TextField(blank=True, default='')
+    review = models.TextField(blank=True, default='')
+    messages = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.submission.tracking_number} arama kaydı"
+
+
+class DocumentAnalysis(models.Model):
+    """
+    Bir PDF'in (içerik özetine göre) tek seferlik analiz sonucu: sayfa metinleri,
+    bölüm sınırları ve varlıklar. Aynı dosyanın sonraki anonimleştirmeleri
+    bu kaydı kullanır (bkz. analysis.py).
+    """
+    file_hash = models.CharField(max_length=64, unique=True)
+    page_count = models.PositiveIntegerField(default=0)
+    page_texts = models.TextField(default='[]')
+    sections = models.TextField(default='{}')
+    entities = models.TextField(default='{}')
+    # Sayfa modları ve varlıklar bilinen tanımlayıcı listesine bağlı (Gazetteer.version)
+    gazetteer_version = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.file_hash[:12]} ({self.page_count} sayfa)"
+
+    def to_analysis(self):
+        from .analysis import Analysis
+        return Analysis(
+            page_texts=json.loads(self.page_texts),
+            sections=json.loads(self.sections),
+            entities={int(k): v for k, v in json.loads(self.entities).items()},
+            file_hash=self.file_hash,
+        )
+
+
+class KeywordExtraction(models.Model):
+    """
+    PDF içerik özeti başına anahtar kelime önbelleği. Aynı baytlar tekrar
+    yüklendiğinde anahtar kelimeler yeniden çıkarılmaz.
+    """
+    file_hash = models.CharField(max_length=64)
+    mode = models.CharField(max_length=10, default='nlp')
+    keywords = models.TextField(default='[]')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['file_hash', 'mode'], name='unique_keywords_per_hash_mode'),
+        ]
+
+    def __str__(self):
+        return f"{self.file_hash[:12]} ({self.mode})"
+
+    def get_keywords(self):
+        return json.loads(self.keywords)
+
+
+IDENTIFIER_KIND_CHOICES = (
+    ("name", "İsim"),
+    ("email", "E-posta"),
+    ("institution", "Kurum"),
+)
+
+
+class KnownIdentifier(models.Model):
+    """
+    Anonimleştirmede her sayfada aranacak bilinen yazar isimleri, e-postalar ve
+    kurumlar. Editörler admin panelinden yönetir; tablo tek bir Aho-Corasick
+    otomatına derlenir (bkz. gazetteer.py).
+    """
+    kind = models.CharField(max_length=20, choices=IDENTIFIER_KIND_CHOICES, default="name")
+    value = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'value'], name='unique_identifier_per_kind'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.value}"
+
+
 class Log(models.Model):
     submission = models.ForeignKey(Submission, on_delete=models.CASCADE)
     action = models.CharField(max_length=200)
-    timestamp = models.DateTimeField(default=timezone.now)
+    # editor_logs sıralaması ve arşivleme (retention.py) zamana göre tarar
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    # İşlemin aşama süreleri vb. (JSON, bkz. metrics.py); yoksa boş
+    details = models.TextField(blank=True, default='')
     def __str__(self):
         return f"{self.submission.tracking_number} | {self.action} | {self.timestamp}"
 
+    def get_details(self):
+        return json.loads(self.details) if self.details else {}
+
+    @property
+    def duration(self):
+        """İşlemin toplam süresi (sn); ölçüm yoksa None."""
+        return self.get_details().get('wall')
+
+    @property
+    def budget_tier(self):
+        """Anonimleştirme süre bütçesi yüzünden inilen kademe (bkz. budget.py); tam çalışmada None."""
+        tier = self.get_details().get('budget', {}).get('tier')
+        return tier if tier and tier != 'full' else None
+
+class LogRollup(models.Model):
+    """
+    Arşivlenen Log satırlarının (bkz. retention.py) gün, makale ve işlem türü
+    başına sayısı. Log tablosunda kalan yeni kayıtlarla birlikte tam geçmişin
+    sayımını verir; satırların kendisi arşiv dosyalarındadır.
+    """
+    day = models.DateField()
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='log_rollups')
+    action = models.CharField(max_length=100)    # retention.action_key() ile normalleştirilmiş
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'submission', 'action'], name='unique_log_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} | {self.submission_id} | {self.action}: {self.count}"
+
 class Message(models.Model):
     submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='messages')
     sender = models.CharField(max_length=50)
@@ -96,3 +285,18 @@ class Message(models.Model):
     timestamp = models.DateTimeField(default=timezone.now)
     def __str__(self):
         return f"{self.sender} ({self.sender_email}): {self.content[:30]}"
+
+
+class PendingFileDeletion(models.Model):
+    """
+    Silinmesi arka plana bırakılmış medya dosyası (storage adı, ör. "uploads/x.pdf").
+    Toplu silmede satırlar silinirken dosyalar buraya yazılır; bulk.sweep_file_deletions
+    dosyaları siler ve satırı kaldırır. Hâlâ bir makalenin kullandığı dosyaya dokunulmaz.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return self.name
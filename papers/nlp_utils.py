@@ -1,46 +1,192 @@
-import fitz  # PyMuPDF
+import logging
 import re
-import spacy
-from collections import Counter
+from collections import Counter, defaultdict
 
-# spaCy modelini yükleyin (en_core_web_sm modelinin kurulu olduğundan emin olun)
-nlp = spacy.load("en_core_web_sm")
+from .text_utils import STOPWORDS
 
-def extract_keywords_from_pdf_advanced(pdf_path, top_n=10):
-    text_content = ""
-    try:
-        doc = fitz.open(pdf_path)
-        text_content = "\n".join(page.get_text("text") for page in doc)
-        doc.close()
-    except Exception as e:
-        print("PDF metni çıkarma hatası:", e)
-        return []
-    
-    text_content = re.sub(r'\s+', ' ', text_content)
-    candidate_headers = ["keywords", "index terms", "anahtar kelimeler", "keywords-component"]
-    abstract_pattern = re.compile(r'(?i)(Abstract|Özet)(.*?)(Introduction|Giriş)', re.DOTALL)
-    abstract_match = abstract_pattern.search(text_content)
-    if abstract_match:
-        abstract_text = abstract_match.group(2)
-    else:
-        abstract_text = text_content
-    
-    keywords_text = None
-    for header in candidate_headers:
-        pattern = re.compile(re.escape(header) + r"[\s:\-–—]+(.+?)(?=\s+[A-Z0-9]+\s*\.|$)", re.IGNORECASE)
-        m = pattern.search(abstract_text)
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "en_core_web_sm"
+
+ABSTRACT_WINDOW_REGEX = re.compile(r'(?i)(Abstract|Özet)(.*?)(Introduction|Giriş)', re.DOTALL)
+KEYWORD_HEADERS = ["keywords", "index terms", "anahtar kelimeler", "keywords-component"]
+KEYWORD_PATTERNS = [
+    re.compile(re.escape(header) + r"[\s:\-–—]+(.+?)(?=\s+[A-Z0-9]+\s*\.|$)", re.IGNORECASE)
+    for header in KEYWORD_HEADERS
+]
+
+# Anahtar kelime/Abstract penceresi için en fazla taranacak sayfa
+MAX_SCAN_PAGES = 10
+# Başlık bulunamazsa ayrıştırılacak metin penceresinin üst sınırı (karakter)
+MAX_WINDOW_CHARS = 20000
+# nlp.pipe'a verilecek parça boyutu; spaCy max_length sınırının çok altında
+PIPE_CHUNK_CHARS = 5000
+
+# RAKE için ek İngilizce dolgu kelimeleri
+RAKE_STOPWORDS = STOPWORDS | {
+    "about", "also", "all", "am", "any", "been", "being", "both", "but", "can",
+    "could", "did", "do", "does", "each", "few", "had", "has", "have", "here",
+    "how", "if", "more", "most", "much", "must", "no", "not", "one", "only",
+    "other", "over", "paper", "proposed", "results", "show", "shows", "such",
+    "than", "their", "them", "then", "there", "they", "those", "through", "two",
+    "under", "use", "used", "very", "well", "what", "when", "where", "while",
+    "who", "will", "within", "would", "new", "between", "study", "method",
+}
+RAKE_SPLIT_REGEX = re.compile(r'[.,;:!?()\[\]{}"“”\'‘’/|\n\t]+|\s[-–—]\s')
+RAKE_WORD_REGEX = re.compile(r"[^\W\d_][\w\-]*", re.UNICODE)
+
+_nlp = None
+
+
+def get_nlp():
+    """spaCy modelini ilk ihtiyaçta bir kez yükler (tüm modüller aynı örneği paylaşır)."""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load(SPACY_MODEL)
+    return _nlp
+
+
+def iter_page_texts(pdf_path, max_pages=None):
+    """PDF sayfalarını tembel olarak okur; tüketici durduğunda belge kapanır."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        count = len(doc) if max_pages is None else min(max_pages, len(doc))
+        for i in range(count):
+            yield doc[i].get_text("text")
+
+
+def find_keywords_text(text):
+    """
+    Metinde "Keywords/Anahtar Kelimeler" satırını arar.
+    Eşleşmenin metin sonuna dayanıp dayanmadığını da döndürür: akış halinde
+    okurken sona dayanan bir eşleşme bir sonraki sayfada devam edebilir.
+    """
+    for pattern in KEYWORD_PATTERNS:
+        m = pattern.search(text)
         if m:
-            keywords_text = m.group(1).strip()
+            return m.group(1).strip(), m.end() >= len(text.rstrip())
+    return None, False
+
+
+def scan_keyword_window(page_texts, max_pages=MAX_SCAN_PAGES):
+    """
+    Sayfaları sırayla okur; Abstract...Introduction penceresi bulunduğu anda
+    durur. Dönüş: (anahtar_kelime_satırı veya None, sınırlı metin penceresi).
+    """
+    buffer = ""
+    for count, text in enumerate(page_texts, start=1):
+        buffer = f"{buffer} {text}" if buffer else text
+        normalized = re.sub(r'\s+', ' ', buffer)
+        abstract_match = ABSTRACT_WINDOW_REGEX.search(normalized)
+        if abstract_match:
+            abstract_text = abstract_match.group(2)
+            keywords_text, _ = find_keywords_text(abstract_text)
+            return keywords_text, abstract_text[:MAX_WINDOW_CHARS]
+        keywords_text, at_end = find_keywords_text(normalized)
+        if keywords_text and not at_end:
+            return keywords_text, normalized[:MAX_WINDOW_CHARS]
+        if count >= max_pages:
             break
+    normalized = re.sub(r'\s+', ' ', buffer)
+    keywords_text, _ = find_keywords_text(normalized)
+    return keywords_text, normalized[:MAX_WINDOW_CHARS]
+
+
+def split_keywords_line(keywords_text):
+    keywords_text = re.split(r'\s+[A-Z0-9]+\s*\.', keywords_text)[0]
+    keywords = [kw.strip() for kw in re.split(r'[;,]', keywords_text) if kw.strip()]
+    return [kw for kw in keywords if kw.lower() != "component"]
+
+
+def _pipe_chunks(text, size=PIPE_CHUNK_CHARS):
+    """Metni cümle sınırlarından, size karakteri aşmayan parçalara böler."""
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = text.rfind(". ", start, end)
+            if cut > start:
+                end = cut + 1
+        yield text[start:end]
+        start = end
+
+
+def noun_chunks_from_window(window, nlp=None):
+    """Sınırlı pencereyi nlp.pipe ile (NER kapalı) ayrıştırıp isim öbeklerini döndürür."""
+    nlp = nlp or get_nlp()
+    disable = [name for name in nlp.pipe_names if name in ("ner", "lemmatizer")]
+    chunks = []
+    for parsed in nlp.pipe(_pipe_chunks(window), disable=disable):
+        chunks.extend(chunk.text.strip() for chunk in parsed.noun_chunks if len(chunk.text.strip()) > 2)
+    return chunks
+
+
+def rake_keywords(text, top_n=10, max_words=4):
+    """
+    RAKE benzeri istatistiksel puanlama (bağımlılık ayrıştırması yok):
+    metin noktalama ve dolgu kelimelerinden aday öbeklere bölünür, kelime
+    puanı derece/frekans, öbek puanı kelime puanlarının toplamıdır.
+    """
+    phrases = []
+    for fragment in RAKE_SPLIT_REGEX.split(text):
+        current = []
+        for word in RAKE_WORD_REGEX.findall(fragment):
+            if word.lower() in RAKE_STOPWORDS or len(word) < 2:
+                if current:
+                    phrases.append(current)
+                current = []
+            else:
+                current.append(word)
+        if current:
+            phrases.append(current)
+    phrases = [p for p in phrases if len(p) <= max_words]
+
+    freq, degree = Counter(), Counter()
+    for phrase in phrases:
+        for word in phrase:
+            key = word.lower()
+            freq[key] += 1
+            degree[key] += len(phrase)
+
+    scores = defaultdict(float)
+    surface = {}
+    for phrase in phrases:
+        key = " ".join(w.lower() for w in phrase)
+        if len(key) <= 2:
+            continue
+        scores[key] = sum(degree[w.lower()] / freq[w.lower()] for w in phrase)
+        surface.setdefault(key, " ".join(phrase))
+    # Tekrar eden öbekler bir miktar ödüllendirilir
+    counts = Counter(" ".join(w.lower() for w in p) for p in phrases)
+    ranked = sorted(scores, key=lambda k: (scores[k] * (1 + 0.1 * (counts[k] - 1)), counts[k]), reverse=True)
+    return [surface[k] for k in ranked[:top_n]]
+
+
+def extract_keywords_from_pdf_advanced(pdf_path, top_n=10, analysis=None, mode="nlp"):
+    """
+    mode="nlp": başlık yoksa sınırlı pencerede spaCy isim öbekleri.
+    mode="fast": başlık yoksa ayrıştırıcısız RAKE puanlaması.
+    analysis: aynı dosyanın ortak analizi (analysis.Analysis); verilirse PDF
+    yeniden okunmaz. Verilmezse sayfalar akış halinde okunur ve pencere
+    bulunduğunda okuma durur.
+    """
+    try:
+        if analysis is not None:
+            keywords_text, window = scan_keyword_window(iter(analysis.page_texts))
+        else:
+            keywords_text, window = scan_keyword_window(iter_page_texts(pdf_path))
+    except Exception:
+        logger.warning("PDF metni çıkarılamadı: %s", pdf_path, exc_info=True)
+        return []
 
     if keywords_text:
-        keywords_text = re.split(r'\s+[A-Z0-9]+\s*\.', keywords_text)[0]
-        keywords = [kw.strip() for kw in re.split(r'[;,]', keywords_text) if kw.strip()]
-        keywords = [kw for kw in keywords if kw.lower() != "component"]
-        return keywords
-
-    doc_nlp = nlp(text_content)
-    noun_chunks = [chunk.text.strip() for chunk in doc_nlp.noun_chunks if len(chunk.text.strip()) > 2]
-    freq = Counter(noun_chunks)
+        return split_keywords_line(keywords_text)
+
+    if mode == "fast":
+        return rake_keywords(window, top_n=top_n)
+
+    freq = Counter(noun_chunks_from_window(window))
     top_keywords = [kw for kw, count in freq.most_common(top_n)]
     return top_keywords
@@ -0,0 +1,69 @@
+"""
+Yükleme sonrası arka plan aşaması: anahtar kelime çıkarma (PDF içerik
+özetine göre önbellekli) ve benzer makale imzası.
+"""
+import json
+
+from django.conf import settings
+from django.db import IntegrityError
+
+from . import audit, metrics
+from .analysis import file_hash
+from .dedup import index_submission
+from .models import KeywordExtraction, Submission
+from .nlp_utils import extract_keywords_from_pdf_advanced
+
+
+def keyword_mode():
+    return getattr(settings, 'KEYWORD_EXTRACTION_MODE', 'nlp')
+
+
+def cached_keywords(pdf_path, digest=None, mode=None):
+    """
+    PDF'in anahtar kelimelerini önbellekten döndürür; yoksa çıkarıp kaydeder.
+    Dönüş: (anahtar_kelimeler, önbellekten_mi)
+    """
+    mode = mode or keyword_mode()
+    digest = digest or file_hash(pdf_path)
+    cached = KeywordExtraction.objects.filter(file_hash=digest, mode=mode).first()
+    if cached is not None:
+        return cached.get_keywords(), True
+
+    with metrics.stage("keyword_extraction"):
+        keywords = extract_keywords_from_pdf_advanced(pdf_path, mode=mode)
+    store_keywords(digest, mode, keywords)
+    return keywords, False
+
+
+def store_keywords(digest, mode, keywords):
+    try:
+        KeywordExtraction.objects.create(
+            file_hash=digest, mode=mode, keywords=json.dumps(keywords, ensure_ascii=False)
+        )
+    except IntegrityError:
+        # Aynı dosya eş zamanlı olarak başka bir işte çıkarılmış
+        pass
+
+
+def process_uploaded_submission(submission_id):
+    """upload_paper/revise_paper sonrasında arka planda çalışır."""
+    sub = Submission.objects.filter(id=submission_id).first()
+    if sub is None:
+        return
+    pdf = sub.revised_pdf or sub.original_pdf
+    if not pdf:
+        return
+
+    with metrics.run("keywords") as run:
+        keywords, from_cache = cached_keywords(pdf.path)
+    if keywords:
+        sub.extracted_keywords = ", ".join(keywords)
+        sub.save(update_fields=['extracted_keywords'])
+        action = "Anahtar kelimeler çıkarıldı (otomatik"
+        action += ", önbellekten)" if from_cache else ")"
+        audit.log(sub, action, details=run.to_json())
+
+    similar = index_submission(sub)
+    if similar:
+        found = ", ".join(f"{s.tracking_number} (%{score * 100:.0f})" for s, score in similar[:3])
+        audit.log(sub, f"Benzer makale tespit edildi: {found}"[:200])
@@ -0,0 +1,79 @@
+"""
+NER öncesi ucuz sayfa sınıflandırıcısı.
+
+Her işlenecek sayfa için metin katmanının büyüklüğü, büyük harfle başlayan
+kelime yoğunluğu, "@" varlığı, kurum kelimeleri ve bilinen isim listesi
+(gazetteer) eşleşmelerine bakılarak üç moddan biri seçilir:
+
+    "ner"   -> spaCy NER + regex (isim/kurum içerebilecek sayfalar)
+    "regex" -> sadece regex ve isim listesi (denklem, tablo, düz metin sayfaları)
+    "image" -> metin katmanı yok; doğrudan görsel (bulanıklaştırma) yoluna gider
+"""
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MODE_NER = "ner"
+MODE_REGEX = "regex"
+MODE_IMAGE = "image"
+
+# Bundan az (boşluksuz) karakter içeren sayfa taranmış/görsel sayfa kabul edilir
+MIN_TEXT_CHARS = 20
+# Bundan az kelimeli sayfalarda (denklem, tablo) NER anlamlı bir şey bulmaz
+MIN_WORD_TOKENS = 15
+# Baş harfi büyük kelimelerin oranı bu eşiği geçerse sayfada özel isim olabilir.
+# Örnek makalelerde gövde sayfaları 0.06-0.10, başlık/biyografi sayfaları 0.16+
+CAPITALIZED_DENSITY = 0.12
+
+WORD_REGEX = re.compile(r"[^\W\d_]+", re.UNICODE)
+AFFILIATION_REGEX = re.compile(
+    r"universit|institut|üniversite|enstitü|fakülte|faculty|department|laborator",
+    re.IGNORECASE,
+)
+
+
+def has_text_layer(text):
+    """Sayfanın (tamamının) metin katmanı var mı; yoksa taranmış/görsel sayfadır."""
+    return len("".join(text.split())) >= MIN_TEXT_CHARS
+
+
+def page_features(text, gazetteer=None):
+    words = WORD_REGEX.findall(text)
+    capitalized = sum(1 for w in words if len(w) > 1 and w[0].isupper() and w[1:].islower())
+    return {
+        "chars": len("".join(text.split())),
+        "words": len(words),
+        "capitalized_density": capitalized / len(words) if words else 0.0,
+        "has_at": "@" in text,
+        "affiliation": bool(AFFILIATION_REGEX.search(text)),
+        "known_identifiers": len(gazetteer.find(text)) if gazetteer is not None else 0,
+    }
+
+
+def classify_page(text, gazetteer=None):
+    """Dönüş: (mod, gerekçe). gazetteer: bilinen tanımlayıcılar (gazetteer.Gazetteer)"""
+    f = page_features(text, gazetteer)
+    if f["chars"] < MIN_TEXT_CHARS:
+        return MODE_IMAGE, "metin katmanı yok"
+    if f["has_at"]:
+        return MODE_NER, "e-posta işareti"
+    if f["known_identifiers"]:
+        return MODE_NER, "bilinen isim/kurum"
+    if f["affiliation"]:
+        return MODE_NER, "kurum kelimesi"
+    if f["words"] < MIN_WORD_TOKENS:
+        return MODE_REGEX, f"az kelime ({f['words']})"
+    if f["capitalized_density"] >= CAPITALIZED_DENSITY:
+        return MODE_NER, f"büyük harf yoğunluğu {f['capitalized_density']:.2f}"
+    return MODE_REGEX, f"büyük harf yoğunluğu {f['capitalized_density']:.2f}"
+
+
+def classify_pages(page_texts, gazetteer=None):
+    """{sayfa_indeksi: metin} -> {sayfa_indeksi: mod}; kararlar log'a yazılır."""
+    modes = {}
+    for i, text in page_texts.items():
+        mode, reason = classify_page(text, gazetteer)
+        logger.info("Sayfa %d: %s (%s)", i, mode, reason)
+        modes[i] = mode
+    return modes
@@ -0,0 +1,229 @@
+"""
+Hakemlerin geçmişte değerlendirdiği makalelere göre içerik tabanlı hakem önerisi.
+
+Her hakem için seyrek bir terim vektörü (ReviewerProfile) tutulur. Bellekteki
+indeks bu profilleri terim-ana (CSC benzeri) diziler halinde saklar; bir sorgu
+sadece sorgudaki terimlerin posting listelerine dokunur ve tüm hakemlerin
+kosinüs benzerliği tek bir np.bincount ile hesaplanır.
+"""
+import json
+import logging
+import threading
+from collections import Counter
+
+import numpy as np
+
+from .text_utils import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Bir hakem profilinde saklanacak en fazla terim sayısı (seyrekliği korur)
+MAX_PROFILE_TERMS = 2000
+# Bir makalenin sorgu/profil vektörüne katkı yapan en fazla terim sayısı
+MAX_DOCUMENT_TERMS = 500
+# Profil oluşturmak için okunacak sayfa sayısı
+PROFILE_PAGES = 5
+
+
+def document_terms(text, limit=MAX_DOCUMENT_TERMS):
+    """Metnin en sık geçen terimlerini {terim: adet} olarak döndürür."""
+    return dict(Counter(tokenize(text)).most_common(limit))
+
+
+class ReviewerIndex:
+    def __init__(self):
+        self.vocabulary = {}          # terim -> id
+        self.rows = {}                # reviewer_id -> (term_ids, counts)
+        self._compiled = None
+        self._lock = threading.Lock()
+
+    def _term_ids(self, terms, grow):
+        ids, counts = [], []
+        for term, count in terms.items():
+            tid = self.vocabulary.get(term)
+            if tid is None:
+                if not grow:
+                    continue
+                tid = self.vocabulary[term] = len(self.vocabulary)
+            ids.append(tid)
+            counts.append(count)
+        return np.asarray(ids, dtype=np.int64), np.asarray(counts, dtype=np.float32)
+
+    def set_profile(self, reviewer_id, terms):
+        """Hakemin profilini (tamamını) değiştirir."""
+        with self._lock:
+            self.rows[reviewer_id] = self._term_ids(terms, grow=True)
+            self._compiled = None
+
+    def add_document(self, reviewer_id, terms):
+        """Hakemin profiline yeni bir makalenin terimlerini ekler (artımlı)."""
+        with self._lock:
+            new_ids, new_counts = self._term_ids(terms, grow=True)
+            old_ids, old_counts = self.rows.get(
+                reviewer_id, (np.empty(0, np.int64), np.empty(0, np.float32))
+            )
+            ids = np.concatenate([old_ids, new_ids])
+            counts = np.concatenate([old_counts, new_counts])
+            uniq, inverse = np.unique(ids, return_inverse=True)
+            merged = np.bincount(inverse, weights=counts).astype(np.float32)
+            if len(uniq) > MAX_PROFILE_TERMS:
+                keep = np.argpartition(-merged, MAX_PROFILE_TERMS - 1)[:MAX_PROFILE_TERMS]
+                uniq, merged = uniq[keep], merged[keep]
+            self.rows[reviewer_id] = (uniq, merged)
+            self._compiled = None
+
+    def _compile(self):
+        """Profilleri terim-ana dizilere dönüştürür: term_ptr, reviewer satırı, ağırlık."""
+        reviewer_ids = np.fromiter(self.rows.keys(), dtype=np.int64, count=len(self.rows))
+        n_terms = len(self.vocabulary)
+        if not len(reviewer_ids):
+            return reviewer_ids, np.zeros(n_terms + 1, np.int64), np.empty(0, np.int64), np.empty(0, np.float32), np.ones(n_terms, np.float32)
+
+        lengths = np.fromiter((len(ids) for ids, _ in self.rows.values()), dtype=np.int64, count=len(self.rows))
+        term_ids = np.concatenate([ids for ids, _ in self.rows.values()])
+        counts = np.concatenate([c for _, c in self.rows.values()])
+        row_of_entry = np.repeat(np.arange(len(reviewer_ids)), lengths)
+
+        df = np.bincount(term_ids, minlength=n_terms)
+        idf = (np.log((1.0 + len(reviewer_ids)) / (1.0 + df)) + 1.0).astype(np.float32)
+        weights = (1.0 + np.log(counts)) * idf[term_ids]
+
+        norms = np.sqrt(np.bincount(row_of_entry, weights=weights * weights, minlength=len(reviewer_ids)))
+        norms[norms == 0] = 1.0
+        weights = weights / norms[row_of_entry]
+
+        order = np.argsort(term_ids, kind="stable")
+        term_ptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=n_terms), out=term_ptr[1:])
+        return reviewer_ids, term_ptr, row_of_entry[order], weights[order].astype(np.float32), idf
+
+    def rank(self, terms, top_k=5, exclude=()):
+        """
+        terms: {terim: adet} biçiminde sorgu.
+        Dönüş: [(reviewer_id, kosinüs_benzerliği), ...] azalan sırada.
+        """
+        with self._lock:
+            if self._compiled is None:
+                self._compiled = self._compile()
+            reviewer_ids, term_ptr, entry_rows, entry_weights, idf = self._compiled
+            tids, qcounts = self._term_ids(terms, grow=False)
+            unknown = np.asarray([c for t, c in terms.items() if t not in self.vocabulary], dtype=np.float32)
+        if not len(reviewer_ids) or not len(tids):
+            return []
+
+        qweights = (1.0 + np.log(qcounts)) * idf[tids]
+        # İndekste hiç geçmeyen terimler skora katkı yapmaz ama sorgu normuna girer
+        unknown_weights = (1.0 + np.log(unknown)) * (np.log(1.0 + len(reviewer_ids)) + 1.0)
+        qweights /= np.sqrt(np.dot(qweights, qweights) + np.dot(unknown_weights, unknown_weights)) or 1.0
+
+        # Sorgu terimlerinin posting dilimlerini tek seferde topla
+        starts, ends = term_ptr[tids], term_ptr[tids + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return []
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        scores = np.bincount(
+            entry_rows[offsets],
+            weights=entry_weights[offsets] * np.repeat(qweights, lengths),
+            minlength=len(reviewer_ids),
+        )
+
+        if exclude:
+            scores[np.isin(reviewer_ids, list(exclude))] = 0.0
+        k = min(top_k, len(reviewer_ids))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(reviewer_ids[i]), float(scores[i])) for i in best if scores[i] > 0]
+
+
+# --- Süreç içi indeks (ilk kullanımda veritabanından yüklenir) ---
+_index = None
+_fingerprint = None
+_index_lock = threading.Lock()
+
+
+def _current_fingerprint():
+    from django.db.models import Count, Max
+    from .models import ReviewerProfile
+
+    agg = ReviewerProfile.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return agg['count'], agg['latest']
+
+
+def get_index():
+    """
+    İndeksi döndürür. Diğer süreçlerde (başka bir worker,
+    rebuild_reviewer_profiles) güncellenen profiller tek bir aggregate
+    sorgusuyla fark edilir: değişen profiller yeniden okunur, silinen varsa
+    indeks baştan yüklenir.
+    """
+    global _index, _fingerprint
+    fingerprint = _current_fingerprint()
+    if _index is not None and fingerprint == _fingerprint:
+        return _index
+    with _index_lock:
+        if _index is not None and fingerprint == _fingerprint:
+            return _index
+        from .models import ReviewerProfile
+
+        rows = ReviewerProfile.objects.values_list('reviewer_id', 'terms')
+        count, latest = fingerprint
+        index = _index
+        if index is not None and _fingerprint[1] is not None:
+            for reviewer_id, terms in rows.filter(updated_at__gte=_fingerprint[1]).iterator():
+                index.set_profile(reviewer_id, json.loads(terms))
+        if index is None or len(index.rows) != count:
+            index = ReviewerIndex()
+            for reviewer_id, terms in rows.iterator():
+                index.set_profile(reviewer_id, json.loads(terms))
+        _index, _fingerprint = index, fingerprint
+    return _index
+
+
+def paper_text(submission, max_pages=PROFILE_PAGES):
+    """Makalenin profil/sorgu metni: anahtar kelimeler + (anonim) PDF'in ilk sayfaları."""
+    from .text_utils import read_pdf_text
+
+    pdf = submission.anonymized_pdf or submission.revised_pdf or submission.original_pdf
+    parts = [submission.extracted_keywords or ""]
+    if pdf:
+        try:
+            parts.append(read_pdf_text(pdf.path, max_pages=max_pages))
+        except Exception:
+            logger.exception("Makale metni okunamadı: %s", submission.tracking_number)
+    return "\n".join(parts)
+
+
+def update_reviewer_profile(reviewer, text):
+    """
+    Değerlendirme kaydedildiğinde çağrılır: makalenin terimleri hakemin
+    profiline eklenir, bellekteki indeks de aynı anda güncellenir. Profil
+    satırı kilitlenerek okunur; aynı anda biten iki değerlendirme birbirinin
+    terimlerini ezmez.
+    """
+    from django.db import transaction
+    from .models import ReviewerProfile
+
+    terms = document_terms(text)
+    if not terms:
+        return
+    with transaction.atomic():
+        ReviewerProfile.objects.get_or_create(reviewer=reviewer)
+        profile = ReviewerProfile.objects.select_for_update().get(reviewer=reviewer)
+        merged = Counter(json.loads(profile.terms or '{}'))
+        merged.update(terms)
+        merged = dict(merged.most_common(MAX_PROFILE_TERMS))
+        profile.terms = json.dumps(merged, ensure_ascii=False)
+        profile.paper_count += 1
+        profile.save()
+    get_index().set_profile(reviewer.id, merged)
+
+
+def recommend_reviewers(submission, top_k=5):
+    """Makale için içerik benzerliğine göre hakem önerir: [(Reviewer, puan), ...]"""
+    from .models import Reviewer
+
+    ranked = get_index().rank(document_terms(paper_text(submission)), top_k=top_k)
+    reviewers = Reviewer.objects.in_bulk([rid for rid, _ in ranked])
+    return [(reviewers[rid], score) for rid, score in ranked if rid in reviewers]
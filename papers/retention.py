@@ -0,0 +1,184 @@
+"""
+Log kayıtlarının saklama süresi ve arşivlenmesi.
+
+settings.LOG_RETENTION_DAYS günden eski Log satırları aylık, gzip ile
+sıkıştırılmış JSONL segmentlerine (LOG_ARCHIVE_DIR/logs-YYYY-MM.jsonl.gz)
+taşınır ve tablodan silinir. Her çalıştırma segmentin sonuna yeni bir gzip
+üyesi ekler (gzip.open çok üyeli dosyaları tek akış olarak okur).
+Silinen satırlar gün, makale ve işlem türü başına LogRollup tablosunda
+sayılır; rollup güncellemesi ve silme aynı transaction'dadır.
+
+Segment yazıldıktan sonra silme tamamlanmadan süreç düşerse aynı satırlar
+bir sonraki çalıştırmada tekrar yazılır; iter_archived_logs segment içinde
+id'ye göre tekrarları atlar.
+"""
+import gzip
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+SEGMENT_REGEX = re.compile(r"^logs-(\d{4})-(\d{2})\.jsonl\.gz$")
+# Değişken kısımları olan işlemler rollup'ta tek türde toplanır
+ACTION_PATTERNS = [
+    (re.compile(r"^Hakem .* değerlendirme yaptı$"), "Hakem değerlendirme yaptı"),
+]
+
+
+def archive_dir():
+    return getattr(settings, "LOG_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "archive", "logs"))
+
+
+def retention_days():
+    return getattr(settings, "LOG_RETENTION_DAYS", 180)
+
+
+def action_key(action):
+    """"Hakeme atandı: Ali Veli" -> "Hakeme atandı" (rollup işlem türü)."""
+    for pattern, key in ACTION_PATTERNS:
+        if pattern.match(action):
+            return key
+    return re.split(r"[:(]", action, maxsplit=1)[0].strip()[:100]
+
+
+def segment_path(year, month):
+    return os.path.join(archive_dir(), f"logs-{year:04d}-{month:02d}.jsonl.gz")
+
+
+def _append_segment(path, records):
+    """Kayıtları segmentin sonuna yeni bir gzip üyesi olarak ekler ve diske yazar."""
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+            for record in records:
+                gz.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _merge_rollups(counts):
+    """counts: {(gün, makale_id, işlem): adet}; mevcut satırlara eklenir."""
+    from .models import LogRollup
+
+    if not counts:
+        return
+    days = {day for day, _, _ in counts}
+    submissions = {submission_id for _, submission_id, _ in counts}
+    existing = {
+        (row.day, row.submission_id, row.action): row.count
+        for row in LogRollup.objects.filter(day__in=days, submission_id__in=submissions)
+    }
+    LogRollup.objects.bulk_create(
+        [
+            LogRollup(day=day, submission_id=submission_id, action=action,
+                      count=existing.get((day, submission_id, action), 0) + count)
+            for (day, submission_id, action), count in counts.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["day", "submission", "action"],
+        update_fields=["count"],
+    )
+
+
+def archive_logs(days=None, batch_size=5000, dry_run=False):
+    """
+    days günden eski Log satırlarını arşivler.
+    {"cutoff", "rows", "segments": {"YYYY-MM": adet}, "rollups"} döndürür.
+    """
+    from .models import Log
+
+    days = retention_days() if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    old = Log.objects.filter(timestamp__lt=cutoff)
+    stats = {"cutoff": cutoff.isoformat(), "rows": 0, "segments": Counter(), "rollups": 0}
+    if dry_run:
+        stats["rows"] = old.count()
+        return stats
+
+    os.makedirs(archive_dir(), exist_ok=True)
+    while True:
+        batch = list(
+            old.order_by("id").values(
+                "id", "submission_id", "submission__tracking_number", "action", "timestamp", "details",
+            )[:batch_size]
+        )
+        if not batch:
+            break
+        by_month = defaultdict(list)
+        counts = Counter()
+        for row in batch:
+            local = timezone.localtime(row["timestamp"])
+            by_month[(local.year, local.month)].append({
+                "id": row["id"],
+                "submission_id": row["submission_id"],
+                "tracking_number": row["submission__tracking_number"],
+                "action": row["action"],
+                "timestamp": row["timestamp"].isoformat(),
+                "details": row["details"],
+            })
+            counts[(local.date(), row["submission_id"], action_key(row["action"]))] += 1
+
+        for (year, month), records in sorted(by_month.items()):
+            _append_segment(segment_path(year, month), records)
+            stats["segments"][f"{year:04d}-{month:02d}"] += len(records)
+
+        with transaction.atomic():
+            _merge_rollups(counts)
+            # Parti id sırasıyla alındı: aralıktaki eski satırlar tam olarak bu partidir
+            Log.objects.filter(id__gte=batch[0]["id"], id__lte=batch[-1]["id"], timestamp__lt=cutoff).delete()
+        stats["rows"] += len(batch)
+        stats["rollups"] += len(counts)
+    return stats
+
+
+def _segments(since=None, until=None):
+    """[(yıl, ay, yol)] ay sırasıyla; since/until (date) aralığı dışındaki aylar atlanır."""
+    directory = archive_dir()
+    if not os.path.isdir(directory):
+        return []
+    segments = []
+    for name in os.listdir(directory):
+        match = SEGMENT_REGEX.match(name)
+        if not match:
+            continue
+        year, month = int(match.group(1)), int(match.group(2))
+        if since is not None and (year, month) < (since.year, since.month):
+            continue
+        if until is not None and (year, month) > (until.year, until.month):
+            continue
+        segments.append((year, month, os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def iter_archived_logs(since=None, until=None, tracking_number=None, contains=None):
+    """
+    Arşivdeki Log kayıtlarını ay sırasıyla, ay içinde id sırasıyla akış hâlinde
+    döndürür (bellekte yalnızca bir satır ve segmentin id kümesi tutulur).
+    since/until: date (dahil); contains: işlem metninde büyük/küçük harf duyarsız arama.
+    """
+    needle = contains.lower() if contains else None
+    for _, _, path in _segments(since, until):
+        seen = set()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["id"] in seen:
+                    continue
+                seen.add(record["id"])
+                if tracking_number and record["tracking_number"] != tracking_number:
+                    continue
+                if needle and needle not in record["action"].lower():
+                    continue
+                if since is not None or until is not None:
+                    day = timezone.localtime(datetime.fromisoformat(record["timestamp"])).date()
+                    if (since is not None and day < since) or (until is not None and day > until):
+                        continue
+                yield record
+
+
+def parse_day(value):
+    return date.fromisoformat(value) if value else None
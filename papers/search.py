@@ -0,0 +1,198 @@
+"""
+Makale içerikleri, anahtar kelimeler, hakem değerlendirmeleri ve mesajlar
+üzerinde tam metin arama.
+
+SQLite'ta FTS5 sanal tablosu (bkz. 0026_searchdocument_fts) kullanılır ve
+sonuçlar bm25 ile sıralanıp snippet() ile özetlenir. FTS5 olmayan
+veritabanlarında aynı arayüz SearchDocument üzerinde icontains sorgusuna düşer.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import Case, F, Q, TextField, Value, When
+from django.db.models.functions import Concat
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import SearchDocument, Submission
+
+FTS_TABLE = 'papers_searchdocument_fts'
+SEARCH_FIELDS = ('body', 'keywords', 'review', 'messages')
+# bm25 sütun ağırlıkları: anahtar kelime eşleşmesi gövde eşleşmesinden daha değerli
+BM25_WEIGHTS = (1.0, 4.0, 2.0, 1.0)
+SNIPPET_TOKENS = 12
+SNIPPET_CHARS = 160
+# snippet() işaretleri; HTML kaçışından sonra <mark> ile değiştirilir
+_HL_START, _HL_END = '\x02', '\x03'
+
+_fts_available = None
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names(include_views=True)
+        )
+    return _fts_available
+
+
+def query_terms(query):
+    return [t for t in re.findall(r'\w+', query or '', re.UNICODE) if t]
+
+
+def fts_query(terms):
+    """Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevirir (terimler VE ile, sonuncusu önek)."""
+    quoted = ['"%s"' % t.replace('"', '""') for t in terms]
+    if quoted:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(_HL_START, '<mark>').replace(_HL_END, '</mark>')
+    )
+
+
+class SearchResults:
+    """
+    Paginator ile kullanılabilen tembel sonuç dizisi: count() ve dilimleme
+    sadece istenen sayfa için veritabanına gider.
+    """
+
+    def __init__(self, query):
+        self.terms = query_terms(query)
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self._fetch_count() if self.terms else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        if not self.terms:
+            return []
+        start = item.start or 0
+        stop = item.stop if item.stop is not None else self.count()
+        rows = self._fetch_page(start, max(stop - start, 0))
+        submissions = Submission.objects.in_bulk([sid for sid, _ in rows])
+        return [
+            {'submission': submissions[sid], 'snippet': snippet}
+            for sid, snippet in rows if sid in submissions
+        ]
+
+
+class FTSResults(SearchResults):
+    def _fetch_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [fts_query(self.terms)],
+            )
+            return cursor.fetchone()[0]
+
+    def _fetch_page(self, offset, limit):
+        weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT d.submission_id,
+                       snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS})
+                FROM {FTS_TABLE}
+                JOIN papers_searchdocument d ON d.id = {FTS_TABLE}.rowid
+                WHERE {FTS_TABLE} MATCH %s
+                ORDER BY bm25({FTS_TABLE}, {weights})
+                LIMIT %s OFFSET %s
+                """,
+                [_HL_START, _HL_END, fts_query(self.terms), limit, offset],
+            )
+            return [(sid, _highlight(snippet)) for sid, snippet in cursor.fetchall()]
+
+
+class FallbackResults(SearchResults):
+    def _queryset(self):
+        qs = SearchDocument.objects.all()
+        for term in self.terms:
+            match = Q()
+            for field in SEARCH_FIELDS:
+                match |= Q(**{f'{field}__icontains': term})
+            qs = qs.filter(match)
+        return qs.order_by('-updated_at')
+
+    def _fetch_count(self):
+        return self._queryset().count()
+
+    def _fetch_page(self, offset, limit):
+        docs = self._queryset()[offset:offset + limit]
+        return [(doc.submission_id, _highlight(self._snippet(doc))) for doc in docs]
+
+    def _snippet(self, doc):
+        pattern = re.compile('|'.join(re.escape(t) for t in self.terms), re.IGNORECASE)
+        for field in SEARCH_FIELDS:
+            text = getattr(doc, field) or ''
+            m = pattern.search(text)
+            if m:
+                start = max(m.start() - SNIPPET_CHARS // 2, 0)
+                window = text[start:start + SNIPPET_CHARS]
+                return ('…' if start else '') + pattern.sub(
+                    lambda x: _HL_START + x.group(0) + _HL_END, window
+                ) + '…'
+        return ''
+
+
+def search(query):
+    return FTSResults(query) if fts_available() else FallbackResults(query)
+
+
+# --- İndeks güncelleme ---
+
+def update_search_document(submission_id, **fields):
+    """Sadece değişen alanları yazar; FTS tetikleyicileri gereksiz yere çalışmaz."""
+    doc, created = SearchDocument.objects.get_or_create(submission_id=submission_id, defaults=fields)
+    if created:
+        return doc
+    changed = [name for name, value in fields.items() if getattr(doc, name) != value]
+    if changed:
+        for name in changed:
+            setattr(doc, name, fields[name])
+        doc.save(update_fields=changed + ['updated_at'])
+    return doc
+
+
+def index_submission_fields(submission):
+    update_search_document(
+        submission.id,
+        keywords=submission.extracted_keywords or '',
+        review=submission.review or '',
+    )
+
+
+def index_message(message):
+    """Mesajı kaydın sonuna SQL'de ekler; aynı makaleye eş zamanlı gelen mesajlar birbirini ezmez."""
+    with transaction.atomic():
+        doc, created = SearchDocument.objects.get_or_create(
+            submission_id=message.submission_id, defaults={'messages': message.content},
+        )
+        if created:
+            return
+        SearchDocument.objects.filter(pk=doc.pk).update(
+            messages=Case(
+                When(messages='', then=Value(message.content)),
+                default=Concat(F('messages'), Value('\n' + message.content), output_field=TextField()),
+                output_field=TextField(),
+            ),
+            updated_at=timezone.now(),
+        )
+
+
+def index_submission_text(submission, text):
+    """Anonimleştirme hattının çıkardığı makale metnini indekse yazar."""
+    update_search_document(submission.id, body=text or '')
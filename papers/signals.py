@@ -0,0 +1,59 @@
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Domain, Subtopic, Submission, Message, KnownIdentifier
+from . import audit
+from .classifier import invalidate_classifier
+from .db import configure_connection
+from .gazetteer import invalidate_gazetteer
+from .search import index_submission_fields, index_message
+
+
+# Her yeni SQLite bağlantısına WAL vb. PRAGMA'ları uygula (bkz. db.py)
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    configure_connection(connection)
+
+
+# İstek sırasında autocommit'te tampona alınmış log satırlarını yaz (bkz. audit.py)
+@receiver(request_finished)
+def request_done(sender, **kwargs):
+    audit.flush()
+
+
+# Alt başlık/domain tablosu değiştiğinde öneri matrisini geçersiz kıl
+@receiver(post_save, sender=Subtopic)
+@receiver(post_delete, sender=Subtopic)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def subtopics_changed(sender, **kwargs):
+    invalidate_classifier()
+
+
+# Editörün makaleye seçtiği alt başlıklar öneri modelinin eğitim verisidir
+@receiver(m2m_changed, sender=Submission.subtopics.through)
+def submission_subtopics_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_classifier()
+
+
+# Bilinen isim/e-posta/kurum listesi değiştiğinde otomatı yeniden derle
+@receiver(post_save, sender=KnownIdentifier)
+@receiver(post_delete, sender=KnownIdentifier)
+def identifiers_changed(sender, **kwargs):
+    invalidate_gazetteer()
+
+
+# Arama indeksini anahtar kelime/değerlendirme değişikliklerinde güncel tut
+@receiver(post_save, sender=Submission)
+def submission_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_submission_fields(instance)
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        index_message(instance)
@@ -0,0 +1,58 @@
+"""
+Basit süreç içi arka plan işleri.
+
+Yükleme sonrası anahtar kelime çıkarma, benzer makale imzası gibi işler
+HTTP isteğini bekletmemek için bir iş parçacığı havuzunda çalıştırılır.
+İşler transaction commit'inden sonra kuyruğa alınır. Süreç kapanırken
+yarım kalan işler için yönetim komutları (backfill_keywords,
+backfill_signatures, sweep_files) kullanılabilir.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from . import audit
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                    thread_name_prefix='papers-bg',
+                )
+    return _executor
+
+
+def _run(fn, args, kwargs):
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Arka plan işi hatası (%s)", fn.__name__)
+    finally:
+        # İşin tampondaki log satırlarını yaz, bağlantıyı açık bırakma
+        audit.flush()
+        close_old_connections()
+
+
+def submit(fn, *args, **kwargs):
+    """İşi hemen arka plana gönderir (BACKGROUND_TASKS_EAGER ise aynı iş parçacığında çalıştırır)."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        fn(*args, **kwargs)
+        return
+    _get_executor().submit(_run, fn, args, kwargs)
+
+
+def submit_on_commit(fn, *args, **kwargs):
+    """İşi, açık transaction commit edildikten sonra arka plana gönderir."""
+    transaction.on_commit(lambda: submit(fn, *args, **kwargs))
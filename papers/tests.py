@@ -1,4 +1,805 @@
-from django.test import TestCase
+"""
+Görünümler için SQL sorgu sayısı ve gecikme bütçesi testleri.
 
-# Create your tests here.
-# Testler için: İhtiyaç duyarsanız buraya test kodlarınızı ekleyin.
+Büyük bir veri kümesi (binlerce makale, log ve mesaj) oluşturulur ve
+papers/urls.py'deki her görünüm çağrılır. Her çağrı için sorgu sayısı üst
+sınırı ve süre bütçesi vardır; sorgu sayısı veri büyüdükçe artmamalıdır
+(N+1). Sınır aşıldığında çalıştırılan sorgular, tekrar sayılarıyla
+birlikte hata mesajında listelenir.
+
+Süre bütçeleri yavaş makinelerde PAPERS_LATENCY_SCALE ortam değişkeniyle
+ölçeklenebilir (ör. PAPERS_LATENCY_SCALE=3). reviewer_list ve
+reviewer_detail görünümleri urls.py'de tanımlı olmadığından kapsam dışıdır.
+
+Dosyanın sonunda görünüm dışı modüller (sınıflandırıcı, isim listesi, Abstract sayfası, log
+tamponu, arşivleme) için küçük birim testleri yer alır.
+"""
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import fitz
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import audit
+from .analysis import analyze_document, get_document_analysis
+from .anonymization import anonymize_pdf, collect_hits, merge_review_comments
+from .bulk import sweep_file_deletions
+from .classifier import SubtopicClassifier, suggest_subtopics
+from .dedup import find_similar, minhash, shingle_hashes, store_signature
+from .gazetteer import Gazetteer, get_gazetteer
+from .models import (DocumentAnalysis, Domain, KnownIdentifier, Log, LogRollup, Message, PendingFileDeletion,
+                     Reviewer, ReviewerProfile, SearchDocument, Submission, SubmissionSignature, Subtopic)
+from .prefilter import MODE_IMAGE, MODE_NER, MODE_REGEX
+from .recommender import recommend_reviewers, update_reviewer_profile
+from .retention import archive_logs, iter_archived_logs, segment_path
+from .search import index_message
+from .synthetic import PaperSpec, generate_paper
+from .zipstream import file_info
+
+SUBMISSIONS = 2000
+LOGS_PER_SUBMISSION = 3
+MESSAGES_PER_SUBMISSION = 1
+REVIEWERS = 50
+LATENCY_SCALE = float(os.environ.get("PAPERS_LATENCY_SCALE", "1"))
+
+STATUSES = ["Gönderildi", "Anonimleştirildi", "Hakeme Atandı", "Değerlendirildi",
+            "Revize Gerekli", "Final", "Düzenlenmiş"]
+_NUMBERS = re.compile(r"\b\d+\b|'[^']*'")
+_TRANSACTION_CONTROL = re.compile(r"(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT|BEGIN)\b")
+
+_media_root = tempfile.mkdtemp(prefix="papers_test_media_")
+# Görünümler dosya silebildiği için (clear_all_submissions) her test bu kopyadan başlar
+_fixture_root = tempfile.mkdtemp(prefix="papers_test_fixture_")
+
+
+def tracking(index):
+    return f"T{index:05d}"
+
+
+def first_with_status(status, nth=0):
+    return tracking(STATUSES.index(status) + nth * len(STATUSES))
+
+
+@override_settings(MEDIA_ROOT=_media_root, BACKGROUND_TASKS_EAGER=True, METRICS_ENABLED=True)
+class ViewBudgetTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(shutil.rmtree, _media_root, ignore_errors=True)
+        cls.addClassCleanup(shutil.rmtree, _fixture_root, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        for folder in ("uploads", "anonymized", "reviewed", "final"):
+            os.makedirs(os.path.join(_fixture_root, folder), exist_ok=True)
+        original = os.path.join(_fixture_root, "uploads", "ornek.pdf")
+        generate_paper(original, PaperSpec(pages=4))
+        anonymized = os.path.join(_fixture_root, "anonymized", "anon_ornek.pdf")
+        regions = anonymize_pdf(original, anonymized, gazetteer=Gazetteer([]))
+        merge_review_comments(anonymized, "Test değerlendirmesi.", os.path.join(_fixture_root, "reviewed", "rev.pdf"))
+        shutil.copy(original, os.path.join(_fixture_root, "final", "final.pdf"))
+        regions_json = json.dumps(regions)
+        anon_size, anon_crc, anon_mtime_ns = file_info(anonymized)
+
+        domains = Domain.objects.bulk_create(Domain(name=f"Alan {i}") for i in range(5))
+        subtopics = Subtopic.objects.bulk_create(
+            Subtopic(domain=d, name=f"Alt başlık {i}-{j}") for i, d in enumerate(domains) for j in range(6)
+        )
+        reviewers = Reviewer.objects.bulk_create(
+            Reviewer(name=f"Hakem {i}", email=f"hakem{i}@example.com") for i in range(REVIEWERS)
+        )
+        Interest = Reviewer.interests.through
+        Interest.objects.bulk_create(
+            Interest(reviewer=r, subtopic=subtopics[(i + k) % len(subtopics)])
+            for i, r in enumerate(reviewers) for k in range(3)
+        )
+
+        subs = []
+        for i in range(SUBMISSIONS):
+            status = STATUSES[i % len(STATUSES)]
+            anonymized_stage = status != "Gönderildi"
+            subs.append(Submission(
+                tracking_number=tracking(i),
+                email_hash="0" * 64,
+                original_pdf="uploads/ornek.pdf",
+                anonymized_pdf="anonymized/anon_ornek.pdf" if anonymized_stage else None,
+                anonymized_data=regions_json if anonymized_stage else None,
+                anonymized_pdf_size=anon_size if anonymized_stage else None,
+                anonymized_pdf_crc32=anon_crc if anonymized_stage else None,
+                anonymized_pdf_mtime_ns=anon_mtime_ns if anonymized_stage else None,
+                reviewed_pdf="reviewed/rev.pdf" if status in ("Değerlendirildi", "Final") else None,
+                final_pdf="final/final.pdf" if status == "Final" else None,
+                restored=status in ("Final", "Düzenlenmiş"),
+                status=status,
+                reviewer=reviewers[i % REVIEWERS] if status in ("Hakeme Atandı", "Değerlendirildi", "Final") else None,
+                extracted_keywords="derin öğrenme, eeg sinyalleri, duygu tanıma",
+                review="Yöntem yeterli." if status in ("Değerlendirildi", "Final") else None,
+            ))
+        subs = Submission.objects.bulk_create(subs, batch_size=500)
+        Log.objects.bulk_create(
+            (Log(submission=sub, action=f"İşlem {k}", details='{"wall": 0.25}' if k == 0 else '')
+             for sub in subs for k in range(LOGS_PER_SUBMISSION)),
+            batch_size=1000,
+        )
+        Message.objects.bulk_create(
+            (Message(submission=sub, sender="user", sender_email="yazar@example.com", content="Merhaba")
+             for sub in subs for _ in range(MESSAGES_PER_SUBMISSION)),
+            batch_size=1000,
+        )
+        SearchDocument.objects.bulk_create(
+            (SearchDocument(submission=sub, body="derin öğrenme ile duygu tanıma", keywords=sub.extracted_keywords)
+             for sub in subs),
+            batch_size=1000,
+        )
+
+    def setUp(self):
+        shutil.copytree(_fixture_root, _media_root, dirs_exist_ok=True)
+        # Satır önbelleği anahtarları (id, version) test transaction'ları geri alınınca tekrar kullanılır
+        caches["fragments"].clear()
+
+    def assertBudget(self, url, max_queries, max_seconds, method="get", data=None, expected=(200, 302)):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = getattr(self.client, method)(url, data or {})
+            if hasattr(response, "streaming_content"):
+                b"".join(response.streaming_content)
+                response.close()
+            elapsed = time.perf_counter() - start
+
+        self.assertIn(response.status_code, expected, f"{method.upper()} {url}: {response.status_code}")
+        # Kısa yazma transaction'larının kontrol ifadeleri (SAVEPOINT/RELEASE, BEGIN) sayılmaz
+        queries = [q["sql"] for q in ctx.captured_queries if not _TRANSACTION_CONTROL.match(q["sql"])]
+        if len(queries) > max_queries:
+            # Aynı biçimdeki sorguları grupla: N+1 genelde burada görünür
+            shapes = Counter(_NUMBERS.sub("?", sql) for sql in queries)
+            listing = "\n".join(f"  {count}x {sql[:300]}" for sql, count in shapes.most_common(15))
+            self.fail(f"{method.upper()} {url}: {len(queries)} sorgu (üst sınır {max_queries})\n{listing}")
+        budget = max_seconds * LATENCY_SCALE
+        self.assertLessEqual(elapsed, budget, f"{method.upper()} {url}: {elapsed:.3f} sn (bütçe {budget:.2f} sn)")
+        return response
+
+    # --- Listeler ---
+
+    def test_editor_dashboard(self):
+        response = self.assertBudget(reverse("editor_dashboard"), 4, 0.5)
+        self.assertEqual(len(response.context["submissions"]), 50)
+        self.assertBudget(reverse("editor_dashboard") + "?page=20", 4, 0.5)
+
+    def test_editor_dashboard_row_cache(self):
+        url = reverse("editor_dashboard")
+        response = self.client.get(url)
+        sub = next(s for s in response.context["submissions"] if s.status == "Gönderildi")
+        assign_url = reverse("assign_reviewer", args=[sub.tracking_number])
+        self.assertNotContains(response, assign_url)
+        # Önbellekteki satır kullanılır; kayıt version'ı artırır ve satır yeniden oluşturulur
+        self.assertNotContains(self.client.get(url), assign_url)
+        sub = Submission.objects.get(id=sub.id)
+        sub.status = "Anonimleştirildi"
+        sub.save()
+        self.assertContains(self.client.get(url), assign_url)
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        first = Submission.objects.get(tracking_number=tracking(0))
+        second = Submission.objects.get(tracking_number=tracking(0))
+        first.status = "Anonimleştirildi"
+        first.save()
+        second.review = "Başka bir yazar"
+        second.save(update_fields=["review"])
+        self.assertEqual((first.version, second.version), (2, 3))
+        self.assertEqual(Submission.objects.get(id=first.id).version, 3)
+
+    def test_editor_logs(self):
+        self.assertBudget(reverse("editor_logs"), 4, 0.5)
+        self.assertBudget(reverse("editor_logs") + "?page=30", 4, 0.5)
+
+    def test_editor_messages(self):
+        self.assertBudget(reverse("editor_messages"), 4, 0.5)
+
+    def test_search(self):
+        self.assertBudget(reverse("search"), 2, 0.3)
+        self.assertBudget(reverse("search") + "?q=duygu", 6, 1.0)
+
+    def test_reviewer_panel(self):
+        self.assertBudget(reverse("reviewer_panel"), 3, 0.3)
+        reviewer = Reviewer.objects.get(email="hakem2@example.com")
+        self.assertBudget(reverse("reviewer_panel"), 5, 0.5, method="post", data={"reviewer_id": reviewer.id})
+
+    def test_submission_messages(self):
+        self.assertBudget(reverse("submission_messages", args=[tracking(3)]), 4, 0.3)
+
+    # --- Yazar ---
+
+    def test_author_pages(self):
+        self.assertBudget(reverse("home"), 2, 0.2)
+        self.assertBudget(reverse("upload_paper"), 2, 0.2)
+        self.assertBudget(reverse("status"), 2, 0.2)
+        self.assertBudget(reverse("status"), 4, 0.3, method="post",
+                          data={"tracking_number": tracking(5), "email": "yazar@example.com"})
+        self.assertBudget(reverse("send_message", args=[tracking(5)]), 3, 0.2)
+        self.assertBudget(reverse("send_message", args=[tracking(5)]), 8, 0.5, method="post",
+                          data={"email": "yazar@example.com", "content": "Durum nedir?"})
+        self.assertBudget(reverse("revise_paper", args=[first_with_status("Revize Gerekli")]), 3, 0.2)
+        self.assertBudget(reverse("request_revision_user", args=[first_with_status("Final")]), 6, 0.3)
+
+    def test_upload(self):
+        with open(os.path.join(_media_root, "uploads", "ornek.pdf"), "rb") as f:
+            self.assertBudget(reverse("upload_paper"), 10, 1.0, method="post",
+                              data={"email": "yazar@example.com", "pdf_file": f})
+
+    # --- Editör: makale işlemleri ---
+
+    def test_pdf_views(self):
+        self.assertBudget(reverse("view_pdf", args=[tracking(1)]), 2, 0.2)
+        self.assertBudget(reverse("download_anonymized_pdf", args=[tracking(1)]), 2, 0.2)
+        self.assertBudget(reverse("view_reviewed_pdf", args=[first_with_status("Değerlendirildi")]), 2, 0.2)
+        self.assertBudget(reverse("view_final_pdf", args=[first_with_status("Final")]), 2, 0.2)
+        self.assertBudget(reverse("view_restored_pdf", args=[first_with_status("Düzenlenmiş")]), 2, 0.2)
+
+    def test_keywords_and_similar(self):
+        self.assertBudget(reverse("extract_keywords_view", args=[tracking(0)]), 3, 0.3)
+        self.assertBudget(reverse("similar_submissions", args=[tracking(0)]), 6, 0.5)
+
+    def test_similar_sees_signatures_from_other_processes(self):
+        sub, other = Submission.objects.filter(tracking_number__in=[tracking(0), tracking(1)]).order_by("id")
+        hashes = shingle_hashes("derin öğrenme ile eeg sinyallerinden duygu tanıma üzerine bir çalışma " * 20)
+        signature = minhash(hashes)
+        store_signature(sub, signature, len(hashes))
+        self.assertEqual(find_similar(sub), [])
+        # Başka bir worker ya da backfill_signatures: indeks bu süreçte güncellenmedi
+        SubmissionSignature.objects.create(submission=other, minhash=signature.tobytes(), shingle_count=len(hashes))
+        self.assertEqual([(s.id, score) for s, score in find_similar(sub)], [(other.id, 1.0)])
+        changed = minhash(shingle_hashes("tamamen farklı bir metin " * 30))
+        SubmissionSignature.objects.filter(submission=other).update(minhash=changed.tobytes(), created_at=timezone.now())
+        self.assertEqual(find_similar(sub), [])
+        SubmissionSignature.objects.filter(submission=other).update(minhash=signature.tobytes(), created_at=timezone.now())
+        self.assertEqual(len(find_similar(sub)), 1)
+        SubmissionSignature.objects.filter(submission=other).delete()
+        self.assertEqual(find_similar(sub), [])
+
+    def test_document_analysis_follows_gazetteer(self):
+        path = os.path.join(_media_root, "uploads", "ornek.pdf")
+        self.assertEqual(get_document_analysis(path).sections["page_modes"][0], MODE_NER)
+        # Eski listeyle yapılmış analiz: ilk sayfa regex moduna düşmüş
+        cached = DocumentAnalysis.objects.get()
+        sections = json.loads(cached.sections)
+        sections["page_modes"][0] = MODE_REGEX
+        DocumentAnalysis.objects.filter(pk=cached.pk).update(sections=json.dumps(sections))
+        self.assertEqual(get_document_analysis(path).sections["page_modes"][0], MODE_REGEX)
+        # Editör yeni bir tanımlayıcı ekledi: önbellekteki kayıt yeniden analiz edilir
+        KnownIdentifier.objects.create(kind="name", value="Zeynep Kaya")
+        self.assertEqual(get_document_analysis(path).sections["page_modes"][0], MODE_NER)
+        cached = DocumentAnalysis.objects.get()
+        self.assertEqual(cached.gazetteer_version, get_gazetteer().version)
+        self.assertEqual(json.loads(cached.sections)["page_modes"][0], MODE_NER)
+
+    def assertAnonymizedInfo(self, tracking_number):
+        # Paket düzeninin kullandığı boyut/CRC dosya yazılırken saklanır
+        sub = Submission.objects.get(tracking_number=tracking_number)
+        self.assertEqual((sub.anonymized_pdf_size, sub.anonymized_pdf_crc32, sub.anonymized_pdf_mtime_ns),
+                         file_info(sub.anonymized_pdf.path))
+
+    def test_anonymize(self):
+        url = reverse("anonymize_view", args=[first_with_status("Gönderildi")])
+        self.assertBudget(url, 3, 0.2)
+        self.assertBudget(url, 15, 5.0, method="post",
+                          data={"anonymize_name": "on", "anonymize_contact": "on", "anonymize_institution": "on"})
+        self.assertAnonymizedInfo(first_with_status("Gönderildi"))
+
+    def test_assign_reviewer(self):
+        url = reverse("assign_reviewer", args=[first_with_status("Anonimleştirildi")])
+        response = self.assertBudget(url, 6, 0.5)
+        self.assertEqual(len(response.context["all_subtopics"]), 30)
+        chosen = list(Subtopic.objects.values_list("id", flat=True)[:2])
+        response = self.assertBudget(url, 8, 0.5, method="post", data={"step": "1", "chosen_subtopics": chosen})
+        reviewer = response.context["matching_reviewers"][0]
+        # Hem uygun hem önerilen hakem seçim listesinde bir kez görünür
+        update_reviewer_profile(reviewer, "derin öğrenme eeg sinyalleri duygu tanıma")
+        response = self.client.post(url, {"step": "1", "chosen_subtopics": chosen})
+        self.assertIn(reviewer.id, response.context["recommended_ids"])
+        self.assertEqual(response.content.decode().count(f'<option value="{reviewer.id}">'), 1)
+        self.assertBudget(url, 15, 0.5, method="post",
+                          data={"step": "2", "chosen_subtopics": chosen, "reviewer_id": reviewer.id})
+
+    def test_reassign_reviewer(self):
+        url = reverse("reassign_reviewer", args=[first_with_status("Hakeme Atandı")])
+        self.assertBudget(url, 4, 0.3)
+        reviewer = Reviewer.objects.get(email="hakem7@example.com")
+        self.assertBudget(url, 8, 0.3, method="post", data={"reviewer_id": reviewer.id})
+
+    def test_review(self):
+        url = reverse("review_view", args=[first_with_status("Hakeme Atandı")])
+        self.assertBudget(url, 3, 0.2)
+        self.assertBudget(url, 15, 2.0, method="post", data={"review_text": "Yöntem bölümü genişletilmeli."})
+
+    def test_recommender_sees_profiles_from_other_processes(self):
+        first, second = Reviewer.objects.order_by("id")[:2]
+        update_reviewer_profile(first, "elektroensefalografi sinyalleri " * 5)
+        query = "elektroensefalografi"
+        ranked = recommend_reviewers(Submission(extracted_keywords=query))
+        self.assertEqual([r.id for r, _ in ranked], [first.id])
+        # Başka bir worker'da kaydedilen değerlendirme: bu süreçteki indeks güncellenmedi
+        ReviewerProfile.objects.create(reviewer=second, terms=json.dumps({"elektroensefalografi": 50}), paper_count=1)
+        ranked = recommend_reviewers(Submission(extracted_keywords=query))
+        self.assertEqual({r.id for r, _ in ranked}, {first.id, second.id})
+        ReviewerProfile.objects.filter(reviewer=first).delete()
+        ranked = recommend_reviewers(Submission(extracted_keywords=query))
+        self.assertEqual([r.id for r, _ in ranked], [second.id])
+        # Profil kilitli satırdan okunup güncellenir; önceki terimler korunur
+        update_reviewer_profile(second, "duygu tanıma")
+        profile = ReviewerProfile.objects.get(reviewer=second)
+        self.assertEqual(profile.paper_count, 2)
+        self.assertEqual(json.loads(profile.terms)["elektroensefalografi"], 50)
+
+    def test_restore_and_finalize(self):
+        url = reverse("restore_original", args=[first_with_status("Anonimleştirildi")])
+        self.assertBudget(url, 3, 0.2)
+        self.assertBudget(url, 8, 2.0, method="post", data={"anonymize_name": "on"})
+        self.assertAnonymizedInfo(first_with_status("Anonimleştirildi"))
+        self.assertBudget(reverse("finalize_view", args=[first_with_status("Değerlendirildi")]), 8, 2.0)
+        self.assertBudget(reverse("send_final_pdf", args=[first_with_status("Final")]), 6, 0.3)
+        self.assertBudget(reverse("request_revision", args=[first_with_status("Değerlendirildi", nth=1)]), 6, 0.3)
+
+    def test_bulk_operations(self):
+        url = reverse("bulk_operations")
+        self.assertBudget(url, 2, 0.3)
+        response = self.assertBudget(url, 3, 0.5, method="post", data={"preview": "1", "status": "Değerlendirildi"})
+        self.assertEqual(response.context["counts"]["request_revision"], Submission.objects.filter(
+            status="Değerlendirildi").count())
+        reviewer = Reviewer.objects.get(email="hakem3@example.com")
+        assigned = Submission.objects.filter(reviewer=reviewer, status="Hakeme Atandı")
+        expected = assigned.count() + Submission.objects.filter(status__in=["Anonimleştirildi", "Düzenlenmiş"]).count()
+        # Makale başına sorgu yok: id listesi ve 500'lük parçalarla UPDATE
+        self.assertBudget(url, 8, 1.0, method="post",
+                          data={"apply": "1", "operation": "assign_reviewer", "reviewer": reviewer.id})
+        self.assertEqual(assigned.count(), expected)
+        self.assertBudget(url, 8, 1.0, method="post",
+                          data={"apply": "1", "operation": "request_revision",
+                                "tracking_numbers": f"{first_with_status('Değerlendirildi')}, {tracking(0)}"})
+        self.assertEqual(Submission.objects.get(tracking_number=first_with_status("Değerlendirildi")).status,
+                         "Revize Gerekli")
+        self.assertBudget(url, 8, 1.0, method="post", data={"apply": "1", "operation": "finalize"})
+
+    def test_export(self):
+        # Her döküm tek sorgu; satırlar iterator ile akar
+        url = reverse("export_data", args=["submissions"])
+        self.assertBudget(url, 1, 1.0)
+        lines = b"".join(self.client.get(url).streaming_content).decode().splitlines()
+        self.assertEqual(len(lines) - 1, SUBMISSIONS)
+        url = reverse("export_data", args=["logs"]) + "?format=jsonl&status=Final"
+        self.assertBudget(url, 1, 1.0)
+        lines = b"".join(self.client.get(url).streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), Log.objects.filter(submission__status="Final").count())
+        self.assertIn("wall", json.loads(lines[0])["details"])
+        self.assertBudget(reverse("export_data", args=["regions"]) + "?status=Final&text=0", 1, 2.0)
+        self.assertBudget(reverse("export_data", args=["logs"]) + "?since=bugün", 0, 0.2, expected=(400,))
+
+    def test_bundle(self):
+        # Hakem paketi: tek sorgu hakem, tek sorgu makaleler; dosyalar akışla okunur
+        reviewer = Submission.objects.get(tracking_number=first_with_status("Hakeme Atandı")).reviewer
+        url = reverse("reviewer_bundle", args=[reviewer.id])
+        # Düzen saklanan boyut/CRC'lerden kurulur; dosyalar yalnızca gönderilirken okunur
+        with mock.patch("papers.zipstream.file_info", side_effect=AssertionError("CRC yeniden hesaplandı")):
+            self.assertBudget(url, 2, 1.0)
+        response = self.client.get(url)
+        data = b"".join(response.streaming_content)
+        self.assertEqual(len(data), int(response["Content-Length"]))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            expected = Submission.objects.filter(reviewer=reviewer).exclude(anonymized_pdf="")
+            self.assertEqual(sorted(archive.namelist()),
+                             sorted(f"{s.tracking_number}_anon.pdf" for s in expected))
+
+        # Yarıda kalan indirme aynı etag ile kaldığı yerden sürer; etag değişmişse 412
+        etag = response["ETag"].strip('"')
+        rest = self.client.get(url, {"offset": 1000, "etag": etag})
+        self.assertEqual(b"".join(rest.streaming_content), data[1000:])
+        self.assertBudget(url + "?offset=1000&etag=eski", 2, 0.5, expected=(412,))
+        self.assertBudget(url + f"?offset={len(data) + 1}", 2, 0.5, expected=(400,))
+
+        # Editör seçimi: toplu işlem filtreleri (GET)
+        url = reverse("editor_bundle") + "?status=Final"
+        self.assertBudget(url, 1, 2.0)
+        with zipfile.ZipFile(io.BytesIO(b"".join(self.client.get(url).streaming_content))) as archive:
+            self.assertEqual(len(archive.namelist()), Submission.objects.filter(status="Final").count())
+        self.assertBudget(reverse("editor_bundle") + "?status=Gönderildi", 1, 0.5, expected=(302,))
+
+    def test_bundle_checks_stored_file_info(self):
+        # Alanlar eklenmeden önce anonimleştirilmiş makaleler: değerler ilk pakette hesaplanıp saklanır
+        reviewer = Submission.objects.get(tracking_number=first_with_status("Hakeme Atandı")).reviewer
+        assigned = Submission.objects.filter(reviewer=reviewer)
+        assigned.update(anonymized_pdf_size=None, anonymized_pdf_crc32=None, anonymized_pdf_mtime_ns=None)
+        url = reverse("reviewer_bundle", args=[reviewer.id])
+        self.assertBudget(url, 3, 1.0)
+        self.assertFalse(assigned.filter(anonymized_pdf_crc32__isnull=True).exists())
+        self.assertBudget(url, 2, 1.0)
+        self.assertAnonymizedInfo(assigned.first().tracking_number)
+
+        # Saklanan değerlerle uyuşmayan dosya (sonradan değişmiş) paket hazırlanırken yeniden hesaplanır
+        assigned.update(anonymized_pdf_size=F("anonymized_pdf_size") + 1)
+        self.assertBudget(url, 3, 1.0)
+        self.assertAnonymizedInfo(assigned.first().tracking_number)
+
+        # Diskte olmayan dosya saklanan değerleri olsa da atlanır; arşiv geçerli kalır
+        gone = assigned.first()
+        Submission.objects.filter(pk=gone.pk).update(anonymized_pdf="anonymized/silindi.pdf")
+        with zipfile.ZipFile(io.BytesIO(b"".join(self.client.get(url).streaming_content))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(len(archive.namelist()), assigned.count() - 1)
+            self.assertNotIn(f"{gone.tracking_number}_anon.pdf", archive.namelist())
+
+        # İndirme sırasında değişen dosya bozuk arşiv yerine akışı keser
+        response = self.client.get(url)
+        path = assigned.exclude(pk=gone.pk).first().anonymized_pdf.path
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with self.assertRaises(IOError):
+            b"".join(response.streaming_content)
+
+    def test_import_catalog(self):
+        url = reverse("import_catalog")
+        self.assertBudget(url, 0, 0.2)
+        rows = ["name,email,interests"] + [
+            f"İçe Aktarılan {i},aktarilan{i}@example.com,Alan 0: Alt başlık 0-1;Yeni Alan: Yeni Konu {i % 7}"
+            for i in range(300)
+        ] + ["Hakem 1 Yeni Ad,hakem1@example.com,Alt başlık 2-3"]
+        content = "\n".join(rows).encode()
+        # Satır sayısından bağımsız: alan/alt başlık/hakem/ilgi alanı için birkaç toplu sorgu
+        self.assertBudget(url, 20, 2.0, method="post",
+                          data={"catalog_file": SimpleUploadedFile("hakemler.csv", content, "text/csv")})
+        self.assertEqual(Reviewer.objects.count(), REVIEWERS + 300)
+        self.assertEqual(Subtopic.objects.filter(domain__name="Yeni Alan").count(), 7)
+        reviewer = Reviewer.objects.get(email="hakem1@example.com")
+        self.assertEqual(reviewer.name, "Hakem 1 Yeni Ad")
+        self.assertEqual([str(s) for s in reviewer.interests.all()], ["Alan 2: Alt başlık 2-3"])
+        self.assertEqual(Reviewer.objects.get(email="aktarilan5@example.com").interests.count(), 2)
+
+        # Geçersiz satır varsa hiçbir şey yazılmaz
+        bad = b'{"reviewers": [{"name": "A", "email": "a@example.com", "interests": ["Olmayan Konu"]}]}'
+        response = self.assertBudget(url, 10, 0.5, method="post",
+                                     data={"catalog_file": SimpleUploadedFile("hakemler.json", bad)})
+        self.assertEqual(response.context["error_count"], 1)
+        self.assertFalse(Reviewer.objects.filter(email="a@example.com").exists())
+
+    def test_reply_to_message(self):
+        message = Message.objects.order_by("id").first()
+        url = reverse("reply_to_message", args=[message.id])
+        self.assertBudget(url, 3, 0.2)
+        self.assertBudget(url, 8, 0.3, method="post", data={"content": "Değerlendirme sürüyor."})
+
+    def test_messages_appended_to_search_document(self):
+        sub = Submission.objects.get(tracking_number=tracking(0))
+        SearchDocument.objects.filter(submission=sub).update(messages="")
+        for content in ("ilk", "ikinci"):
+            Message.objects.create(submission=sub, sender="user", sender_email="yazar@example.com", content=content)
+        index_message(Message(submission=sub, content="üçüncü"))
+        self.assertEqual(SearchDocument.objects.get(submission=sub).messages, "ilk\nikinci\nüçüncü")
+        SearchDocument.objects.filter(submission=sub).delete()
+        index_message(Message(submission=sub, content="yeni"))
+        self.assertEqual(SearchDocument.objects.get(submission=sub).messages, "yeni")
+
+    def test_metrics(self):
+        self.assertBudget(reverse("metrics"), 0, 0.1)
+
+    def test_clear_all_submissions(self):
+        # Makale başına sorgu yok; silme, SQLite parametre sınırı nedeniyle birkaç toplu sorguya bölünür
+        self.assertBudget(reverse("clear_all_submissions"), 60, 10.0)
+        self.assertFalse(Submission.objects.exists())
+        # Dosyalar istek içinde silinmez; kuyruktan süpürücü siler
+        self.assertEqual(PendingFileDeletion.objects.count(), 4)
+        self.assertEqual(sweep_file_deletions()["deleted"], 4)
+        self.assertFalse(os.path.exists(os.path.join(_media_root, "uploads", "ornek.pdf")))
+
+
+class SubtopicClassifierTests(TestCase):
+
+    def test_top_k_ranks_by_keywords(self):
+        clf = SubtopicClassifier.build([
+            (1, "Yapay Zeka Derin öğrenme Derin öğrenme sinir ağları"),
+            (2, "Sağlık EEG sinyalleri EEG sinyalleri beyin"),
+            (3, "Ağlar Kablosuz ağlar Kablosuz ağlar"),
+        ])
+        ranked = clf.top_k(["derin öğrenmesi ile sinir ağı", "eeg sinyali", "kuantum kromodinamiği"], k=2)
+        self.assertEqual(ranked[0][0][0], 1)
+        self.assertEqual([sid for sid, _ in ranked[1]][:1], [2])
+        self.assertEqual(ranked[2], [])
+        self.assertTrue(all(a[1] >= b[1] for a, b in zip(ranked[0], ranked[0][1:])))
+        self.assertEqual(SubtopicClassifier.build([]).top_k(["derin öğrenme"]), [[]])
+
+    def test_labels_retrain_classifier(self):
+        domain = Domain.objects.create(name="Tıp")
+        subtopics = Subtopic.objects.bulk_create(Subtopic(domain=domain, name=name) for name in ("Kardiyoloji", "Nöroloji"))
+        sub = Submission.objects.create(tracking_number="C00001", email_hash="0" * 64, original_pdf="uploads/x.pdf",
+                                        extracted_keywords="elektroensefalografi, nöbet")
+        self.assertNotEqual(suggest_subtopics(sub, top_k=1), [subtopics[0].id])
+        # Editörün alt başlık seçimi (assign_reviewer) eğitim verisine hemen yansır
+        sub.subtopics.set([subtopics[0]])
+        self.assertEqual(suggest_subtopics(sub, top_k=1), [subtopics[0].id])
+        sub.subtopics.clear()
+        self.assertNotEqual(suggest_subtopics(sub, top_k=1), [subtopics[0].id])
+
+
+class GazetteerBoundaryTests(SimpleTestCase):
+    gazetteer = Gazetteer([("name", "Ali"), ("institution", "MIT"), ("email", "ali@mit.edu")])
+
+    def test_find_requires_word_boundaries(self):
+        self.assertEqual(self.gazetteer.find("Alignment was submitted by Alice."), [])
+        self.assertEqual(self.gazetteer.find("Ali'nin MIT-IBM projesi"), [("name", "Ali"), ("institution", "MIT")])
+        self.assertEqual(self.gazetteer.find("(ali)\nmit,"), [("name", "Ali"), ("institution", "MIT")])
+        self.assertEqual(self.gazetteer.find("iletişim: ali@mit.edu"), [
+            ("name", "Ali"), ("institution", "MIT"), ("email", "ali@mit.edu"),
+        ])
+        self.assertEqual(Gazetteer([("name", "@mit")]).find("x@mit.edu"), [("name", "@mit")])
+
+    def test_hits_skip_substrings_found_by_search_for(self):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Alignment results were submitted by Ali to MIT.", fontsize=11)
+        page.insert_text((72, 100), "Alice and Ali, MITx", fontsize=11)
+        text = page.get_text("text")
+        options = {"anonymize_name": True, "anonymize_institution": True}
+        hits = collect_hits(page, options, text, [], self.gazetteer, org_ner=False)
+        names = [rect for category, _, rect in hits if category == "name"]
+        institutions = [rect for category, _, rect in hits if category == "institution"]
+        # search_for alt dizeleri de bulur: Alignment, Ali, Alice, Ali / submitted, MIT, MITx
+        self.assertEqual(len(page.search_for("Ali")), 4)
+        self.assertEqual(len(page.search_for("MIT")), 3)
+        self.assertEqual(len(names), 2)
+        self.assertEqual(len(institutions), 1)
+        for rect in names + institutions:
+            self.assertIn(page.get_textbox(fitz.Rect(rect)).strip(), ("Ali", "MIT"))
+        doc.close()
+
+
+class AbstractPageTests(SimpleTestCase):
+    """Abstract başlığı sayfanın en üstünde: başlığın altındaki şekle dokunulmaz."""
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp(prefix="papers_abstract_")
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.src, self.out = os.path.join(tmp, "in.pdf"), os.path.join(tmp, "out.pdf")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 100), "A Study of Signal Processing Methods for Sensor Data")
+        page = doc.new_page()
+        page.insert_text((72, 40), "Abstract")
+        page.insert_text((72, 60), "This paper studies signal processing methods for sensor data.")
+        page.insert_text((72, 80), "Keywords: signal processing, sensors")
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), False)
+        pixmap.clear_with(120)
+        page.insert_image(fitz.Rect(72, 300, 272, 500), pixmap=pixmap)
+        doc.new_page().insert_text((72, 100), "Introduction text continues here with more words.")
+        doc.save(self.src)
+        doc.close()
+
+    def test_abstract_page_is_not_an_image_page(self):
+        with fitz.open(self.src) as doc:
+            analysis = analyze_document(doc, gazetteer=Gazetteer([]))
+        self.assertEqual(analysis.sections["abstract_page"], 1)
+        self.assertEqual(analysis.sections["page_modes"][1], MODE_REGEX)
+        regions = anonymize_pdf(self.src, self.out, analysis=analysis, gazetteer=Gazetteer([]))
+        self.assertEqual([r for r in regions if r["category"] == "image"], [])
+
+    def test_analysis_does_not_parse_for_keywords(self):
+        # Anahtar kelimeler arka plan aşamasında çıkarılır; analiz isim öbeği geçişi yapmaz
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 100), "A Study of Signal Processing Methods for Sensor Data")
+            doc.new_page().insert_text((72, 40), "Abstract: signal processing methods for sensor data.")
+            with mock.patch("papers.nlp_utils.get_nlp", side_effect=AssertionError("spaCy yüklendi")):
+                analysis = analyze_document(doc, gazetteer=Gazetteer([]), mode=MODE_REGEX)
+        self.assertEqual(analysis.entities, {0: [], 1: []})
+
+    def test_image_page_blurs_only_above_abstract(self):
+        # Eski önbellek kaydı sayfayı görsel saymış olsa da şekil bulanıklaştırılmaz
+        with fitz.open(self.src) as doc:
+            analysis = analyze_document(doc, gazetteer=Gazetteer([]))
+        analysis.sections["page_modes"][1] = MODE_IMAGE
+        regions = anonymize_pdf(self.src, self.out, analysis=analysis, gazetteer=Gazetteer([]))
+        self.assertEqual([r for r in regions if r["category"] == "image"], [])
+
+
+def _submission(number="A00001"):
+    return Submission.objects.create(tracking_number=number, email_hash="0" * 64, original_pdf="uploads/x.pdf")
+
+
+def _actions():
+    return list(Log.objects.order_by("id").values_list("action", flat=True))
+
+
+@override_settings(AUDIT_LOG_BUFFER_SIZE=3, AUDIT_LOG_MAX_AGE=60)
+class AuditAutocommitTests(TransactionTestCase):
+    """Autocommit yolu: tampon eşikleri, sıra, yeniden deneme ve kapanış."""
+
+    def setUp(self):
+        audit.flush()
+        self.sub = _submission()
+
+    def tearDown(self):
+        audit.flush()
+
+    def test_size_threshold(self):
+        audit.log(self.sub, "1")
+        audit.log(self.sub, "2")
+        self.assertEqual((audit.pending(), Log.objects.count()), (2, 0))
+        audit.log(self.sub, "3")
+        self.assertEqual((audit.pending(), _actions()), (0, ["1", "2", "3"]))
+
+    @override_settings(AUDIT_LOG_MAX_AGE=0.05)
+    def test_age_threshold(self):
+        audit.log(self.sub, "1")
+        self.assertEqual(Log.objects.count(), 0)
+        time.sleep(0.06)
+        audit.log(self.sub, "2")
+        self.assertEqual((audit.pending(), _actions()), (0, ["1", "2"]))
+
+    def test_flush_order_follows_log_calls(self):
+        audit.log(self.sub, "1")
+        with transaction.atomic():
+            audit.log(self.sub, "2")
+            audit.log_many([self.sub.id], "3")
+            self.assertEqual(audit.pending(), 1)
+        # Commit tamponu zorla boşaltır: önceki autocommit satırı önce yazılır
+        audit.log(self.sub, "4")
+        audit.flush()
+        self.assertEqual(_actions(), ["1", "2", "3", "4"])
+
+    def test_rollback_drops_rows(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                audit.log(self.sub, "geri alınan")
+                raise ValueError
+        with transaction.atomic():
+            audit.log(self.sub, "yazılan")
+        self.assertEqual((audit.pending(), _actions()), (0, ["yazılan"]))
+
+    def test_failed_write_is_requeued(self):
+        audit.log(self.sub, "1")
+        with mock.patch.object(Log.objects, "bulk_create", side_effect=OperationalError("database is locked")), \
+                self.assertLogs("papers.audit", "ERROR"):
+            self.assertEqual(audit.flush(), 0)
+        self.assertEqual((audit.pending(), Log.objects.count()), (1, 0))
+        audit.log(self.sub, "2")
+        self.assertEqual(audit.flush(), 2)
+        self.assertEqual(_actions(), ["1", "2"])
+
+    def test_rows_of_deleted_submissions_are_skipped(self):
+        other = _submission("A00002")
+        audit.log(other, "silinecek")
+        audit.log(self.sub, "kalan")
+        other.delete()
+        with self.assertLogs("papers.audit", "WARNING"):
+            self.assertEqual(audit.flush(), 1)
+        self.assertEqual(_actions(), ["kalan"])
+
+    def test_clean_shutdown_writes_buffer(self):
+        audit.log(self.sub, "kapanış")
+        self.assertEqual(Log.objects.count(), 0)
+        audit._flush_at_exit()
+        self.assertEqual((audit.pending(), _actions()), (0, ["kapanış"]))
+
+
+class AuditTransactionTests(TestCase):
+    """Transaction yolu: satırlar commit'te, tek bulk_create ile yazılır."""
+
+    def setUp(self):
+        audit.flush()
+        self.sub = _submission()
+
+    def test_rows_written_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                audit.log(self.sub, "1")
+                audit.log_many([self.sub.id, self.sub.id], "2")
+                self.assertEqual(Log.objects.count(), 0)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(_actions(), ["1", "2", "2"])
+
+    def test_rolled_back_savepoint_drops_rows(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    audit.log(self.sub, "geri alınan")
+                    raise ValueError
+            with transaction.atomic():
+                audit.log(self.sub, "yazılan")
+        self.assertEqual(_actions(), ["yazılan"])
+
+
+_archive_root = tempfile.mkdtemp(prefix="papers_test_archive_")
+
+
+@override_settings(LOG_ARCHIVE_DIR=_archive_root, LOG_RETENTION_DAYS=180)
+class LogArchiveTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(shutil.rmtree, _archive_root, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(_archive_root, ignore_errors=True)
+        self.sub = _submission()
+        self.other = _submission("A00002")
+
+    def add_logs(self, submission, action, *days):
+        """Her gün için öğlen saatinde (yerel) bir Log satırı."""
+        return Log.objects.bulk_create(
+            Log(submission=submission, action=action,
+                timestamp=timezone.make_aware(datetime(day.year, day.month, day.day, 12)))
+            for day in days
+        )
+
+    def test_batches_across_month_boundaries(self):
+        start = date(2025, 1, 25)
+        old = self.add_logs(self.sub, "Makale yüklendi", *(start + timedelta(days=i) for i in range(40)))
+        recent = self.add_logs(self.sub, "Makale yüklendi", timezone.localdate())
+        stats = archive_logs(batch_size=7)
+        self.assertEqual(stats["rows"], 40)
+        self.assertEqual(dict(stats["segments"]), {"2025-01": 7, "2025-02": 28, "2025-03": 5})
+        self.assertEqual(list(Log.objects.values_list("id", flat=True)), [recent[0].id])
+        self.assertEqual([r["id"] for r in iter_archived_logs()], [row.id for row in old])
+        self.assertEqual(sum(LogRollup.objects.values_list("count", flat=True)), 40)
+        self.assertEqual(archive_logs()["rows"], 0)
+
+    def test_rollups_merge_across_runs(self):
+        day = date(2025, 3, 31)
+        self.add_logs(self.sub, "Hakeme atandı: Hakem 1", day, day)
+        self.add_logs(self.other, "Hakeme atandı: Hakem 1", day)
+        archive_logs()
+        self.add_logs(self.sub, "Hakeme atandı: Hakem 2 (toplu)", day)
+        self.add_logs(self.sub, "Hakem Hakem 2 değerlendirme yaptı", day)
+        archive_logs()
+        rollups = {(r.submission_id, r.action): r.count for r in LogRollup.objects.filter(day=day)}
+        self.assertEqual(rollups, {
+            (self.sub.id, "Hakeme atandı"): 3,
+            (self.other.id, "Hakeme atandı"): 1,
+            (self.sub.id, "Hakem değerlendirme yaptı"): 1,
+        })
+        # Aynı ayın segmenti iki gzip üyesi: okuyucu tek akış olarak görür
+        self.assertEqual(len(list(iter_archived_logs())), 5)
+
+    def test_reader_filters(self):
+        self.add_logs(self.sub, "Makale yüklendi", date(2025, 1, 31), date(2025, 2, 1))
+        self.add_logs(self.other, "Editör revizyon istedi", date(2025, 2, 15), date(2025, 4, 1))
+        archive_logs()
+
+        def days(**filters):
+            return [timezone.localtime(datetime.fromisoformat(r["timestamp"])).date()
+                    for r in iter_archived_logs(**filters)]
+
+        self.assertEqual(days(since=date(2025, 2, 1), until=date(2025, 2, 15)),
+                         [date(2025, 2, 1), date(2025, 2, 15)])
+        self.assertEqual(days(until=date(2025, 1, 31)), [date(2025, 1, 31)])
+        self.assertEqual(days(tracking_number="A00002"), [date(2025, 2, 15), date(2025, 4, 1)])
+        self.assertEqual(days(contains="REVIZYON"), [date(2025, 2, 15), date(2025, 4, 1)])
+        self.assertEqual(days(contains="yok"), [])
+
+    def test_crash_between_segment_and_delete(self):
+        rows = self.add_logs(self.sub, "Makale yüklendi", date(2025, 5, 1), date(2025, 5, 2))
+        with mock.patch("papers.retention._merge_rollups", side_effect=RuntimeError("kesinti")):
+            with self.assertRaises(RuntimeError):
+                archive_logs()
+        # Segment yazıldı ama satırlar silinmedi; ikinci çalıştırma aynı satırları tekrar ekler
+        self.assertEqual(Log.objects.count(), 2)
+        archive_logs()
+        with gzip.open(segment_path(2025, 5), "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 4)
+        self.assertEqual([r["id"] for r in iter_archived_logs()], [row.id for row in rows])
+        self.assertEqual(sum(LogRollup.objects.values_list("count", flat=True)), 2)
+        self.assertFalse(Log.objects.exists())
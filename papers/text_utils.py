@@ -0,0 +1,64 @@
+import re
+import unicodedata
+
+# Hem Türkçe hem İngilizce metinlerde anlamsız sayılan kısa kelimeler
+STOPWORDS = {
+    # İngilizce
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with", "we", "our",
+    "using", "based", "via", "into", "its", "was", "were", "which", "these",
+    # Türkçe
+    "ve", "ile", "bir", "bu", "da", "de", "için", "olan", "gibi", "veya",
+    "ya", "çok", "daha", "en", "her", "ise", "ki", "mi", "ne", "o", "şu",
+}
+
+TOKEN_REGEX = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+
+
+def normalize_text(text):
+    """
+    Metni karşılaştırma için sadeleştirir: küçük harf, Türkçe karakterlerin
+    aksansız karşılığı (ö->o, ş->s, ı->i ...). Böylece "Öğrenme" ile
+    "ogrenme" aynı terime düşer.
+    """
+    if not text:
+        return ""
+    text = text.replace("İ", "i").replace("I", "i").replace("ı", "i").lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """Normalize edilmiş metni kelimelere böler, stopword'leri atar."""
+    return [tok for tok in TOKEN_REGEX.findall(normalize_text(text)) if tok not in STOPWORDS]
+
+
+def char_ngrams(token, n=3):
+    """Kelimenin sınır işaretli karakter n-gram'ları: 'derin' -> '<de', 'der', ..."""
+    padded = f"<{token}>"
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def extract_terms(text, ngram=3):
+    """
+    Bir metnin terim listesi: kelimeler + kelime içi karakter n-gram'ları.
+    n-gram'lar Türkçe eklerin ("öğrenme"/"öğrenmesi") ve yazım farklarının
+    etkisini azaltır.
+    """
+    terms = []
+    for tok in tokenize(text):
+        terms.append(tok)
+        if ngram:
+            terms.extend("#" + g for g in char_ngrams(tok, ngram))
+    return terms
+
+
+def read_pdf_text(pdf_path, max_pages=None):
+    """PDF'in metin katmanını (ilk max_pages sayfa) döndürür."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        count = len(doc) if max_pages is None else min(max_pages, len(doc))
+        return "\n".join(doc[i].get_text("text") for i in range(count))
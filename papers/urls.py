@@ -11,9 +11,12 @@ urlpatterns = [
     path('makalesistemi/yonetici/', views.editor_dashboard, name='editor_dashboard'),
     path('makalesistemi/yonetici/logs/', views.editor_logs, name='editor_logs'),
     path('makalesistemi/yonetici/messages/', views.editor_messages, name='editor_messages'),
+    path('makalesistemi/yonetici/ara/', views.search_view, name='search'),
+    path('metrics', views.metrics_view, name='metrics'),
     path('makalesistemi/yonetici/view_pdf/<str:tracking_number>/', views.view_pdf, name='view_pdf'),
     path('makalesistemi/yonetici/extract_keywords/<str:tracking_number>/', views.extract_keywords_view, name='extract_keywords_view'),
     path('makalesistemi/yonetici/anonymize/<str:tracking_number>/', views.anonymize_view, name='anonymize_view'),
+    path('makalesistemi/yonetici/similar/<str:tracking_number>/', views.similar_submissions, name='similar_submissions'),
     path('makalesistemi/yonetici/assign/<str:tracking_number>/', views.assign_reviewer, name='assign_reviewer'),
     path('makalesistemi/yonetici/request_revision/<str:tracking_number>/', views.request_revision, name='request_revision'),
     path('makalesistemi/yonetici/finalize/<str:tracking_number>/', views.finalize_view, name='finalize_view'),
@@ -21,6 +24,10 @@ urlpatterns = [
     path('makalesistemi/yonetici/download_anon/<str:tracking_number>/', views.download_anonymized_pdf, name='download_anonymized_pdf'),
     path('makalesistemi/yonetici/restore/<str:tracking_number>/', views.restore_original, name='restore_original'),
     path('makalesistemi/yonetici/clear_all/', views.clear_all_submissions, name='clear_all_submissions'),
+    path('makalesistemi/yonetici/toplu/', views.bulk_operations, name='bulk_operations'),
+    path('makalesistemi/yonetici/export/<str:dataset>/', views.export_view, name='export_data'),
+    path('makalesistemi/yonetici/katalog/', views.import_catalog_view, name='import_catalog'),
+    path('makalesistemi/yonetici/paket/', views.editor_bundle, name='editor_bundle'),
 
     # Hakemlerin makaleyi değerlendirdiği kısım
     path('makalesistemi/degerlendirici/review/<str:tracking_number>/', views.review_view, name='review_view'),
@@ -35,6 +42,7 @@ urlpatterns = [
 
     # HAKEM PANELI (Dropdown yaklaşımı)
     path('makalesistemi/degerlendirici/', views.reviewer_panel, name='reviewer_panel'),
+    path('makalesistemi/degerlendirici/<int:reviewer_id>/paket/', views.reviewer_bundle, name='reviewer_bundle'),
     
     path('makalesistemi/yonetici/view_reviewed/<str:tracking_number>/', views.view_reviewed_pdf, name='view_reviewed_pdf'),
 
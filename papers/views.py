@@ -1,20 +1,36 @@
 import os
 import hashlib
+import logging
 import uuid
 import json
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.conf import settings
 from django.contrib import messages
-from django.http import FileResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db import transaction
 
 from .models import Submission, Log, Message, Domain, Reviewer, Subtopic
 from .forms import (
     UploadForm, ReviseForm, StatusForm, ReviewForm,
-    MessageForm, ReplyForm, AnonymizeOptionsForm
+    MessageForm, ReplyForm, AnonymizeOptionsForm, BulkOperationForm, BulkSelectionForm, CatalogImportForm
 )
 from .anonymization import anonymize_pdf, merge_and_restore, merge_review_comments, restore_original_fields
-from .nlp_utils import extract_keywords_from_pdf_advanced as extract_keywords_from_pdf_nlp
+from .classifier import suggest_subtopics
+from .recommender import recommend_reviewers, update_reviewer_profile, paper_text
+from .dedup import find_similar
+from .search import search, index_submission_text
+from .analysis import get_document_analysis
+from .budget import TIER_LABELS, document_budget
+from .catalog import CatalogError, import_catalog, parse_catalog
+from .pipeline import cached_keywords, process_uploaded_submission
+from .retention import parse_day
+from .tasks import submit_on_commit
+from . import audit, bulk, export, metrics, zipstream
+
+logger = logging.getLogger(__name__)
 
 
 def generate_tracking_number():
@@ -38,14 +54,18 @@ def upload_paper(request):
             pdf_file = form.cleaned_data['pdf_file']
             tracking = generate_tracking_number()
             hashed = hash_email(email)
-            submission = Submission.objects.create(
+            submission = Submission(
                 tracking_number=tracking,
                 email_hash=hashed,
                 status="Gönderildi"
             )
-            submission.original_pdf = pdf_file
-            submission.save()
-            Log.objects.create(submission=submission, action="Makale yüklendi")
+            # Dosya transaction dışında yazılır; kayıt ve log tek kısa transaction'da
+            submission.original_pdf.save(pdf_file.name, pdf_file, save=False)
+            with transaction.atomic():
+                submission.save()
+                audit.log(submission, "Makale yüklendi")
+                # Anahtar kelime çıkarma ve benzer makale kontrolü arka planda (commit sonrası)
+                submit_on_commit(process_uploaded_submission, submission.id)
             messages.success(request, f"Makaleniz yüklendi. Takip numaranız: {tracking}")
             return render(request, 'upload_success.html', {'tracking_number': tracking})
         else:
@@ -83,13 +103,14 @@ def send_message(request, tracking_number):
         if form.is_valid():
             sender_email = form.cleaned_data['email']
             content = form.cleaned_data['content']
-            Message.objects.create(
-                submission=sub,
-                sender='user',
-                sender_email=sender_email,
-                content=content
-            )
-            Log.objects.create(submission=sub, action=f"Kullanıcı mesaj gönderdi: {sender_email}")
+            with transaction.atomic():
+                Message.objects.create(
+                    submission=sub,
+                    sender='user',
+                    sender_email=sender_email,
+                    content=content
+                )
+                audit.log(sub, f"Kullanıcı mesaj gönderdi: {sender_email}")
             messages.success(request, "Mesaj gönderildi.")
             return redirect('submission_messages', tracking_number=tracking_number)
     else:
@@ -112,10 +133,14 @@ def revise_paper(request, tracking_number):
         form = ReviseForm(request.POST, request.FILES)
         if form.is_valid():
             pdf_file = form.cleaned_data['pdf_file']
-            sub.revised_pdf = pdf_file
+            sub.revised_pdf.save(pdf_file.name, pdf_file, save=False)
             sub.status = "Revize"
-            sub.save()
-            Log.objects.create(submission=sub, action="Kullanıcı revize makale yükledi")
+            # Eski PDF'in anahtar kelimeleri; yenisi arka planda çıkarılır
+            sub.extracted_keywords = ""
+            with transaction.atomic():
+                sub.save()
+                audit.log(sub, "Kullanıcı revize makale yükledi")
+                submit_on_commit(process_uploaded_submission, sub.id)
             messages.success(request, "Revize edilmiş makale yüklendi.")
             return redirect('status')
     else:
@@ -125,18 +150,34 @@ def revise_paper(request, tracking_number):
 
 # --- YÖNETİCİ (Editör) Süreci ---
 def editor_dashboard(request):
-    subs = Submission.objects.all().order_by('-timestamp')
-    return render(request, 'admin_panel.html', {'submissions': subs})
+    # Liste sayfasında kullanılmayan büyük metin alanları okunmaz; satırlar (id, version)
+    # anahtarıyla önbellekten gelir, hakem için yalnızca reviewer_id gerekir
+    subs = (Submission.objects
+            .defer('anonymized_data', 'review', 'extracted_keywords', 'encrypted_filename')
+            .order_by('-timestamp'))
+    page_obj = Paginator(subs, 50).get_page(request.GET.get('page'))
+    return render(request, 'admin_panel.html', {
+        'submissions': page_obj, 'page_obj': page_obj,
+        'row_cache_seconds': getattr(settings, 'DASHBOARD_ROW_CACHE_SECONDS', 24 * 3600),
+    })
 
 
 def extract_keywords_view(request, tracking_number):
     sub = get_object_or_404(Submission, tracking_number=tracking_number)
-    pdf_path = sub.revised_pdf.path if sub.revised_pdf else sub.original_pdf.path
-    kws = extract_keywords_from_pdf_nlp(pdf_path)
+    if sub.extracted_keywords:
+        # Yükleme sonrası arka planda çıkarılmış
+        kws = sub.extracted_keywords.split(", ")
+    else:
+        # Arka plan işi henüz bitmemiş veya eski bir kayıt: önbellekli senkron çıkarma
+        pdf_path = sub.revised_pdf.path if sub.revised_pdf else sub.original_pdf.path
+        with metrics.run("keywords") as run:
+            kws, _ = cached_keywords(pdf_path)
+        if kws:
+            sub.extracted_keywords = ", ".join(kws)
+            with transaction.atomic():
+                sub.save()
+                audit.log(sub, "Anahtar kelimeler çıkarıldı", details=run.to_json())
     if kws:
-        sub.extracted_keywords = ", ".join(kws)
-        sub.save()
-        Log.objects.create(submission=sub, action="Anahtar kelimeler çıkarıldı")
         messages.success(request, "Anahtar kelimeler çıkarıldı.")
         return render(request, 'extracted_keywords.html', {'submission': sub, 'keywords': kws})
     else:
@@ -152,11 +193,8 @@ def anonymize_view(request, tracking_number):
 
     if request.method == "POST":
         form = AnonymizeOptionsForm(request.POST)
-        print("DEBUG: POST geldi, form oluşturuldu.")
 
         if form.is_valid():
-            print("DEBUG: form.is_valid() = True")
-
             # Formdan gelen değerler
             options = {
                 'anonymize_name': form.cleaned_data['anonymize_name'],
@@ -164,26 +202,37 @@ def anonymize_view(request, tracking_number):
                 'anonymize_institution': form.cleaned_data['anonymize_institution'],
                 'blur_images': True  # Fotoğraf bulanıklaştırma da eklendi
             }
-            print("DEBUG: Gelen options =", options)
+            logger.debug("anonymize_view options = %s", options)
 
-            # Anonimleştirme
-            regions = anonymize_pdf(input_path, output_path, options)
-            print("DEBUG: anonymize_pdf regions =", regions)
+            # Anonimleştirme (anahtar kelime çıkarmayla ortak analiz kullanılır);
+            # süre bütçesi azaldıkça daha ucuz kademelere inilir (bkz. budget.py)
+            budget = document_budget()
+            with metrics.run("anonymize") as run:
+                analysis = get_document_analysis(input_path, budget=budget)
+                run.pages = len(analysis.page_texts)
+                regions = anonymize_pdf(input_path, output_path, options, analysis=analysis, budget=budget)
+            logger.debug("anonymize_pdf bölge sayısı = %s", len(regions) if regions is not None else None)
 
             if regions is not None:
                 sub.anonymized_pdf.name = os.path.join('anonymized', f"anon_{filename}")
+                sub.record_anonymized_pdf()
                 sub.status = "Anonimleştirildi"
                 # (Dilerseniz 'regions' verisini kaydedebilirsiniz)
                 sub.anonymized_data = json.dumps(regions)
-                sub.save()
-                Log.objects.create(submission=sub, action="Makale anonimleştirildi")
+                action = "Makale anonimleştirildi"
+                if budget.degraded:
+                    action += f" (süre bütçesi aşıldı: {TIER_LABELS[budget.tier]})"
+                details = dict(run.as_dict(), budget=budget.as_dict(), options=options)
+                with transaction.atomic():
+                    sub.save()
+                    audit.log(sub, action, details=json.dumps(details, ensure_ascii=False))
+                    index_submission_text(sub, analysis.full_text)
 
                 messages.success(request, f"Makale anonimleştirildi! Bulunan alan sayısı: {len(regions)}")
                 return redirect('editor_dashboard')
             else:
                 messages.error(request, "Anonimleştirme sırasında hata oluştu (regions is None).")
         else:
-            print("DEBUG: form.is_valid() = False")
             messages.error(request, "Form doğrulama hatası!")
     else:
         form = AnonymizeOptionsForm()
@@ -194,11 +243,20 @@ def anonymize_view(request, tracking_number):
     })
 
 
+def similar_submissions(request, tracking_number):
+    sub = get_object_or_404(Submission, tracking_number=tracking_number)
+    similar = find_similar(sub)
+    return render(request, 'similar_submissions.html', {'submission': sub, 'similar': similar})
+
+
 def assign_reviewer(request, tracking_number):
     sub = get_object_or_404(Submission, tracking_number=tracking_number)
-    all_subtopics = Subtopic.objects.all()
+    # Subtopic.__str__ alan adını da yazar
+    all_subtopics = Subtopic.objects.select_related('domain')
     step = 1
     chosen_subtopic_ids = []
+    suggested_subtopic_ids = []
+    recommended_reviewers = []
     matching_reviewers = Reviewer.objects.none()
 
     if request.method == 'POST':
@@ -216,8 +274,11 @@ def assign_reviewer(request, tracking_number):
                 rev = get_object_or_404(Reviewer, id=reviewer_id)
                 sub.reviewer = rev
                 sub.status = "Hakeme Atandı"
-                sub.save()
-                Log.objects.create(submission=sub, action=f"Hakeme atandı: {rev.name}")
+                with transaction.atomic():
+                    sub.save()
+                    # Editörün seçtiği alt başlıklar, öneri modeli için eğitim verisi olur
+                    sub.subtopics.set(chosen_subtopic_ids)
+                    audit.log(sub, f"Hakeme atandı: {rev.name}")
                 messages.success(request, f"{rev.name} adlı hakeme atandı.")
                 return redirect('editor_dashboard')
             else:
@@ -226,12 +287,23 @@ def assign_reviewer(request, tracking_number):
                 subtopic_qs = Subtopic.objects.filter(id__in=chosen_subtopic_ids)
                 matching_reviewers = Reviewer.objects.filter(interests__in=subtopic_qs).distinct()
 
+    if step == 1 and sub.extracted_keywords:
+        # Anahtar kelimelere göre en uygun alt başlıkları önceden seçili getir
+        suggested_subtopic_ids = suggest_subtopics(sub)
+    if step == 2:
+        # Geçmiş değerlendirmelere göre içerik benzerliği en yüksek hakemler
+        recommended_reviewers = recommend_reviewers(sub)
+
     context = {
         'submission': sub,
         'all_subtopics': all_subtopics,
         'step': step,
         'matching_reviewers': matching_reviewers,
         'chosen_subtopic_ids': chosen_subtopic_ids,
+        'suggested_subtopic_ids': suggested_subtopic_ids,
+        'recommended_reviewers': recommended_reviewers,
+        # Seçim listesinde önerilen hakemler yalnızca kendi grubunda görünür
+        'recommended_ids': {rev.id for rev, _ in recommended_reviewers},
     }
     return render(request, 'assign_reviewer.html', context)
 
@@ -253,8 +325,9 @@ def request_revision(request, tracking_number):
         messages.error(request, "Makale henüz hakem tarafından değerlendirilmemiş.")
         return redirect('editor_dashboard')
     sub.status = "Revize Gerekli"
-    sub.save()
-    Log.objects.create(submission=sub, action="Editör revizyon istedi (Revize Gerekli)")
+    with transaction.atomic():
+        sub.save()
+        audit.log(sub, "Editör revizyon istedi (Revize Gerekli)")
     messages.success(request, "Makale için revize talep edildi.")
     return redirect('editor_dashboard')
 
@@ -272,13 +345,14 @@ def reply_to_message(request, message_id):
         form = ReplyForm(request.POST)
         if form.is_valid():
             reply_content = form.cleaned_data['content']
-            Message.objects.create(
-                submission=submission,
-                sender='editor',
-                sender_email='editor@example.com',
-                content=reply_content
-            )
-            Log.objects.create(submission=submission, action="Editör mesaj cevabı gönderdi")
+            with transaction.atomic():
+                Message.objects.create(
+                    submission=submission,
+                    sender='editor',
+                    sender_email='editor@example.com',
+                    content=reply_content
+                )
+                audit.log(submission, "Editör mesaj cevabı gönderdi")
             messages.success(request, "Cevap mesajı gönderildi.")
             return redirect('editor_messages')
     else:
@@ -295,33 +369,19 @@ def finalize_view(request, tracking_number):
         messages.error(request, "Değerlendirilmiş makale veya anonimleştirilmiş bilgiler eksik.")
         return redirect('editor_dashboard')
     
-    reviewed_path = sub.reviewed_pdf.path
-    final_filename = f"final_{os.path.basename(reviewed_path)}"
-    final_path = os.path.join(settings.MEDIA_ROOT, 'final', final_filename)
-    
     try:
-        regions = json.loads(sub.anonymized_data)
-    except Exception as e:
+        final_name, run = bulk.render_final_pdf(sub)
+    except ValueError as e:
         messages.error(request, f"Anonimleştirilmiş bilgileri okuyamadık: {e}")
         return redirect('editor_dashboard')
-    
-    # restore_original_fields çağrısına categories_to_restore parametresini ekledik:
-    success = restore_original_fields(
-        input_pdf_path=reviewed_path,
-        original_pdf_path=sub.original_pdf.path,
-        regions=regions,
-        categories_to_restore=["name", "contact", "institution", "image"],  # "image" eklendi
-        output_pdf_path=final_path
-    )
 
-
-    
-    if success:
-        sub.final_pdf.name = os.path.join('final', final_filename)
+    if final_name:
+        sub.final_pdf.name = final_name
         sub.status = "Final"
         sub.final_sent = False
-        sub.save()
-        Log.objects.create(submission=sub, action="Final PDF oluşturuldu (henüz gönderilmedi)")
+        with transaction.atomic():
+            sub.save()
+            audit.log(sub, "Final PDF oluşturuldu (henüz gönderilmedi)", details=run.to_json())
         messages.success(request, "Final PDF oluşturuldu. Lütfen 'Final PDF Gönder' butonuna basınız.")
     else:
         messages.error(request, "Restore işlemi sırasında hata oluştu.")
@@ -334,8 +394,9 @@ def send_final_pdf(request, tracking_number):
         messages.error(request, "Final PDF oluşturulmamış.")
         return redirect('editor_dashboard')
     sub.final_sent = True
-    sub.save()
-    Log.objects.create(submission=sub, action="Final PDF gönderildi (yazara iletildi)")
+    with transaction.atomic():
+        sub.save()
+        audit.log(sub, "Final PDF gönderildi (yazara iletildi)")
     messages.success(request, "Final PDF yazara gönderildi.")
     return redirect('editor_dashboard')
 
@@ -351,8 +412,9 @@ def request_revision_user(request, tracking_number):
         return redirect('status')
     sub.status = "Revize Gerekli"
     sub.final_sent = False
-    sub.save()
-    Log.objects.create(submission=sub, action="Yazar revize talep etti (Final aşamasından geri)")
+    with transaction.atomic():
+        sub.save()
+        audit.log(sub, "Yazar revize talep etti (Final aşamasından geri)")
     messages.success(request, "Revize talebiniz alındı. Makale yeniden revize sürecine girdi.")
     return redirect('status')
 
@@ -366,14 +428,29 @@ def view_final_pdf(request, tracking_number):
     return FileResponse(open(pdf_path, 'rb'), content_type='application/pdf')
 
 
+def search_view(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    if query:
+        paginator = Paginator(search(query), 20)
+        page_obj = paginator.get_page(request.GET.get('page'))
+    return render(request, 'search.html', {'query': query, 'page_obj': page_obj})
+
+
 def editor_logs(request):
-    logs = Log.objects.all().order_by('-timestamp')
-    return render(request, 'editor_logs.html', {'logs': logs})
+    logs = (Log.objects.select_related('submission')
+            .only('action', 'timestamp', 'details', 'submission__tracking_number')
+            .order_by('-timestamp'))
+    page_obj = Paginator(logs, 100).get_page(request.GET.get('page'))
+    return render(request, 'editor_logs.html', {'logs': page_obj, 'page_obj': page_obj})
 
 
 def editor_messages(request):
-    all_msgs = Message.objects.all().order_by('-timestamp')
-    return render(request, 'editor_messages.html', {'all_msgs': all_msgs})
+    all_msgs = (Message.objects.select_related('submission')
+                .only('sender', 'sender_email', 'content', 'timestamp', 'submission__tracking_number')
+                .order_by('-timestamp'))
+    page_obj = Paginator(all_msgs, 50).get_page(request.GET.get('page'))
+    return render(request, 'editor_messages.html', {'all_msgs': page_obj, 'page_obj': page_obj})
 
 
 # --- HAKEM (Değerlendirici) Süreci ---
@@ -417,9 +494,13 @@ def review_view(request, tracking_number):
                 sub.review = combined_review
                 sub.reviewed_pdf.name = os.path.join('reviewed', reviewed_filename)
                 sub.status = "Değerlendirildi"
-                sub.save()
                 reviewer_name = sub.reviewer.name if sub.reviewer else "Bilinmiyor"
-                Log.objects.create(submission=sub, action=f"Hakem {reviewer_name} değerlendirme yaptı")
+                with transaction.atomic():
+                    sub.save()
+                    audit.log(sub, f"Hakem {reviewer_name} değerlendirme yaptı")
+                if sub.reviewer:
+                    # Hakem profilini bu makalenin metniyle artımlı güncelle
+                    update_reviewer_profile(sub.reviewer, paper_text(sub))
                 messages.success(request, "Değerlendirme kaydedildi ve Değerlendirilmiş Makale oluşturuldu.")
             else:
                 messages.error(request, "PDF'e değerlendirme eklenirken hata oluştu.")
@@ -438,8 +519,9 @@ def reassign_reviewer(request, tracking_number):
             new_reviewer = get_object_or_404(Reviewer, id=reviewer_id)
             sub.reviewer = new_reviewer
             sub.status = "Hakeme Atandı"
-            sub.save()
-            Log.objects.create(submission=sub, action=f"Hakem değiştirildi. Yeni hakem: {new_reviewer.name}")
+            with transaction.atomic():
+                sub.save()
+                audit.log(sub, f"Hakem değiştirildi. Yeni hakem: {new_reviewer.name}")
             messages.success(request, f"Hakem {new_reviewer.name} olarak değiştirildi.")
             return redirect('editor_dashboard')
         else:
@@ -488,19 +570,22 @@ def restore_original(request, tracking_number):
                 messages.error(request, f"Anonimleştirilmiş bilgileri okuyamadık: {e}")
                 return redirect('editor_dashboard')
             
-            success = restore_original_fields(
-                input_pdf_path=sub.anonymized_pdf.path,
-                original_pdf_path=sub.original_pdf.path,
-                regions=regions,
-                categories_to_restore=selected,  # Seçilen kategoriler gönderiliyor
-                output_pdf_path=sub.anonymized_pdf.path
-            )
+            with metrics.run("restore") as run:
+                success = restore_original_fields(
+                    input_pdf_path=sub.anonymized_pdf.path,
+                    original_pdf_path=sub.original_pdf.path,
+                    regions=regions,
+                    categories_to_restore=selected,  # Seçilen kategoriler gönderiliyor
+                    output_pdf_path=sub.anonymized_pdf.path
+                )
             
             if success:
+                sub.record_anonymized_pdf()
                 sub.restored = True
                 sub.status = "Düzenlenmiş"
-                sub.save()
-                Log.objects.create(submission=sub, action="Orijinal bilgiler geri yüklendi")
+                with transaction.atomic():
+                    sub.save()
+                    audit.log(sub, "Orijinal bilgiler geri yüklendi", details=run.to_json())
                 messages.success(request, "Seçili alanlar orijinal hale getirildi (kısmi restore).")
                 return redirect('editor_dashboard')
             else:
@@ -543,17 +628,179 @@ def download_anonymized_pdf(request, tracking_number):
 
 
 def clear_all_submissions(request):
-    for sub in Submission.objects.all():
-        if sub.original_pdf:
-            sub.original_pdf.delete()
-        if sub.revised_pdf:
-            sub.revised_pdf.delete()
-        if sub.anonymized_pdf:
-            sub.anonymized_pdf.delete()
-        if sub.final_pdf:
-            sub.final_pdf.delete()
-    Submission.objects.all().delete()
-    Log.objects.all().delete()
-    Message.objects.all().delete()
+    # Satırlar tek transaction'da silinir, dosyalar commit'ten sonra arka planda (bkz. bulk.py)
+    bulk.delete_submissions(Submission.objects.all())
     messages.success(request, "Tüm makaleler, loglar ve mesajlar temizlendi.")
     return redirect('editor_dashboard')
+
+
+def bulk_operations(request):
+    """Filtreyle seçilen makalelerde toplu hakem atama, revizyon isteme ve final (bkz. bulk.py)."""
+    counts = None
+    if request.method == 'POST' and 'preview' in request.POST:
+        selection_form = BulkSelectionForm(request.POST)
+        if selection_form.is_valid():
+            counts = bulk.preview(bulk.select_submissions(**selection_form.selection()))
+        form = BulkOperationForm(initial=request.POST.dict())
+    elif request.method == 'POST':
+        form = BulkOperationForm(request.POST)
+        if form.is_valid():
+            selection = bulk.select_submissions(**form.selection())
+            operation = form.cleaned_data['operation']
+            if operation == 'assign_reviewer':
+                reviewer = form.cleaned_data['reviewer']
+                ids = bulk.assign_reviewer(selection, reviewer)
+                done = f"{len(ids)} makale {reviewer.name} adlı hakeme atandı."
+            elif operation == 'request_revision':
+                ids = bulk.request_revision(selection)
+                done = f"{len(ids)} makale için revize talep edildi."
+            else:
+                ids = bulk.finalize(selection)
+                done = f"{len(ids)} makalenin final PDF'i arka planda oluşturuluyor."
+            if ids:
+                messages.success(request, done)
+            else:
+                messages.warning(request, "Seçimde bu işleme uygun makale yok.")
+            return redirect('bulk_operations')
+    else:
+        form = BulkOperationForm()
+    return render(request, 'bulk_operations.html', {'form': form, 'counts': counts})
+
+
+def import_catalog_view(request):
+    """Alan, alt başlık ve hakem kataloğu yükleme (CSV/JSON, bkz. catalog.py)."""
+    errors = []
+    if request.method == 'POST':
+        form = CatalogImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['catalog_file']
+            try:
+                catalog = parse_catalog(upload.read(), upload.name)
+                stats = import_catalog(catalog, replace_interests=not form.cleaned_data['merge_interests'])
+            except CatalogError as e:
+                errors = e.errors
+            else:
+                messages.success(request, (
+                    f"{stats['domains']} yeni alan, {stats['subtopics']} yeni alt başlık, "
+                    f"{stats['reviewers_created']} yeni / {stats['reviewers_updated']} güncellenen hakem, "
+                    f"{stats['interests']} ilgi alanı bağlantısı."
+                ))
+                return redirect('import_catalog')
+    else:
+        form = CatalogImportForm()
+    return render(request, 'import_catalog.html', {'form': form, 'errors': errors[:50], 'error_count': len(errors)})
+
+
+def export_view(request, dataset):
+    """
+    Makale, anonimleştirme bölgesi ya da log dökümü; akış hâlinde (bkz. export.py).
+    ?format=csv|jsonl&status=...&since=YYYY-MM-DD&until=YYYY-MM-DD (regions için &text=0:
+    orijinal metin yazılmaz).
+    """
+    if dataset not in export.DATASETS:
+        raise Http404("Bilinmeyen döküm")
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in export.FORMATS:
+        return HttpResponseBadRequest("format csv veya jsonl olmalı.")
+    try:
+        filters = {
+            'status': request.GET.get('status') or None,
+            'since': parse_day(request.GET.get('since')),
+            'until': parse_day(request.GET.get('until')),
+        }
+    except ValueError:
+        return HttpResponseBadRequest("Tarihler YYYY-AA-GG biçiminde olmalı.")
+    if dataset == 'regions':
+        filters['include_text'] = request.GET.get('text') != '0'
+    response = StreamingHttpResponse(export.export_chunks(dataset, fmt, **filters),
+                                     content_type=export.CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{fmt}"'
+    return response
+
+
+def _bundle_response(request, submissions, filename):
+    """
+    submissions'ın anonimleştirilmiş PDF'leri tek ZIP akışı olarak (bkz. zipstream.py).
+    ?offset=N: yarıda kalan indirme N. bayttan sürdürülür; ?etag= (ya da If-Match)
+    verilirse arşiv değiştiğinde 412 döner. Boş seçimde None. Arşiv düzeni
+    Submission'da saklanan boyut/CRC'lerden kurulur; dosyalar yalnızca stat
+    edilir. Değeri olmayan ya da diskteki dosyayla uyuşmayan satırlar için
+    yeniden hesaplanıp yazılır, bulunamayan dosyalar atlanır.
+    """
+    rows = (submissions.exclude(anonymized_pdf__isnull=True).exclude(anonymized_pdf='')
+            .order_by('id').values_list('id', 'tracking_number', 'anonymized_pdf', 'anonymized_pdf_size',
+                                        'anonymized_pdf_crc32', 'anonymized_pdf_mtime_ns'))
+    files, missing, filled = [], [], []
+    for pk, tracking_number, name, size, crc, mtime_ns in rows.iterator(chunk_size=2000):
+        path = default_storage.path(name)
+        # stat veri okumaz: silinmiş dosya pakete girmez, değişmiş dosya akış ortasında
+        # kesilmek yerine burada yeniden hesaplanır (_read_entry yalnızca indirme
+        # sırasındaki değişiklikleri yakalar)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            missing.append(tracking_number)
+            continue
+        if crc is None or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            # Alanlar eklenmeden önce yazılmış ya da sonradan değişmiş dosya
+            try:
+                size, crc, mtime_ns = zipstream.file_info(path)
+            except FileNotFoundError:
+                missing.append(tracking_number)
+                continue
+            filled.append(Submission(id=pk, anonymized_pdf_size=size, anonymized_pdf_crc32=crc,
+                                     anonymized_pdf_mtime_ns=mtime_ns))
+        files.append((f"{tracking_number}_anon.pdf", path, size, crc, mtime_ns))
+    if filled:
+        # Editör paneli bu alanları göstermediğinden version artırılmaz
+        Submission.objects.bulk_update(
+            filled, ['anonymized_pdf_size', 'anonymized_pdf_crc32', 'anonymized_pdf_mtime_ns'], batch_size=500)
+    if missing:
+        logger.warning("Pakette bulunamayan PDF'ler atlandı: %s", ", ".join(missing))
+    archive = zipstream.StoredZip(files)
+    if not archive.entries:
+        return None
+    try:
+        offset = int(request.GET.get('offset', 0))
+    except ValueError:
+        offset = -1
+    if not 0 <= offset <= archive.size:
+        return HttpResponseBadRequest(f"offset 0 ile {archive.size} arasında bir tam sayı olmalı.")
+    expected = request.GET.get('etag') or request.headers.get('If-Match', '').strip('"')
+    if expected and expected not in ('*', archive.etag):
+        return HttpResponse("Paket değişti; indirmeyi baştan başlatın.", status=412)
+    response = StreamingHttpResponse(archive.iter_bytes(offset), content_type='application/zip')
+    response['Content-Length'] = archive.size - offset
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['ETag'] = f'"{archive.etag}"'
+    response['X-Bundle-Size'] = archive.size
+    response['X-Bundle-Offset'] = offset
+    return response
+
+
+def reviewer_bundle(request, reviewer_id):
+    """Hakeme atanmış tüm makalelerin anonimleştirilmiş PDF'leri (ZIP)."""
+    reviewer = get_object_or_404(Reviewer, pk=reviewer_id)
+    response = _bundle_response(request, Submission.objects.filter(reviewer=reviewer),
+                                f"hakem_{reviewer.id}_makaleler.zip")
+    if response is None:
+        messages.warning(request, "Bu hakeme atanmış anonimleştirilmiş PDF yok.")
+        return redirect('reviewer_panel')
+    return response
+
+
+def editor_bundle(request):
+    """Toplu işlem filtresiyle (GET) seçilen makalelerin anonimleştirilmiş PDF'leri (ZIP)."""
+    form = BulkSelectionForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest("Geçersiz filtre.")
+    response = _bundle_response(request, bulk.select_submissions(**form.selection()), "makaleler_anon.zip")
+    if response is None:
+        messages.warning(request, "Seçimde anonimleştirilmiş PDF yok.")
+        return redirect('bulk_operations')
+    return response
+
+
+def metrics_view(request):
+    """Aşama süreleri (Prometheus metin formatı, bu sürecin değerleri)."""
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,185 @@
+"""
+Sıkıştırmasız (stored) ZIP arşivini geçici dosya ya da bellekte tampon
+kullanmadan akış hâlinde üretir (hakem/editör PDF paketleri).
+
+Arşivin düzeni (yerel başlıklar, dosya verilerinin yeri, merkezi dizin)
+dosyalar gönderilmeden önce, çağıranın verdiği boyut, CRC-32 ve mtime
+değerlerinden hesaplanır; bu değerler dosya yazılırken file_info() ile bir kez
+hesaplanıp veritabanında saklanır (bkz. Submission.record_anonymized_pdf).
+Paket hazırlanırken dosya verisi okunmaz (çağıran yalnızca stat ile saklanan
+değerlerin güncel olduğunu denetler); CRC'ler başlıklara doğrudan yazılır,
+veri tanımlayıcı (data descriptor) kullanılmaz. Böylece:
+
+- toplam boyut baştan bilinir (Content-Length),
+- yarıda kalan indirme iter_bytes(offset) ile aynı bayttan sürdürülür:
+  offset'ten önceki parçalar atlanır, dosya seek ile okunur,
+- etag dosya adları, boyutları ve CRC'lerinden türetilir; devam isteğinde
+  arşiv değiştiyse fark edilir.
+
+Dosya indirme sırasında değişir ya da silinirse bu, dosya okunmaya
+başlarken fark edilir ve bozuk arşiv yerine akış kesilir. 4 GiB'ı aşan
+dosya, konum ya da 65535'ten fazla kayıt için ZIP64 alanları yazılır.
+Bellek kullanımı yalnızca kayıt sayısıyla büyür (başlıklar); dosya verisi
+CHUNK_SIZE parçalarla okunur.
+"""
+import hashlib
+import os
+import struct
+import time
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP16_LIMIT = 0xFFFF
+FLAG_UTF8 = 0x0800
+VERSION_DEFAULT = 20
+VERSION_ZIP64 = 45
+
+
+def file_info(path):
+    """(boyut, CRC-32, mtime_ns): dosya yazıldıktan sonra bir kez okunarak hesaplanır."""
+    stat = os.stat(path)
+    crc = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    return stat.st_size, crc, stat.st_mtime_ns
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(max(timestamp, 315532800))   # ZIP tarihleri 1980'den başlar
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+
+class Entry:
+    def __init__(self, name, path, size, crc, mtime_ns):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.crc = crc
+        self.mtime_ns = mtime_ns
+        self.dos_time, self.dos_date = _dos_datetime(mtime_ns / 1e9)
+
+
+class StoredZip:
+    """
+    files: [(arşivdeki ad, dosya yolu, boyut, CRC-32, mtime_ns)]; değerler
+    file_info() ile önceden hesaplanmış olmalıdır. Aynı ada sahip sonraki
+    kayıtlar atlanır. size: arşivin bayt cinsinden tam boyutu.
+    """
+
+    def __init__(self, files):
+        self.entries = []
+        seen = set()
+        for name, path, size, crc, mtime_ns in files:
+            if name in seen:
+                continue
+            self.entries.append(Entry(name, path, size, crc, mtime_ns))
+            seen.add(name)
+        self._segments, self.size = self._layout()
+
+    @property
+    def etag(self):
+        digest = hashlib.sha256()
+        for entry in self.entries:
+            digest.update(f"{entry.name}\0{entry.size}\0{entry.crc}\0{entry.mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def _layout(self):
+        """[bytes | Entry] parçaları ve toplam boyut."""
+        segments, central = [], []
+        offset = 0
+        for entry in self.entries:
+            header = _local_header(entry)
+            segments += [header, entry]
+            central.append(_central_header(entry, offset))
+            offset += len(header) + entry.size
+        directory = b"".join(central)
+        segments.append(directory + _end_records(len(self.entries), offset, len(directory)))
+        return segments, offset + len(segments[-1])
+
+    def iter_bytes(self, offset=0):
+        """Arşivi offset'ten itibaren parça parça üretir."""
+        position = 0
+        for segment in self._segments:
+            length = segment.size if isinstance(segment, Entry) else len(segment)
+            if position + length <= offset:
+                position += length
+                continue
+            skip = max(0, offset - position)
+            if isinstance(segment, Entry):
+                yield from _read_entry(segment, skip)
+            else:
+                yield segment[skip:]
+            position += length
+
+
+def _read_entry(entry, start):
+    try:
+        stat = os.stat(entry.path)
+    except FileNotFoundError:
+        raise IOError(f"{entry.name} bulunamadı")
+    if stat.st_size != entry.size or stat.st_mtime_ns != entry.mtime_ns:
+        # Başlıklar saklanan boyut/CRC ile gönderildi; bozuk arşiv yerine bağlantı kesilir
+        raise IOError(f"{entry.name} arşiv hazırlandıktan sonra değişti")
+    remaining = entry.size - start
+    with open(entry.path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise IOError(f"{entry.name} beklenenden kısa")
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _local_header(entry):
+    name = entry.name.encode("utf-8")
+    if entry.size >= ZIP32_LIMIT:
+        extra = struct.pack("<HHQQ", 0x0001, 16, entry.size, entry.size)
+        version, size32 = VERSION_ZIP64, ZIP32_LIMIT
+    else:
+        extra, version, size32 = b"", VERSION_DEFAULT, entry.size
+    return struct.pack(
+        "<IHHHHHIIIHH", 0x04034b50, version, FLAG_UTF8, 0, entry.dos_time, entry.dos_date,
+        entry.crc, size32, size32, len(name), len(extra),
+    ) + name + extra
+
+
+def _central_header(entry, offset):
+    name = entry.name.encode("utf-8")
+    # ZIP64 ek alanında yalnızca taşan değerler, bu sırayla yer alır
+    fields = []
+    size32 = offset32 = None
+    if entry.size >= ZIP32_LIMIT:
+        fields += [entry.size, entry.size]
+        size32 = ZIP32_LIMIT
+    if offset >= ZIP32_LIMIT:
+        fields.append(offset)
+        offset32 = ZIP32_LIMIT
+    extra = struct.pack(f"<HH{len(fields)}Q", 0x0001, 8 * len(fields), *fields) if fields else b""
+    version = VERSION_ZIP64 if fields else VERSION_DEFAULT
+    return struct.pack(
+        "<IHHHHHHIIIHHHHHII", 0x02014b50, (3 << 8) | version, version, FLAG_UTF8, 0,
+        entry.dos_time, entry.dos_date, entry.crc,
+        entry.size if size32 is None else size32, entry.size if size32 is None else size32,
+        len(name), len(extra), 0, 0, 0, 0o100644 << 16,
+        offset if offset32 is None else offset32,
+    ) + name + extra
+
+
+def _end_records(count, directory_offset, directory_size):
+    records = b""
+    if count >= ZIP16_LIMIT or directory_offset >= ZIP32_LIMIT or directory_size >= ZIP32_LIMIT:
+        zip64_offset = directory_offset + directory_size
+        records += struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, VERSION_ZIP64, VERSION_ZIP64, 0, 0,
+                               count, count, directory_size, directory_offset)
+        records += struct.pack("<IIQI", 0x07064b50, 0, zip64_offset, 1)
+    return records + struct.pack(
+        "<IHHHHIIH", 0x06054b50, 0, 0, min(count, ZIP16_LIMIT), min(count, ZIP16_LIMIT),
+        min(directory_size, ZIP32_LIMIT), min(directory_offset, ZIP32_LIMIT), 0,
+    )